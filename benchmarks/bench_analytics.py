@@ -0,0 +1,83 @@
+"""Question difficulty from answer counters versus scanning attempts.
+
+Seeds ``BENCH_ATTEMPTS`` attempts (default 1,000,000) over a 100-question
+quiz, rebuilds the answer counters, then times ``get_question_difficulty``
+against computing the same numbers from ``attempts`` on demand.
+
+    BENCH_ATTEMPTS=1000000 python -m benchmarks.bench_analytics
+"""
+import os
+import random
+import time
+
+from sqlalchemy import insert
+
+from src.entities import quiz as quiz_entities
+from src.quiz import analytics
+from src.quiz import service as quiz_service
+from src.quiz.cache import quiz_cache
+
+from benchmarks.common import make_engine, make_session_factory, measure, print_table, seed_quiz
+
+N_ATTEMPTS = int(os.environ.get("BENCH_ATTEMPTS", "1000000"))
+N_QUESTIONS = 100
+BATCH = 50_000
+
+
+def seed(SessionLocal) -> int:
+    rng = random.Random(42)
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, N_QUESTIONS)
+        question_ids = [row[0] for row in db.query(quiz_entities.Question.id).filter(quiz_entities.Question.quiz_id == quiz_id)]
+        rows = []
+        for i in range(N_ATTEMPTS):
+            rows.append({
+                "quiz_id": quiz_id, "user_id": i // N_QUESTIONS + 1, "question_id": question_ids[i % N_QUESTIONS],
+                "selected_option": f"Option {rng.randrange(4)}"
+            })
+            if len(rows) >= BATCH:
+                db.execute(insert(quiz_entities.Attempt), rows)
+                rows.clear()
+        if rows:
+            db.execute(insert(quiz_entities.Attempt), rows)
+        db.commit()
+        return quiz_id
+
+
+def scan_difficulty(db, quiz_id: int):
+    """Difficulty computed from every attempt, as it would be without counters."""
+    keys = quiz_service.get_answer_keys(
+        db, quiz_id, [row[0] for row in db.query(quiz_entities.Question.id).filter(quiz_entities.Question.quiz_id == quiz_id)]
+    )
+    attempts, correct = {}, {}
+    for question_id, selected_option in db.query(
+        quiz_entities.Attempt.question_id, quiz_entities.Attempt.selected_option
+    ).filter(quiz_entities.Attempt.quiz_id == quiz_id):
+        attempts[question_id] = attempts.get(question_id, 0) + 1
+        if analytics.normalize_answer(selected_option) == analytics.normalize_answer(keys[question_id].option_text):
+            correct[question_id] = correct.get(question_id, 0) + 1
+    return attempts, correct
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    quiz_id = seed(SessionLocal)
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        analytics.rebuild_answer_counts(db, quiz_id)
+        rebuild = time.perf_counter() - start
+
+        quiz_cache.clear()
+        counters = measure(lambda: quiz_service.get_question_difficulty(db, quiz_id), repeat=10)
+        scan = measure(lambda: scan_difficulty(db, quiz_id), repeat=3)
+
+    print_table(("operation", "ms"), [
+        (f"rebuild counters from {N_ATTEMPTS:,} attempts", f"{rebuild * 1000:.0f}"),
+        ("difficulty from counters", f"{counters:.2f}"),
+        ("difficulty by scanning attempts", f"{scan:.2f}"),
+    ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,101 @@
+"""Latency of the attempt and result lookups on a large attempts table.
+
+Seeds ``BENCH_ATTEMPTS`` attempts (default 1,000,000) spread over
+``BENCH_USERS`` users, then times the duplicate-attempt probe, the result
+lookup and the correct-option lookup with and without the indexes from
+migration 0002.
+
+    BENCH_ATTEMPTS=1000000 python -m benchmarks.bench_attempt_indexes
+"""
+import os
+import random
+
+from sqlalchemy import insert, text
+
+from src.entities import quiz as quiz_entities
+
+from benchmarks.common import make_engine, make_session_factory, measure, print_table, seed_quiz
+
+N_ATTEMPTS = int(os.environ.get("BENCH_ATTEMPTS", "1000000"))
+N_USERS = int(os.environ.get("BENCH_USERS", "20000"))
+N_QUESTIONS = 100
+BATCH = 50_000
+
+LOOKUPS = {
+    "attempt exists": "SELECT id FROM attempts WHERE quiz_id = :quiz_id AND user_id = :user_id AND question_id = :question_id",
+    "result row": "SELECT score FROM results WHERE quiz_id = :quiz_id AND user_id = :user_id",
+    "correct option": "SELECT id, option_text FROM question_options WHERE question_id = :question_id AND correct_answer = 1",
+}
+
+
+def indexes():
+    for table in (quiz_entities.Attempt, quiz_entities.Result, quiz_entities.QuestionOptions, quiz_entities.Question):
+        for index in table.__table__.indexes:
+            if index.name not in ("ix_attempts_id", "ix_results_id", "ix_question_options_id", "ix_questions_id"):
+                yield index
+
+
+def seed(SessionLocal):
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, N_QUESTIONS)
+        question_ids = [row[0] for row in db.query(quiz_entities.Question.id).filter(quiz_entities.Question.quiz_id == quiz_id)]
+
+        rows = []
+        for user_id in range(1, N_USERS + 1):
+            for question_id in question_ids[: max(1, N_ATTEMPTS // N_USERS)]:
+                rows.append({"quiz_id": quiz_id, "user_id": user_id, "question_id": question_id, "selected_option": "Option 0"})
+                if len(rows) >= BATCH:
+                    db.execute(insert(quiz_entities.Attempt), rows)
+                    rows.clear()
+        if rows:
+            db.execute(insert(quiz_entities.Attempt), rows)
+        db.execute(
+            insert(quiz_entities.Result),
+            [{"quiz_id": quiz_id, "user_id": user_id, "score": 0} for user_id in range(1, N_USERS + 1)],
+        )
+        db.commit()
+        return quiz_id, question_ids
+
+
+def time_lookups(engine, quiz_id, question_ids):
+    rng = random.Random(42)
+    params = [
+        {"quiz_id": quiz_id, "user_id": rng.randint(1, N_USERS), "question_id": rng.choice(question_ids)}
+        for _ in range(200)
+    ]
+    timings = {}
+    with engine.connect() as conn:
+        for name, sql in LOOKUPS.items():
+            stmt = text(sql)
+            total = measure(lambda: [conn.execute(stmt, p).first() for p in params], repeat=3)
+            timings[name] = total / len(params)
+    return timings
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+
+    # Seed without the lookup indexes, then time, build them and time again
+    with engine.begin() as conn:
+        for index in indexes():
+            index.drop(conn)
+    quiz_id, question_ids = seed(SessionLocal)
+    without = time_lookups(engine, quiz_id, question_ids)
+
+    with engine.begin() as conn:
+        for index in indexes():
+            index.create(conn)
+    with_indexes = time_lookups(engine, quiz_id, question_ids)
+
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM attempts")).scalar_one()
+    print(f"attempts table: {count} rows\n")
+    print_table(
+        ("lookup", "no index ms/op", "indexed ms/op"),
+        [(name, f"{without[name]:.3f}", f"{with_indexes[name]:.3f}") for name in LOOKUPS],
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+"""Parallel answer submission against a default and a tuned engine.
+
+``BENCH_WRITERS`` threads (default 16) each submit answers for their own
+user through ``quiz_service.submit_answer``. The default engine is a bare
+``create_engine(url)``; the tuned one comes from ``create_db_engine`` and
+gets the pool settings and SQLite PRAGMAs (WAL, synchronous, busy
+timeout) from the environment.
+
+SQLite always runs. Set ``BENCH_POSTGRES_URL`` to also run against Postgres.
+
+    python -m benchmarks.bench_concurrent_writers
+"""
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from src.database.core import Base, create_db_engine
+from src.quiz import models as quiz_models
+from src.quiz import service as quiz_service
+from src.quiz.cache import quiz_cache
+from src.entities import quiz as quiz_entities
+
+from benchmarks.common import make_session_factory, print_table, seed_quiz, timer
+
+N_WRITERS = int(os.environ.get("BENCH_WRITERS", "16"))
+N_QUESTIONS = int(os.environ.get("BENCH_QUESTIONS", "50"))
+
+
+def run_writers(engine):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    quiz_cache.clear()
+    SessionLocal = make_session_factory(engine)
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, N_QUESTIONS)
+        question_ids = [row[0] for row in db.query(quiz_entities.Question.id).filter(quiz_entities.Question.quiz_id == quiz_id)]
+
+    def writer(user_id):
+        ok = locked = 0
+        for question_id in question_ids:
+            answer = quiz_models.AnswerSubmit(question_id=question_id, answer="Option 0", user_id=user_id)
+            with SessionLocal() as db:
+                try:
+                    quiz_service.submit_answer(db, quiz_id, answer)
+                    ok += 1
+                except (OperationalError, HTTPException):
+                    locked += 1
+        return ok, locked
+
+    with ThreadPoolExecutor(N_WRITERS) as pool, timer() as t:
+        outcomes = list(pool.map(writer, range(1, N_WRITERS + 1)))
+    engine.dispose()
+    ok = sum(o for o, _ in outcomes)
+    failed = sum(f for _, f in outcomes)
+    return ok, failed, t["elapsed"]
+
+
+def default_engine(url):
+    # Only what is needed to share connections between the writer threads
+    if url.startswith("sqlite"):
+        return create_engine(url, pool_size=N_WRITERS, connect_args={"check_same_thread": False})
+    return create_engine(url, pool_size=N_WRITERS)
+
+
+def sqlite_url():
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="quizapp-writers-")
+    os.close(fd)
+    return f"sqlite:///{path}"
+
+
+def run():
+    backends = [("sqlite", sqlite_url)]
+    if os.environ.get("BENCH_POSTGRES_URL"):
+        backends.append(("postgres", lambda: os.environ["BENCH_POSTGRES_URL"]))
+
+    rows = []
+    for backend, make_url in backends:
+        for label, factory in (("default", default_engine), ("tuned", create_db_engine)):
+            ok, failed, elapsed = run_writers(factory(make_url()))
+            rows.append((backend, label, ok, failed, f"{elapsed:.2f}", f"{ok / elapsed:.0f}"))
+
+    print_table(("backend", "engine", "committed", "failed", "seconds", "answers/s"), rows)
+
+
+if __name__ == "__main__":
+    run()
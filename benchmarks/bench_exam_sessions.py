@@ -0,0 +1,81 @@
+"""Exam sessions: answers stored ungraded and scored once versus graded per answer.
+
+Seeds a quiz of ``BENCH_EXAM_QUESTIONS`` questions (default 100) and times
+answering every question of it through a session and finishing it,
+against submitting each answer with ``submit_answer``. Then starts
+``BENCH_EXAM_SESSIONS`` sessions (default 1000), expires them and times
+the sweeper finalizing them in batches of ``EXAM_SWEEP_BATCH_SIZE``.
+
+    python -m benchmarks.bench_exam_sessions
+"""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.entities import quiz as quiz_entities
+from src.quiz import models as quiz_models
+from src.quiz import service as quiz_service
+from src.quiz.exam_sessions import EXAM_SWEEP_BATCH_SIZE, ExamSessions, load_layout
+
+from benchmarks.common import make_engine, make_session_factory, print_table, seed_quiz
+
+N_QUESTIONS = int(os.environ.get("BENCH_EXAM_QUESTIONS", "100"))
+N_SESSIONS = int(os.environ.get("BENCH_EXAM_SESSIONS", "1000"))
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    sessions = ExamSessions(session_factory=SessionLocal)
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, N_QUESTIONS)
+        layout = load_layout(db, quiz_id)
+        # Every other answer is correct
+        answers = [
+            quiz_models.ExamAnswer(question_id=question_id, option_id=option_id if i % 2 else option_id + 1)
+            for i, (question_id, option_id) in enumerate(zip(layout.question_ids, layout.correct))
+        ]
+
+        session_id = sessions.start(db, quiz_id, quiz_models.ExamSessionStart(user_id=1))["session_id"]
+        start = time.perf_counter()
+        for answer in answers:
+            sessions.answer(db, session_id, [answer])
+        answering = time.perf_counter() - start
+        start = time.perf_counter()
+        finished = sessions.finish(db, session_id)
+        finishing = time.perf_counter() - start
+        assert finished["score"] == N_QUESTIONS // 2
+
+        start = time.perf_counter()
+        for answer in answers:
+            quiz_service.submit_answer(db, quiz_id, quiz_models.AnswerSubmit(
+                question_id=answer.question_id, option_id=answer.option_id, user_id=2
+            ))
+        graded = time.perf_counter() - start
+
+        for user_id in range(3, N_SESSIONS + 3):
+            session_id = sessions.start(db, quiz_id, quiz_models.ExamSessionStart(user_id=user_id))["session_id"]
+            sessions.answer(db, session_id, answers)
+        db.query(quiz_entities.ExamSession).filter_by(status="running").update(
+            {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+        )
+        db.commit()
+    start = time.perf_counter()
+    swept = sessions.sweep()
+    sweeping = time.perf_counter() - start
+    with SessionLocal() as db:
+        assert db.query(quiz_entities.ExamSession).filter_by(status="expired").count() == swept == N_SESSIONS
+
+    print_table(("operation", "total ms", "ms per answer"), [
+        (f"session: answer {N_QUESTIONS} questions", f"{answering * 1000:.1f}", f"{answering * 1000 / N_QUESTIONS:.3f}"),
+        ("session: finish (score and store)", f"{finishing * 1000:.1f}", f"{finishing * 1000 / N_QUESTIONS:.3f}"),
+        (f"submit_answer x {N_QUESTIONS}", f"{graded * 1000:.1f}", f"{graded * 1000 / N_QUESTIONS:.3f}"),
+        (
+            f"sweep {N_SESSIONS} expired sessions (batches of {EXAM_SWEEP_BATCH_SIZE})",
+            f"{sweeping * 1000:.1f}", f"{sweeping * 1000 / (N_SESSIONS * N_QUESTIONS):.3f}"
+        ),
+    ])
+
+
+if __name__ == "__main__":
+    run()
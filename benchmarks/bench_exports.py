@@ -0,0 +1,74 @@
+"""Time to first byte, throughput and memory of the streaming exports.
+
+Seeds ``BENCH_EXPORT_ROWS`` attempts (default 1,000,000) for one quiz,
+then drains ``iter_export`` for the quiz's attempts in CSV and NDJSON and
+reports when the first row chunk arrived, the total time and the peak
+Python memory allocated while streaming.
+
+    BENCH_EXPORT_ROWS=1000000 python -m benchmarks.bench_exports
+"""
+import os
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+
+from src.entities import quiz as quiz_entities
+from src.quiz import exports as quiz_exports
+
+from benchmarks.common import make_engine, make_session_factory, print_table, seed_quiz
+
+N_ROWS = int(os.environ.get("BENCH_EXPORT_ROWS", "1000000"))
+N_QUESTIONS = 100
+BATCH = 50_000
+
+
+def seed(SessionLocal) -> int:
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, N_QUESTIONS)
+        question_ids = [row[0] for row in db.query(quiz_entities.Question.id).filter(quiz_entities.Question.quiz_id == quiz_id)]
+        rows = []
+        for i in range(N_ROWS):
+            rows.append({
+                "quiz_id": quiz_id, "user_id": i // N_QUESTIONS + 1,
+                "question_id": question_ids[i % N_QUESTIONS], "selected_option": "Option 0"
+            })
+            if len(rows) >= BATCH:
+                db.execute(insert(quiz_entities.Attempt), rows)
+                rows.clear()
+        if rows:
+            db.execute(insert(quiz_entities.Attempt), rows)
+        db.commit()
+        return quiz_id
+
+
+def drain(engine, quiz_id: int, file_format: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_rows = None
+    size = 0
+    for chunk in quiz_exports.iter_export(engine, quiz_exports.quiz_attempts(quiz_id), file_format):
+        size += len(chunk)
+        if first_rows is None and chunk.count(b"\n") > (file_format == "csv"):
+            first_rows = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first_rows, elapsed, size, peak
+
+
+def run():
+    engine = make_engine()
+    quiz_id = seed(make_session_factory(engine))
+    rows = []
+    for file_format in ("csv", "ndjson"):
+        first_rows, elapsed, size, peak = drain(engine, quiz_id, file_format)
+        rows.append((
+            file_format, f"{N_ROWS:,}", f"{first_rows * 1000:.1f}", f"{elapsed:.2f}",
+            f"{N_ROWS / elapsed:,.0f}", f"{size / 1e6:.0f}", f"{peak / 1e6:.1f}"
+        ))
+    print_table(("format", "rows", "first rows ms", "total s", "rows/s", "MB sent", "peak MB"), rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+"""Throughput of the streaming question-bank import.
+
+Writes a ``BENCH_IMPORT_ROWS`` (default 100,000) row JSONL file and a CSV
+file of the same size, then imports each into a fresh quiz.
+
+    python -m benchmarks.bench_import
+"""
+import json
+import os
+import tempfile
+
+from src.quiz import importer
+
+from benchmarks.common import make_engine, make_session_factory, print_table, seed_quiz, timer
+
+N_ROWS = int(os.environ.get("BENCH_IMPORT_ROWS", "100000"))
+
+
+def write_jsonl(path):
+    with open(path, "w") as f:
+        for i in range(N_ROWS):
+            f.write(json.dumps({"question_text": f"Question {i}", "options": ["A", "B", "C", "D"], "correct_answer": i % 4}))
+            f.write("\n")
+
+
+def write_csv(path):
+    with open(path, "w") as f:
+        f.write("question_text,correct_answer,option_1,option_2,option_3,option_4\n")
+        for i in range(N_ROWS):
+            f.write(f"Question {i},{i % 4},A,B,C,D\n")
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format, writer in (("jsonl", write_jsonl), ("csv", write_csv)):
+            path = os.path.join(directory, f"bank.{file_format}")
+            writer(path)
+            with SessionLocal() as db:
+                quiz_id = seed_quiz(db, 0, title=f"Import {file_format}")
+                with open(path, "rb") as stream, timer() as t:
+                    summary = importer.import_questions(db, quiz_id, stream, file_format)
+            rows.append((
+                file_format, summary["imported"], f"{t['elapsed']:.2f}", f"{summary['imported'] / t['elapsed']:.0f}"
+            ))
+
+    print_table(("format", "questions", "seconds", "questions/s"), rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,61 @@
+"""Cost of keeping a quiz's in-memory leaderboard index up to date.
+
+For quizzes of 10,000, 100,000 and ``BENCH_LEADERBOARD_PARTICIPANTS``
+(default 500,000, the default LEADERBOARD_MAX_PARTICIPANTS) participants,
+times a score change and a rank lookup on QuizRanking, and a score change
+on one flat sorted list, the index before it was split into buckets.
+
+    python -m benchmarks.bench_leaderboard
+"""
+import os
+import random
+from bisect import bisect_left, insort
+
+from src.quiz.leaderboard import QuizRanking
+
+from benchmarks.common import measure, print_table
+
+MAX_PARTICIPANTS = int(os.environ.get("BENCH_LEADERBOARD_PARTICIPANTS", "500000"))
+CHANGES = 10_000
+
+
+class FlatRanking:
+    """The flat-list index: every change shifts the list's tail."""
+
+    def __init__(self, scores):
+        self._scores = dict(scores)
+        self._keys = sorted((-score, user_id) for user_id, score in self._scores.items())
+
+    def update(self, user_id: int, score: int):
+        previous = self._scores[user_id]
+        del self._keys[bisect_left(self._keys, (-previous, user_id))]
+        self._scores[user_id] = score
+        insort(self._keys, (-score, user_id))
+
+
+def run():
+    rows = []
+    for participants in (10_000, 100_000, MAX_PARTICIPANTS):
+        rng = random.Random(participants)
+        scores = {user_id: rng.randrange(100) for user_id in range(participants)}
+        # Answers bump the scores of random users by one point
+        changes = [rng.randrange(participants) for _ in range(CHANGES)]
+
+        for label, ranking in (("flat list", FlatRanking(scores)), ("buckets", QuizRanking(scores))):
+            current = dict(scores)
+
+            def updates():
+                for user_id in changes:
+                    current[user_id] += 1
+                    ranking.update(user_id, current[user_id])
+
+            rows.append((participants, label, "update", f"{measure(updates, repeat=3) / CHANGES * 1000:.2f}"))
+            if isinstance(ranking, QuizRanking):
+                lookups = measure(lambda: [ranking.rank(user_id) for user_id in changes], repeat=3)
+                rows.append((participants, label, "rank", f"{lookups / CHANGES * 1000:.2f}"))
+
+    print_table(("participants", "index", "operation", "us per call"), rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+"""Latency of keyset pages versus OFFSET pages at increasing depth.
+
+Seeds ``BENCH_QUIZZES`` quizzes (default 200,000) and one quiz with
+``BENCH_QUESTIONS`` questions (default 100,000), then times a page of
+``GET /quizzes`` and ``GET /quiz/{quiz_id}/questions/page`` at several
+depths through the service (keyset) and with the equivalent OFFSET query.
+
+    python -m benchmarks.bench_pagination
+"""
+import os
+
+from sqlalchemy import insert
+
+from src.entities import quiz as quiz_entities
+from src.quiz import service as quiz_service
+from src.quiz.cache import quiz_cache
+from src.quiz.pagination import encode_cursor
+
+from benchmarks.common import make_engine, make_session_factory, measure, print_table, seed_quiz
+
+N_QUIZZES = int(os.environ.get("BENCH_QUIZZES", "200000"))
+N_QUESTIONS = int(os.environ.get("BENCH_QUESTIONS", "100000"))
+PAGE = 50
+BATCH = 50_000
+
+
+def offset_quizzes(db, offset: int):
+    return db.query(
+        quiz_entities.Quiz.id, quiz_entities.Quiz.title, quiz_entities.Quiz.description,
+        quiz_entities.Quiz.created_at, quiz_entities.Quiz.question_count
+    ).order_by(quiz_entities.Quiz.id).offset(offset).limit(PAGE).all()
+
+
+def offset_questions(db, quiz_id: int, offset: int):
+    return db.query(quiz_entities.Question.id, quiz_entities.Question.question_text).filter(
+        quiz_entities.Question.quiz_id == quiz_id
+    ).order_by(quiz_entities.Question.id).offset(offset).limit(PAGE).all()
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    with SessionLocal() as db:
+        for start in range(0, N_QUIZZES, BATCH):
+            db.execute(insert(quiz_entities.Quiz), [
+                {"title": f"Quiz {i}", "description": "benchmark"} for i in range(start, min(start + BATCH, N_QUIZZES))
+            ])
+        db.commit()
+        quiz_ids = [row[0] for row in db.query(quiz_entities.Quiz.id).order_by(quiz_entities.Quiz.id)]
+        questions_quiz_id = seed_quiz(db, N_QUESTIONS, title="Deep quiz")
+        question_ids = [
+            row[0] for row in db.query(quiz_entities.Question.id)
+            .filter(quiz_entities.Question.quiz_id == questions_quiz_id).order_by(quiz_entities.Question.id)
+        ]
+
+    rows = []
+    with SessionLocal() as db:
+        for fraction in (0, 0.5, 0.99):
+            depth = int(len(quiz_ids) * fraction)
+            cursor = encode_cursor(quiz_ids[depth - 1]) if depth else None
+            keyset = measure(lambda: quiz_service.list_quizzes(db, PAGE, cursor), repeat=20)
+            offset = measure(lambda: offset_quizzes(db, depth), repeat=20)
+            rows.append(("GET /quizzes", f"{depth:,}", f"{keyset:.2f}", f"{offset:.2f}"))
+
+        quiz_cache.clear()
+        for fraction in (0, 0.5, 0.99):
+            depth = int(len(question_ids) * fraction)
+            cursor = encode_cursor(question_ids[depth - 1]) if depth else None
+            keyset = measure(lambda: quiz_service.get_quiz_questions_page(db, questions_quiz_id, PAGE, cursor), repeat=20)
+            offset = measure(lambda: offset_questions(db, questions_quiz_id, depth), repeat=20)
+            rows.append(("GET /quiz/{quiz_id}/questions/page", f"{depth:,}", f"{keyset:.2f}", f"{offset:.2f}"))
+
+    print_table(("endpoint", "rows skipped", "keyset ms", "offset ms"), rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,63 @@
+"""Query count and latency of GET /quiz/{quiz_id}/questions.
+
+Compares the eager-loading service implementation with the previous
+one-query-per-question approach at 10, 100 and 1000 questions per quiz.
+Both run with ``quiz_cache`` cleared before every call; the "cached" rows
+time the service when its payload is already cached.
+
+    python -m benchmarks.bench_quiz_questions
+"""
+from src.entities import quiz as quiz_entities
+from src.quiz import service as quiz_service
+from src.quiz.cache import quiz_cache
+
+from benchmarks.common import QueryCounter, make_engine, make_session_factory, measure, print_table, seed_quiz
+
+SIZES = (10, 100, 1000)
+
+
+def n_plus_one_quiz_questions(db, quiz_id: int):
+    """The per-question lookup the service used before eager loading."""
+    db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == quiz_id).first()
+    questions = db.query(quiz_entities.Question).filter(quiz_entities.Question.quiz_id == quiz_id).all()
+    result = []
+    for question in questions:
+        options = db.query(quiz_entities.QuestionOptions).filter(
+            quiz_entities.QuestionOptions.question_id == question.id
+        ).all()
+        result.append({
+            "id": question.id,
+            "question_text": question.question_text,
+            "options": [{"id": opt.id, "text": opt.option_text} for opt in options],
+        })
+    return {"quiz_id": quiz_id, "questions": result}
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    with SessionLocal() as db:
+        quiz_ids = {size: seed_quiz(db, size) for size in SIZES}
+
+    rows = []
+    for size in SIZES:
+        for label, fn, cached in (
+            ("n+1", n_plus_one_quiz_questions, False),
+            ("eager", quiz_service.get_quiz_questions, False),
+            ("cached", quiz_service.get_quiz_questions, True),
+        ):
+            def call():
+                if not cached:
+                    quiz_cache.clear()
+                with SessionLocal() as db:
+                    fn(db, quiz_ids[size])
+
+            with QueryCounter(engine) as counter:
+                call()
+            rows.append((size, label, counter.count, f"{measure(call):.2f}"))
+
+    print_table(("questions", "strategy", "queries", "best ms"), rows)
+
+
+if __name__ == "__main__":
+    run()
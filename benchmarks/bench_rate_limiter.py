@@ -0,0 +1,103 @@
+"""Overhead of the rate limiter.
+
+Times a single bucket hit for the in-process and the shared (SQLite file)
+store, then the ``rate_limit`` dependency as it runs for every request: a
+GET that names its user in the path and a POST whose JSON body does.
+The memory store stays around a microsecond per hit; the shared store
+pays a SQLite write transaction per request and a threadpool hop to keep
+it off the event loop.
+
+    python -m benchmarks.bench_rate_limiter
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from starlette.requests import Request
+from starlette.routing import Route
+
+from src import rate_limiter
+from src.rate_limiter import MemoryStore, RateLimiter, SharedStore, parse_budgets
+
+from benchmarks.common import measure, print_table
+
+HITS = 100_000
+# Large enough that no hit is rejected while measuring
+BUDGETS = "*=1000000/s:1000000"
+
+
+def time_hits(store, keys: int) -> float:
+    """Microseconds per ``store.hit``, spread over ``keys`` buckets."""
+    budget = parse_budgets(BUDGETS)["*"]
+    names = [("POST /quiz/{quiz_id}/answer", f"user:{i}") for i in range(keys)]
+
+    def hits():
+        for i in range(HITS):
+            store.hit([(names[i % keys], budget)], time.time())
+
+    return measure(hits, repeat=3) / HITS * 1000
+
+
+def make_request(method: str, route: Route, path_params: dict, body: bytes = b"") -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    headers = [(b"content-type", b"application/json")] if body else []
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": route.path,
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "path_params": path_params,
+        "route": route,
+    }, receive)
+
+
+def time_dependency(method: str, path: str, path_params: dict, body: bytes = b"") -> float:
+    """Microseconds per ``rate_limit`` call, less the cost of building the request."""
+    route = Route(path, lambda request: None)
+
+    async def noop(request):
+        pass
+
+    async def calls(dependency):
+        for _ in range(HITS):
+            request = make_request(method, route, path_params, body)
+            if body:
+                # FastAPI parses JSON bodies before dependencies run; the limiter reuses that
+                await request.json()
+            await dependency(request)
+
+    with_limit = measure(lambda: asyncio.run(calls(rate_limiter.rate_limit)), repeat=5)
+    without = measure(lambda: asyncio.run(calls(noop)), repeat=5)
+    return (with_limit - without) / HITS * 1000
+
+
+def run():
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="quizapp-ratelimit-")
+    os.close(fd)
+    answer = json.dumps({"question_id": 1, "answer": "A", "user_id": 7}).encode()
+    rows = []
+    for backend, make_store in (
+        ("memory", lambda: MemoryStore(1_000_000)),
+        ("shared", lambda: SharedStore(path)),
+    ):
+        rows.append((backend, "store.hit, 1 key", f"{time_hits(make_store(), 1):.2f}"))
+        rows.append((backend, "store.hit, 10,000 keys", f"{time_hits(make_store(), 10_000):.2f}"))
+        rate_limiter.limiter = RateLimiter(parse_budgets(BUDGETS), make_store())
+        rows.append((backend, "GET /user/{user_id}/results", f"{time_dependency('GET', '/user/{user_id}/results', {'user_id': '7'}):.2f}"))
+        rows.append((backend, "POST /quiz/{quiz_id}/answer", f"{time_dependency('POST', '/quiz/{quiz_id}/answer', {'quiz_id': '1'}, answer):.2f}"))
+
+    rate_limiter.limiter = RateLimiter(parse_budgets(BUDGETS), MemoryStore(1_000_000), enabled=False)
+    rows.append(("disabled", "GET /user/{user_id}/results", f"{time_dependency('GET', '/user/{user_id}/results', {'user_id': '7'}):.2f}"))
+    os.remove(path)
+
+    print_table(("backend", "operation", "us per call"), rows)
+
+
+if __name__ == "__main__":
+    run()
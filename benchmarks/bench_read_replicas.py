@@ -0,0 +1,66 @@
+"""Overhead of routing reads to replicas.
+
+Times ``ReplicaRouter.route`` as it runs for every read-only request: a
+request with a sticky cookie, one from a user who recently wrote (found
+among ``BENCH_STICKY_KEYS`` sticky keys, default 100,000) and one that is
+sent round-robin to a replica. Two SQLite files stand in for the replicas.
+
+    python -m benchmarks.bench_read_replicas
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from starlette.routing import Route
+
+from src.database.replicas import STICKY_COOKIE, Replica, ReplicaRouter
+
+from benchmarks.bench_rate_limiter import make_request
+from benchmarks.common import measure, print_table
+
+CALLS = 100_000
+STICKY_KEYS = int(os.environ.get("BENCH_STICKY_KEYS", "100000"))
+
+
+def time_route(router: ReplicaRouter, path_params: dict, cookie: str = "") -> float:
+    """Microseconds per ``route`` call, less the cost of building the request."""
+    route = Route("/user/{user_id}/results", lambda request: None)
+
+    def request():
+        request = make_request("GET", route, path_params)
+        if cookie:
+            request.scope["headers"] = [(b"cookie", cookie.encode())]
+        return request
+
+    async def calls(routed: bool):
+        for _ in range(CALLS):
+            built = request()
+            if routed:
+                await router.route(built)
+
+    with_route = measure(lambda: asyncio.run(calls(True)), repeat=5)
+    without = measure(lambda: asyncio.run(calls(False)), repeat=5)
+    return (with_route - without) / CALLS * 1000
+
+
+def run():
+    directory = tempfile.mkdtemp(prefix="quizapp-replicas-")
+    router = ReplicaRouter(
+        [Replica(f"sqlite:///{directory}/replica-{i}.db", async_mode=False) for i in range(2)], 5, 5, STICKY_KEYS * 2
+    )
+    until = time.time() + 3600
+    for user_id in range(STICKY_KEYS):
+        router.mark(f"user:{user_id}", until)
+
+    print_table(("request", "us per route"), [
+        ("sticky cookie", f"{time_route(router, {'user_id': '1'}, f'{STICKY_COOKIE}={until:.3f}'):.2f}"),
+        ("user wrote recently", f"{time_route(router, {'user_id': '1'}):.2f}"),
+        ("round-robin to a replica", f"{time_route(router, {'user_id': str(STICKY_KEYS + 1)}):.2f}"),
+    ])
+    for replica in router.replicas:
+        replica.engine.dispose()
+
+
+if __name__ == "__main__":
+    run()
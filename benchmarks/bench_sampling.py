@@ -0,0 +1,63 @@
+"""Question sampling: drawing from the cached question bank versus ORDER BY random().
+
+Seeds a quiz of ``BENCH_SAMPLE_QUESTIONS`` questions (default 50,000) tagged
+round-robin with ``BENCH_SAMPLE_TAGS`` tags, then times drawing
+``BENCH_SAMPLE_SIZE`` questions (default 20) with their options: with
+``sample_questions`` on a cold and a warm bank, stratified by tag, and
+with ``ORDER BY random() LIMIT n`` followed by an options query.
+
+    python -m benchmarks.bench_sampling
+"""
+import os
+import time
+
+from sqlalchemy import String, cast, func, update
+
+from src.entities import quiz as quiz_entities
+from src.quiz.cache import question_bank_key, quiz_cache
+from src.quiz.sampling import sample_questions
+
+from benchmarks.common import make_engine, make_session_factory, measure, print_table, seed_quiz
+
+N_QUESTIONS = int(os.environ.get("BENCH_SAMPLE_QUESTIONS", "50000"))
+N_TAGS = int(os.environ.get("BENCH_SAMPLE_TAGS", "10"))
+SAMPLE_SIZE = int(os.environ.get("BENCH_SAMPLE_SIZE", "20"))
+
+
+def order_by_random(db, quiz_id: int):
+    questions = db.query(quiz_entities.Question.id, quiz_entities.Question.question_text).filter(
+        quiz_entities.Question.quiz_id == quiz_id
+    ).order_by(func.random()).limit(SAMPLE_SIZE).all()
+    options = db.query(quiz_entities.QuestionOptions.question_id, quiz_entities.QuestionOptions.option_text).filter(
+        quiz_entities.QuestionOptions.question_id.in_([question_id for question_id, _ in questions])
+    ).all()
+    return questions, options
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, N_QUESTIONS)
+        db.execute(update(quiz_entities.Question).values(tag="tag-" + cast(quiz_entities.Question.id % N_TAGS, String)))
+        db.commit()
+
+        start = time.perf_counter()
+        sample_questions(db, quiz_id, SAMPLE_SIZE)
+        cold = (time.perf_counter() - start) * 1000
+        assert len(quiz_cache.get(question_bank_key(quiz_id)).strata["tag"]) == N_TAGS
+
+        warm = measure(lambda: sample_questions(db, quiz_id, SAMPLE_SIZE), repeat=50)
+        stratified = measure(lambda: sample_questions(db, quiz_id, SAMPLE_SIZE, "tag"), repeat=50)
+        random_order = measure(lambda: order_by_random(db, quiz_id), repeat=10)
+
+    print_table(("draw", f"ms per {SAMPLE_SIZE} of {N_QUESTIONS} questions"), [
+        ("bank, cold (loads question ids)", f"{cold:.2f}"),
+        ("bank, warm", f"{warm:.2f}"),
+        ("bank, warm, stratified by tag", f"{stratified:.2f}"),
+        ("ORDER BY random() LIMIT n", f"{random_order:.2f}"),
+    ])
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+"""Serialization cost of large quiz question payloads.
+
+Compares the ways a questions payload can be turned into a response body at
+100, 1000 and 5000 questions per quiz:
+
+- ``jsonable+json``: a route without ``response_model`` (jsonable_encoder + json.dumps)
+- ``model+dump_json``: a route with ``response_model`` and the default response
+  class, which FastAPI serializes in pydantic-core
+- ``model+orjson``: a route with ``response_model`` and an orjson default
+  response class, which makes FastAPI fall back to dump_python + render
+- ``snapshot``: rendering the payload once for a questions snapshot
+
+It then times a full request through a small app for the first three paths.
+
+    python -m benchmarks.bench_serialization
+"""
+import json
+
+import orjson
+from fastapi import APIRouter, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from src.quiz.models import QuizWithQuestionsResponse
+from src.quiz.snapshots import render_json
+
+from benchmarks.common import measure, print_table
+
+SIZES = (100, 1000, 5000)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+def make_payload(n_questions: int, n_options: int = 4):
+    return {
+        "quiz_id": 1,
+        "questions": [
+            {
+                "id": i,
+                "question_text": f"Benchmark question {i}?",
+                "options": [{"id": i * n_options + j, "text": f"Option {j}"} for j in range(n_options)],
+            }
+            for i in range(n_questions)
+        ],
+    }
+
+
+def make_client(payload, response_model=None, default_response_class=None) -> TestClient:
+    app = FastAPI(**({"default_response_class": default_response_class} if default_response_class else {}))
+    router = APIRouter()
+
+    @router.get("/questions", response_model=response_model)
+    async def questions():
+        return payload
+
+    app.include_router(router)
+    return TestClient(app)
+
+
+def run():
+    adapter = TypeAdapter(QuizWithQuestionsResponse)
+    paths = {
+        "jsonable+json": lambda payload: json.dumps(jsonable_encoder(payload)).encode("utf-8"),
+        "model+dump_json": lambda payload: adapter.dump_json(adapter.validate_python(payload)),
+        "model+orjson": lambda payload: orjson.dumps(adapter.dump_python(adapter.validate_python(payload), mode="json")),
+        "snapshot": render_json,
+    }
+    apps = {
+        "jsonable+json": {},
+        "model+dump_json": {"response_model": QuizWithQuestionsResponse},
+        "model+orjson": {"response_model": QuizWithQuestionsResponse, "default_response_class": ORJSONResponse},
+    }
+
+    rows = []
+    for size in SIZES:
+        payload = make_payload(size)
+        for label, fn in paths.items():
+            rows.append((size, "encode", label, f"{measure(lambda: fn(payload)):.2f}"))
+        for label, options in apps.items():
+            client = make_client(payload, **options)
+            rows.append((size, "request", label, f"{measure(lambda: client.get('/questions')):.2f}"))
+
+    print_table(("questions", "scope", "path", "best ms"), rows)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+"""Cost of serving a quiz in a per-user shuffled order.
+
+For quizzes of 100 and ``BENCH_QUESTIONS`` (default 1000) questions,
+times building the user's shuffle, applying a cached shuffle to the
+cached canonical questions and rendering it, and the naive alternative:
+deep-copying the payload and shuffling it with a per-request RNG.
+
+    python -m benchmarks.bench_shuffle
+"""
+import copy
+import os
+import random
+
+from src.quiz.shuffle import get_shuffle, shuffle_cache, shuffled_payload
+from src.quiz.snapshots import render_json
+
+from benchmarks.common import measure, print_table
+
+N_QUESTIONS = int(os.environ.get("BENCH_QUESTIONS", "1000"))
+USERS = 100
+
+
+def make_questions(n_questions: int, n_options: int = 4) -> list:
+    return [
+        {
+            "id": i + 1,
+            "question_text": f"Question {i}: " + "lorem ipsum " * 8,
+            "options": [{"id": i * n_options + j + 1, "text": f"Option {j} " + "dolor sit " * 4} for j in range(n_options)]
+        }
+        for i in range(n_questions)
+    ]
+
+
+def naive(quiz_id: int, user_id: int, questions: list) -> bytes:
+    rng = random.Random(f"{quiz_id}:{user_id}")
+    shuffled = copy.deepcopy(questions)
+    rng.shuffle(shuffled)
+    for question in shuffled:
+        rng.shuffle(question["options"])
+    return render_json({"quiz_id": quiz_id, "questions": shuffled})
+
+
+def run():
+    rows = []
+    for n_questions in (100, N_QUESTIONS):
+        questions = make_questions(n_questions)
+        canonical = render_json({"quiz_id": 1, "questions": questions})
+
+        def build():
+            shuffle_cache.clear()
+            for user_id in range(USERS):
+                get_shuffle(1, user_id, 0, questions)
+
+        build_ms = measure(build, repeat=3) / USERS
+        cached_ms = measure(lambda: [
+            render_json(shuffled_payload(1, get_shuffle(1, user_id, 0, questions))) for user_id in range(USERS)
+        ]) / USERS
+        naive_ms = measure(lambda: [naive(1, user_id, questions) for user_id in range(USERS)], repeat=3) / USERS
+        render_ms = measure(lambda: [render_json({"quiz_id": 1, "questions": questions}) for _ in range(USERS)]) / USERS
+        rows += [
+            (n_questions, f"canonical payload render ({len(canonical) // 1024} KB)", f"{render_ms:.3f}"),
+            (n_questions, "build a user's shuffle (cache miss)", f"{build_ms:.3f}"),
+            (n_questions, "apply cached shuffle + render", f"{cached_ms:.3f}"),
+            (n_questions, "naive deepcopy + shuffle + render", f"{naive_ms:.3f}"),
+        ]
+    print_table(("questions", "operation", "ms per user"), rows)
+
+
+if __name__ == "__main__":
+    run()
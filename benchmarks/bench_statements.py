@@ -0,0 +1,90 @@
+"""Per-call overhead of the prebuilt statements in src/quiz/queries.py.
+
+Times each hot lookup as the ORM query the service used to build on every
+call and as the prebuilt Core statement, on a small seeded SQLite database
+where the database work is negligible and SQLAlchemy overhead dominates.
+
+    python -m benchmarks.bench_statements
+"""
+from sqlalchemy import and_
+
+from src.entities import quiz as quiz_entities
+from src.quiz import queries
+
+from benchmarks.common import make_engine, make_session_factory, measure, print_table, seed_quiz
+
+CALLS = 5_000
+Quiz = quiz_entities.Quiz
+Question = quiz_entities.Question
+QuestionOptions = quiz_entities.QuestionOptions
+Attempt = quiz_entities.Attempt
+Result = quiz_entities.Result
+
+
+def orm_quiz_row(db, quiz_id):
+    return db.query(Quiz).filter(Quiz.id == quiz_id).first()
+
+
+def orm_answer_key_options(db, quiz_id, question_id):
+    return db.query(
+        Quiz.id, Question.id, QuestionOptions.id, QuestionOptions.option_text, QuestionOptions.correct_answer
+    ).select_from(Quiz).outerjoin(
+        Question, and_(Question.quiz_id == Quiz.id, Question.id == question_id)
+    ).outerjoin(
+        QuestionOptions, QuestionOptions.question_id == Question.id
+    ).filter(Quiz.id == quiz_id).order_by(QuestionOptions.id).all()
+
+
+def orm_attempted_question_ids(db, quiz_id, user_id, question_ids):
+    return {
+        row.question_id for row in db.query(Attempt.question_id).filter(
+            Attempt.quiz_id == quiz_id, Attempt.user_id == user_id, Attempt.question_id.in_(list(question_ids))
+        )
+    }
+
+
+def orm_result_score(db, quiz_id, user_id):
+    return db.query(Result.score).filter(Result.quiz_id == quiz_id, Result.user_id == user_id).scalar()
+
+
+def run():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, 20)
+        question_ids = [row[0] for row in db.query(Question.id).filter(Question.quiz_id == quiz_id)]
+        db.add_all(Attempt(quiz_id=quiz_id, user_id=1, question_id=question_id, selected_option="Option 0") for question_id in question_ids[:10])
+        db.add(Result(quiz_id=quiz_id, user_id=1, score=10))
+        db.commit()
+
+    lookups = [
+        ("quiz row", lambda db: orm_quiz_row(db, quiz_id), lambda db: queries.quiz_row(db, quiz_id)),
+        ("answer key options", lambda db: orm_answer_key_options(db, quiz_id, question_ids[0]),
+         lambda db: queries.answer_key_options(db, quiz_id, question_ids[0])),
+        ("attempted question ids", lambda db: orm_attempted_question_ids(db, quiz_id, 1, question_ids),
+         lambda db: queries.attempted_question_ids(db, quiz_id, 1, question_ids)),
+        ("result score", lambda db: orm_result_score(db, quiz_id, 1), lambda db: queries.result_score(db, quiz_id, 1)),
+    ]
+    rows = []
+    with SessionLocal() as db:
+        for name, orm, prebuilt in lookups:
+            # Identity-map hits would hide the cost of building ORM objects
+            def call_orm():
+                for _ in range(CALLS):
+                    orm(db)
+                    db.expunge_all()
+
+            def call_prebuilt():
+                for _ in range(CALLS):
+                    prebuilt(db)
+                    db.expunge_all()
+
+            orm_us = measure(call_orm, repeat=3) / CALLS * 1000
+            prebuilt_us = measure(call_prebuilt, repeat=3) / CALLS * 1000
+            rows.append((name, f"{orm_us:.1f}", f"{prebuilt_us:.1f}", f"{orm_us / prebuilt_us:.1f}x"))
+
+    print_table(("lookup", "ORM query us", "prebuilt us", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    run()
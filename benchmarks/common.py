@@ -0,0 +1,150 @@
+"""Shared helpers for the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway SQLite file by default; set
+``BENCH_DATABASE_URL`` to point them at another database (e.g. Postgres).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import httpx
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.database.core import Base
+from src.entities import quiz as quiz_entities
+from src.entities import user as user_entities  # noqa: F401  (registers the users table)
+
+PORT = int(os.environ.get("BENCH_PORT", "8765"))
+
+
+def make_engine(url: str | None = None):
+    """Create an engine with a freshly created schema."""
+    url = url or os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="quizapp-bench-")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def make_session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def seed_quiz(db, n_questions: int, n_options: int = 4, title: str | None = None) -> int:
+    """Insert a quiz with ``n_questions`` questions of ``n_options`` options each."""
+    quiz = quiz_entities.Quiz(
+        title=title or f"Bench quiz {n_questions}", description="benchmark", question_count=n_questions
+    )
+    db.add(quiz)
+    db.flush()
+
+    db.execute(
+        insert(quiz_entities.Question),
+        [{"quiz_id": quiz.id, "question_text": f"Question {i}"} for i in range(n_questions)],
+    )
+    question_ids = [
+        row[0] for row in db.query(quiz_entities.Question.id)
+        .filter(quiz_entities.Question.quiz_id == quiz.id)
+        .order_by(quiz_entities.Question.id)
+    ]
+    db.execute(
+        insert(quiz_entities.QuestionOptions),
+        [
+            {"question_id": qid, "option_text": f"Option {j}", "correct_answer": j == 0}
+            for qid in question_ids
+            for j in range(n_options)
+        ],
+    )
+    db.commit()
+    return quiz.id
+
+
+class QueryCounter:
+    """Counts statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@contextmanager
+def timer():
+    """Yields a dict whose ``elapsed`` key is filled in (seconds) on exit."""
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["elapsed"] = time.perf_counter() - start
+
+
+def measure(fn, repeat: int = 5):
+    """Run ``fn`` ``repeat`` times and return the best wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        with timer() as t:
+            fn()
+        best = min(best, t["elapsed"])
+    return best * 1000
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def percentile(values, p):
+    """The ``p`` quantile (0..1) of ``values`` in seconds, as milliseconds."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+def start_server(url, **env):
+    """Start the API under uvicorn on ``PORT`` against ``url``; extra settings are passed as env vars."""
+    env = dict(os.environ, DATABASE_URL=url, **env)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(PORT), "--log-level", "warning",
+         "--timeout-graceful-shutdown", "5"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError("uvicorn did not start")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
@@ -0,0 +1,79 @@
+"""Seeded dataset for the pytest-benchmark service suite.
+
+The dataset is built once per session against a throwaway SQLite file (or
+``BENCH_DATABASE_URL``). Its size is set with ``BENCH_QUESTIONS`` (questions
+in the main quiz, default 200), ``BENCH_PARTICIPANTS`` (users with a result
+in it, default 1000) and ``BENCH_USER_QUIZZES`` (quizzes user 1 has a result
+in, default 100).
+"""
+import os
+import random
+from typing import List, NamedTuple
+
+import pytest
+from sqlalchemy import insert
+
+from src.entities import quiz as quiz_entities
+from src.quiz.cache import quiz_cache
+from src.quiz.leaderboard import leaderboard
+
+from benchmarks.common import make_engine, make_session_factory, seed_quiz
+
+BENCH_QUESTIONS = int(os.environ.get("BENCH_QUESTIONS", "200"))
+BENCH_PARTICIPANTS = int(os.environ.get("BENCH_PARTICIPANTS", "1000"))
+BENCH_USER_QUIZZES = int(os.environ.get("BENCH_USER_QUIZZES", "100"))
+
+
+class Dataset(NamedTuple):
+    session_factory: object
+    quiz_id: int
+    question_ids: List[int]
+    user_id: int
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    engine = make_engine()
+    SessionLocal = make_session_factory(engine)
+    rng = random.Random(0)
+    with SessionLocal() as db:
+        quiz_id = seed_quiz(db, BENCH_QUESTIONS)
+        question_ids = [
+            row[0] for row in db.query(quiz_entities.Question.id)
+            .filter(quiz_entities.Question.quiz_id == quiz_id)
+            .order_by(quiz_entities.Question.id)
+        ]
+        db.execute(
+            insert(quiz_entities.Result),
+            [
+                {"quiz_id": quiz_id, "user_id": user_id, "score": rng.randint(0, BENCH_QUESTIONS)}
+                for user_id in range(1, BENCH_PARTICIPANTS + 1)
+            ],
+        )
+        for i in range(BENCH_USER_QUIZZES):
+            other_quiz_id = seed_quiz(db, 5, title=f"User quiz {i}")
+            db.execute(insert(quiz_entities.Result).values(quiz_id=other_quiz_id, user_id=1, score=rng.randint(0, 5)))
+        db.commit()
+    yield Dataset(SessionLocal, quiz_id, question_ids, user_id=1)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(dataset):
+    with dataset.session_factory() as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    quiz_cache.clear()
+    leaderboard.clear()
+    yield
+
+
+@pytest.fixture(params=["cached", "uncached"])
+def cache_mode(request, monkeypatch):
+    """Run a read benchmark with the quiz cache warm, and with it disabled."""
+    if request.param == "uncached":
+        monkeypatch.setattr(quiz_cache, "max_entries", 0)
+    return request.param
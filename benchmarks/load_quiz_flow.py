@@ -0,0 +1,191 @@
+"""Scripted load test of a full quiz flow against a local uvicorn.
+
+Each of ``BENCH_USERS`` concurrent virtual users runs ``BENCH_FLOWS`` flows:
+create a quiz with ``BENCH_FLOW_QUESTIONS`` questions, fetch its questions,
+answer every question and read the user's results. Latency percentiles
+(p50/p95/p99) per step and overall throughput are compared against the
+baseline in ``BENCH_BASELINE`` (default ``benchmarks/baseline_load_quiz_flow.json``);
+the script exits with status 1 when a step is more than ``BENCH_TOLERANCE``
+(default 0.25) slower, or throughput is that much lower, than the baseline.
+
+    python -m benchmarks.load_quiz_flow
+    python -m benchmarks.load_quiz_flow --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.common import PORT, make_engine, percentile, print_table, start_server, stop_server
+
+USERS = int(os.environ.get("BENCH_USERS", "16"))
+FLOWS = int(os.environ.get("BENCH_FLOWS", "5"))
+FLOW_QUESTIONS = int(os.environ.get("BENCH_FLOW_QUESTIONS", "10"))
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "0.25"))
+BASELINE = os.environ.get("BENCH_BASELINE", os.path.join(os.path.dirname(__file__), "baseline_load_quiz_flow.json"))
+
+STEPS = ("create_quiz", "create_question", "get_questions", "submit_answer", "get_results")
+PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.failures = []
+
+    def fail(self, step, reason):
+        self.errors[step] += 1
+        if len(self.failures) < 5:
+            self.failures.append(f"{step}: {reason}")
+
+    async def request(self, step, send, expected_status=200):
+        start = time.perf_counter()
+        try:
+            response = await send()
+        except httpx.TransportError as error:
+            self.fail(step, repr(error))
+            return None
+        self.latencies[step].append(time.perf_counter() - start)
+        if response.status_code != expected_status:
+            self.fail(step, f"{response.status_code} {response.text[:200]}")
+            return None
+        return response.json()
+
+
+async def flow(client, recorder, user_id, flow_number):
+    quiz = await recorder.request("create_quiz", lambda: client.post(
+        "/create-quiz", json={"title": f"Load quiz {user_id}-{flow_number}", "description": "load test"}
+    ))
+    if quiz is None:
+        return
+    quiz_id = quiz["id"]
+    for i in range(FLOW_QUESTIONS):
+        await recorder.request("create_question", lambda: client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": f"Question {i}?", "options": ["A", "B", "C", "D"], "correct_answer": i % 4
+        }))
+
+    questions = await recorder.request("get_questions", lambda: client.get(f"/quiz/{quiz_id}/questions"))
+    if questions is None:
+        return
+    for question in questions["questions"]:
+        await recorder.request("submit_answer", lambda: client.post(f"/quiz/{quiz_id}/answer", json={
+            "question_id": question["id"], "answer": question["options"][0]["text"], "user_id": user_id
+        }))
+    await recorder.request("get_results", lambda: client.get(f"/user/{user_id}/results"))
+
+
+async def drive():
+    recorder = Recorder()
+
+    async def virtual_user(client, user_id):
+        for flow_number in range(FLOWS):
+            await flow(client, recorder, user_id, flow_number)
+
+    limits = httpx.Limits(max_connections=USERS)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(client, user_id) for user_id in range(1, USERS + 1)))
+        elapsed = time.perf_counter() - start
+    return recorder, elapsed
+
+
+def summarize(recorder, elapsed):
+    steps = {}
+    for step in STEPS:
+        latencies = recorder.latencies[step]
+        if not latencies:
+            continue
+        steps[step] = {
+            "requests": len(latencies),
+            "errors": recorder.errors[step],
+            **{name: round(percentile(latencies, p), 2) for name, p in PERCENTILES},
+        }
+    requests = sum(len(latencies) for latencies in recorder.latencies.values())
+    return {
+        "config": {"users": USERS, "flows": FLOWS, "flow_questions": FLOW_QUESTIONS},
+        "requests_per_second": round(requests / elapsed, 1),
+        "flows_per_second": round(USERS * FLOWS / elapsed, 2),
+        "steps": steps,
+    }
+
+
+def compare(summary, baseline):
+    """Print the run next to the baseline; returns the list of regressions."""
+    regressions = []
+    rows = []
+    for step, current in summary["steps"].items():
+        previous = baseline["steps"].get(step, {})
+        cells = [step, current["requests"], current["errors"]]
+        for name, _ in PERCENTILES:
+            cell = f"{current[name]:.1f}"
+            if name in previous:
+                change = current[name] / previous[name] - 1 if previous[name] else 0
+                cell += f" ({change:+.0%})"
+                if change > TOLERANCE:
+                    regressions.append(f"{step} {name} {previous[name]:.1f} ms -> {current[name]:.1f} ms")
+            cells.append(cell)
+        rows.append(cells)
+    print_table(("step", "requests", "errors", "p50 ms", "p95 ms", "p99 ms"), rows)
+
+    throughput = summary["requests_per_second"]
+    previous_throughput = baseline.get("requests_per_second")
+    line = f"\nthroughput: {throughput:.1f} req/s, {summary['flows_per_second']:.2f} flows/s"
+    if previous_throughput:
+        line += f" (baseline {previous_throughput:.1f} req/s, {throughput / previous_throughput - 1:+.0%})"
+        if throughput < previous_throughput * (1 - TOLERANCE):
+            regressions.append(f"throughput {previous_throughput:.1f} -> {throughput:.1f} req/s")
+    print(line)
+    if baseline.get("config") not in (None, summary["config"]):
+        print(f"warning: baseline was recorded with {baseline['config']}, this run used {summary['config']}")
+    return regressions
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save-baseline", action="store_true", help=f"write this run's results to {BASELINE}")
+    args = parser.parse_args()
+
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="quizapp-load-")
+        os.close(fd)
+        url = f"sqlite:///{path}"
+    make_engine(url).dispose()
+
+    # Every virtual user shares one client IP; limits would throttle the run, not measure it
+    server = start_server(url, RATE_LIMIT_ENABLED="false")
+    try:
+        recorder, elapsed = asyncio.run(drive())
+    finally:
+        stop_server(server)
+    summary = summarize(recorder, elapsed)
+    for failure in recorder.failures:
+        print(f"failed request: {failure}")
+
+    baseline = {"steps": {}}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as file:
+            baseline = json.load(file)
+    regressions = compare(summary, baseline)
+
+    if args.save_baseline:
+        with open(BASELINE, "w") as file:
+            json.dump(summary, file, indent=2)
+            file.write("\n")
+        print(f"baseline saved to {BASELINE}")
+    elif regressions:
+        print("\nregressions beyond {:.0%}:".format(TOLERANCE))
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,108 @@
+"""Micro-benchmarks for every function in src/quiz/service.py and src/users/service.py.
+
+Not collected by the default ``pytest`` run; run them explicitly:
+
+    pytest benchmarks/ --benchmark-columns=min,median,mean,ops
+    pytest benchmarks/ --benchmark-autosave
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=median:20%
+"""
+from itertools import count
+
+import pytest
+
+from src.quiz import models as quiz_models
+from src.quiz import service as quiz_service
+from src.users import service as users_service
+
+# Users that answer during write benchmarks; above any seeded participant
+new_user_ids = count(10_000_000)
+new_titles = (f"Benchmark quiz {i}" for i in count())
+
+
+def test_create_quiz(benchmark, db):
+    benchmark(lambda: quiz_service.create_quiz(db, quiz_models.QuizCreate(title=next(new_titles), description="benchmark")))
+
+
+def test_get_quiz(benchmark, db, dataset, cache_mode):
+    benchmark(quiz_service.get_quiz, db, dataset.quiz_id)
+
+
+def test_create_question(benchmark, db, dataset):
+    question = quiz_models.QuestionCreate(question_text="New question?", options=["A", "B", "C", "D"], correct_answer=2)
+    benchmark(quiz_service.create_question, db, dataset.quiz_id, question)
+
+
+def test_record_new_questions(benchmark, db, dataset):
+    def record():
+        quiz_service.record_new_questions(db, dataset.quiz_id)
+        db.rollback()
+
+    benchmark(record)
+
+
+def test_get_answer_key(benchmark, db, dataset, cache_mode):
+    benchmark(quiz_service.get_answer_key, db, dataset.quiz_id, dataset.question_ids[0])
+
+
+def test_get_answer_keys(benchmark, db, dataset, cache_mode):
+    benchmark(quiz_service.get_answer_keys, db, dataset.quiz_id, dataset.question_ids)
+
+
+def test_add_to_score(benchmark, db, dataset):
+    def add():
+        quiz_service.add_to_score(db, dataset.quiz_id, dataset.user_id, 1)
+        db.rollback()
+
+    benchmark(add)
+
+
+def test_submit_answer(benchmark, db, dataset):
+    def submit():
+        answer = quiz_models.AnswerSubmit(question_id=dataset.question_ids[0], answer="Option 0", user_id=next(new_user_ids))
+        return quiz_service.submit_answer(db, dataset.quiz_id, answer)
+
+    assert benchmark(submit)["is_correct"] is True
+
+
+def test_submit_answer_by_option_id(benchmark, db, dataset):
+    option_id = quiz_service.get_answer_key(db, dataset.quiz_id, dataset.question_ids[0]).option_id
+
+    def submit():
+        answer = quiz_models.AnswerSubmit(question_id=dataset.question_ids[0], option_id=option_id, user_id=next(new_user_ids))
+        return quiz_service.submit_answer(db, dataset.quiz_id, answer)
+
+    assert benchmark(submit)["is_correct"] is True
+
+
+@pytest.mark.parametrize("batch_size", [20])
+def test_submit_answers(benchmark, db, dataset, batch_size):
+    def submit():
+        user_id = next(new_user_ids)
+        answers = [
+            quiz_models.AnswerSubmit(question_id=question_id, answer="Option 0", user_id=user_id)
+            for question_id in dataset.question_ids[:batch_size]
+        ]
+        return quiz_service.submit_answers(db, dataset.quiz_id, answers)
+
+    assert benchmark(submit)["current_score"] == batch_size
+
+
+def test_get_quiz_questions(benchmark, db, dataset, cache_mode):
+    result = benchmark(quiz_service.get_quiz_questions, db, dataset.quiz_id)
+    assert len(result["questions"]) >= len(dataset.question_ids)
+
+
+def test_get_quiz_questions_snapshot(benchmark, db, dataset, cache_mode):
+    benchmark(quiz_service.get_quiz_questions_snapshot, db, dataset.quiz_id)
+
+
+@pytest.mark.parametrize("backend", ["memory", "table"])
+def test_get_leaderboard(benchmark, db, dataset, monkeypatch, backend):
+    monkeypatch.setattr("src.quiz.leaderboard.LEADERBOARD_BACKEND", backend)
+    result = benchmark(quiz_service.get_leaderboard, db, dataset.quiz_id, 10, dataset.user_id)
+    assert result["me"] is not None
+
+
+def test_get_user_results(benchmark, db, dataset):
+    result = benchmark(users_service.get_user_results, db, dataset.user_id)
+    assert len(result["results"]) == 50
@@ -0,0 +1,108 @@
+"""initial schema
+
+Creates the tables as they existed before migrations were introduced.
+Databases that were set up by ``Base.metadata.create_all`` already have
+them, so existing tables are left untouched.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(), nullable=True),
+            sa.Column("role", sa.String(), nullable=True),
+            sa.Column("password", sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_name", "users", ["name"], unique=True)
+
+    if "quizzes" not in existing:
+        op.create_table(
+            "quizzes",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("title", sa.String(), nullable=True),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_quizzes_id", "quizzes", ["id"])
+        op.create_index("ix_quizzes_title", "quizzes", ["title"], unique=True)
+
+    if "questions" not in existing:
+        op.create_table(
+            "questions",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("quiz_id", sa.Integer(), sa.ForeignKey("quizzes.id"), nullable=True),
+            sa.Column("question_text", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_questions_id", "questions", ["id"])
+
+    if "question_options" not in existing:
+        op.create_table(
+            "question_options",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=True),
+            sa.Column("option_text", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("correct_answer", sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_question_options_id", "question_options", ["id"])
+
+    if "results" not in existing:
+        op.create_table(
+            "results",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("quiz_id", sa.Integer(), sa.ForeignKey("quizzes.id"), nullable=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("score", sa.Integer(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_results_id", "results", ["id"])
+
+    if "attempts" not in existing:
+        op.create_table(
+            "attempts",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("quiz_id", sa.Integer(), sa.ForeignKey("quizzes.id"), nullable=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=True),
+            sa.Column("selected_option", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_attempts_id", "attempts", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("attempts")
+    op.drop_table("results")
+    op.drop_table("question_options")
+    op.drop_table("questions")
+    op.drop_table("quizzes")
+    op.drop_table("users")
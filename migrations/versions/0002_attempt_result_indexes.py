@@ -0,0 +1,71 @@
+"""unique and lookup indexes for attempts, results, questions and options
+
+Duplicate rows that the old read-then-insert code could leave behind are
+collapsed first: the oldest attempt per (quiz, user, question) is kept, and
+duplicate result rows are merged into the oldest one with their scores summed.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 16:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_indexes(table: str) -> set:
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        DELETE FROM attempts WHERE id NOT IN (
+            SELECT MIN(id) FROM attempts GROUP BY quiz_id, user_id, question_id
+        )
+    """)
+    op.execute("""
+        UPDATE results SET score = (
+            SELECT SUM(r.score) FROM results r
+            WHERE r.quiz_id = results.quiz_id AND r.user_id = results.user_id
+        )
+        WHERE id IN (SELECT MIN(id) FROM results GROUP BY quiz_id, user_id HAVING COUNT(*) > 1)
+    """)
+    op.execute("""
+        DELETE FROM results WHERE id NOT IN (
+            SELECT MIN(id) FROM results GROUP BY quiz_id, user_id
+        )
+    """)
+
+    # Databases created by Base.metadata.create_all may already have these
+    if "uq_attempts_quiz_id_user_id_question_id" not in _existing_indexes("attempts"):
+        op.create_index(
+            "uq_attempts_quiz_id_user_id_question_id", "attempts",
+            ["quiz_id", "user_id", "question_id"], unique=True,
+        )
+    if "uq_results_quiz_id_user_id" not in _existing_indexes("results"):
+        op.create_index("uq_results_quiz_id_user_id", "results", ["quiz_id", "user_id"], unique=True)
+    if "ix_questions_quiz_id" not in _existing_indexes("questions"):
+        op.create_index("ix_questions_quiz_id", "questions", ["quiz_id"])
+    if "ix_question_options_question_id_correct_answer" not in _existing_indexes("question_options"):
+        op.create_index(
+            "ix_question_options_question_id_correct_answer", "question_options",
+            ["question_id", "correct_answer"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_question_options_question_id_correct_answer", table_name="question_options")
+    op.drop_index("ix_questions_quiz_id", table_name="questions")
+    op.drop_index("uq_results_quiz_id_user_id", table_name="results")
+    op.drop_index("uq_attempts_quiz_id_user_id_question_id", table_name="attempts")
@@ -0,0 +1,40 @@
+"""denormalized quizzes.question_count and results (user_id, quiz_id) index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 16:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if "question_count" not in {column["name"] for column in inspector.get_columns("quizzes")}:
+        with op.batch_alter_table("quizzes") as batch_op:
+            batch_op.add_column(sa.Column("question_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute("""
+        UPDATE quizzes SET question_count = (
+            SELECT COUNT(*) FROM questions WHERE questions.quiz_id = quizzes.id
+        )
+    """)
+    if "ix_results_user_id_quiz_id" not in {index["name"] for index in inspector.get_indexes("results")}:
+        op.create_index("ix_results_user_id_quiz_id", "results", ["user_id", "quiz_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_results_user_id_quiz_id", table_name="results")
+    with op.batch_alter_table("quizzes") as batch_op:
+        batch_op.drop_column("question_count")
@@ -0,0 +1,29 @@
+"""results (quiz_id, score) index for leaderboard reads
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "ix_results_quiz_id_score" not in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("results")}:
+        op.create_index("ix_results_quiz_id_score", "results", ["quiz_id", "score"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_results_quiz_id_score", table_name="results")
@@ -0,0 +1,31 @@
+"""quizzes.content_version for questions payload ETags
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 17:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "content_version" not in {column["name"] for column in sa.inspect(op.get_bind()).get_columns("quizzes")}:
+        with op.batch_alter_table("quizzes") as batch_op:
+            batch_op.add_column(sa.Column("content_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("quizzes") as batch_op:
+        batch_op.drop_column("content_version")
@@ -0,0 +1,29 @@
+"""attempts (user_id, quiz_id, question_id) index for per-user exports
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "ix_attempts_user_id_quiz_id_question_id" not in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("attempts")}:
+        op.create_index("ix_attempts_user_id_quiz_id_question_id", "attempts", ["user_id", "quiz_id", "question_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_attempts_user_id_quiz_id_question_id", table_name="attempts")
@@ -0,0 +1,29 @@
+"""questions (quiz_id, id) index for keyset-paginated question pages
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "ix_questions_quiz_id_id" not in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("questions")}:
+        op.create_index("ix_questions_quiz_id_id", "questions", ["quiz_id", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_questions_quiz_id_id", table_name="questions")
@@ -0,0 +1,43 @@
+"""answer_counts table of per-question answer counters for analytics
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 19:40:00.000000
+
+Counters start empty; run ``python -m src.quiz.analytics`` after upgrading
+to compute them from the existing attempts.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "answer_counts" not in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.create_table(
+            "answer_counts",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("quiz_id", sa.Integer(), sa.ForeignKey("quizzes.id"), nullable=False),
+            sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False),
+            sa.Column("answer", sa.String(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "uq_answer_counts_quiz_id_question_id_answer", "answer_counts", ["quiz_id", "question_id", "answer"], unique=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_answer_counts_quiz_id_question_id_answer", table_name="answer_counts")
+    op.drop_table("answer_counts")
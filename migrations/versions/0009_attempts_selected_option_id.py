@@ -0,0 +1,67 @@
+"""attempts.selected_option_id, backfilled from selected_option
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 20:10:00.000000
+
+Existing attempts are linked to the option of their question whose text
+matches ``selected_option`` after trimming and lower-casing, in batches of
+BACKFILL_BATCH_SIZE attempt ids, each committed on its own so the table is
+never locked for the whole backfill. Attempts whose text matches no option
+keep a null option id. The backfill only touches rows that are still null,
+so an interrupted upgrade can simply be run again.
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = int(os.environ.get("BACKFILL_BATCH_SIZE", "10000"))
+
+BACKFILL = sa.text("""
+    UPDATE attempts SET selected_option_id = (
+        SELECT question_options.id FROM question_options
+        WHERE question_options.question_id = attempts.question_id
+          AND lower(trim(question_options.option_text)) = lower(trim(attempts.selected_option))
+        ORDER BY question_options.id
+        LIMIT 1
+    )
+    WHERE attempts.id >= :start AND attempts.id < :end AND attempts.selected_option_id IS NULL
+""")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if "selected_option_id" not in {column["name"] for column in inspector.get_columns("attempts")}:
+        with op.batch_alter_table("attempts") as batch_op:
+            batch_op.add_column(sa.Column("selected_option_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                "fk_attempts_selected_option_id_question_options", "question_options", ["selected_option_id"], ["id"]
+            )
+    if "ix_attempts_question_id_selected_option_id" not in {index["name"] for index in inspector.get_indexes("attempts")}:
+        op.create_index("ix_attempts_question_id_selected_option_id", "attempts", ["question_id", "selected_option_id"])
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        low, high = bind.execute(sa.text("SELECT min(id), max(id) FROM attempts")).one()
+        if low is None:
+            return
+        for start in range(low, high + 1, BACKFILL_BATCH_SIZE):
+            bind.execute(BACKFILL, {"start": start, "end": start + BACKFILL_BATCH_SIZE})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_attempts_question_id_selected_option_id", table_name="attempts")
+    with op.batch_alter_table("attempts") as batch_op:
+        batch_op.drop_constraint("fk_attempts_selected_option_id_question_options", type_="foreignkey")
+        batch_op.drop_column("selected_option_id")
@@ -0,0 +1,46 @@
+"""exam_sessions table for timed attempts at a quiz
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "exam_sessions" not in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.create_table(
+            "exam_sessions",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("quiz_id", sa.Integer(), sa.ForeignKey("quizzes.id"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("question_count", sa.Integer(), nullable=False),
+            sa.Column("answered", sa.Integer(), nullable=True),
+            sa.Column("score", sa.Integer(), nullable=True),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_exam_sessions_id", "exam_sessions", ["id"])
+        op.create_index("ix_exam_sessions_status_expires_at", "exam_sessions", ["status", "expires_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_exam_sessions_status_expires_at", table_name="exam_sessions")
+    op.drop_index("ix_exam_sessions_id", table_name="exam_sessions")
+    op.drop_table("exam_sessions")
@@ -0,0 +1,35 @@
+"""questions.tag and questions.difficulty for stratified sampling
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("questions")}
+    with op.batch_alter_table("questions") as batch_op:
+        if "tag" not in columns:
+            batch_op.add_column(sa.Column("tag", sa.String(), nullable=True))
+        if "difficulty" not in columns:
+            batch_op.add_column(sa.Column("difficulty", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("questions") as batch_op:
+        batch_op.drop_column("difficulty")
+        batch_op.drop_column("tag")
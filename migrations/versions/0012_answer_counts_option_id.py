@@ -0,0 +1,58 @@
+"""answer_counts.option_id: count answers that chose an option by its id
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 10:00:00.000000
+
+Existing counters stay keyed by answer text and are still read; run
+``python -m src.quiz.analytics`` after upgrading to recount them by option id.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, Sequence[str], None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if "option_id" in {column["name"] for column in inspector.get_columns("answer_counts")}:
+        return
+    with op.batch_alter_table("answer_counts") as batch_op:
+        batch_op.add_column(sa.Column("option_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_answer_counts_option_id_question_options", "question_options", ["option_id"], ["id"]
+        )
+    op.drop_index("uq_answer_counts_quiz_id_question_id_answer", table_name="answer_counts")
+    op.create_index(
+        "uq_answer_counts_quiz_id_question_id_option_id", "answer_counts", ["quiz_id", "question_id", "option_id"],
+        unique=True, sqlite_where=sa.text("option_id IS NOT NULL"), postgresql_where=sa.text("option_id IS NOT NULL")
+    )
+    op.create_index(
+        "uq_answer_counts_quiz_id_question_id_answer", "answer_counts", ["quiz_id", "question_id", "answer"],
+        unique=True, sqlite_where=sa.text("option_id IS NULL"), postgresql_where=sa.text("option_id IS NULL")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Option counters have no text to fall back to, so they are dropped; run
+    ``python -m src.quiz.analytics`` afterwards to recount them by text.
+    """
+    op.drop_index("uq_answer_counts_quiz_id_question_id_answer", table_name="answer_counts")
+    op.drop_index("uq_answer_counts_quiz_id_question_id_option_id", table_name="answer_counts")
+    op.execute("DELETE FROM answer_counts WHERE option_id IS NOT NULL")
+    with op.batch_alter_table("answer_counts") as batch_op:
+        batch_op.drop_constraint("fk_answer_counts_option_id_question_options", type_="foreignkey")
+        batch_op.drop_column("option_id")
+    op.create_index(
+        "uq_answer_counts_quiz_id_question_id_answer", "answer_counts", ["quiz_id", "question_id", "answer"], unique=True
+    )
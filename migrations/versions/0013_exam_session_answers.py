@@ -0,0 +1,37 @@
+"""exam_session_answers table: answers of running exam sessions
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-20 10:00:00.000000
+
+Sessions still running from before this revision have no stored answers
+and are scored as unanswered when they are finished or expire.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0013"
+down_revision: Union[str, Sequence[str], None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if "exam_session_answers" not in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.create_table(
+            "exam_session_answers",
+            sa.Column("session_id", sa.Integer(), sa.ForeignKey("exam_sessions.id"), nullable=False),
+            sa.Column("question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False),
+            sa.Column("option_id", sa.Integer(), sa.ForeignKey("question_options.id"), nullable=False),
+            sa.PrimaryKeyConstraint("session_id", "question_id"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("exam_session_answers")
@@ -1,17 +1,154 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///quizapp.db")
+# "sync" runs services in the threadpool through the blocking driver (see
+# run_service(); running them on the event loop would block every request);
+# "async" uses an AsyncEngine with asyncpg (Postgres) or aiosqlite (SQLite).
+DATABASE_MODE = os.environ.get("DATABASE_MODE", "sync")
 
-engine = create_engine(DATABASE_URL)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver."""
+    scheme, separator, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + separator + rest
+
+# Connection pool settings (QueuePool; ignored for in-memory SQLite)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# PRAGMAs applied to every new SQLite connection
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+# How long a transaction waits for the write lock, matching DB_POOL_TIMEOUT's wait for a connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for create_engine()/create_async_engine() for the given URL."""
+    if is_sqlite(url):
+        options = {"connect_args": {"check_same_thread": False}}
+        if ":memory:" in url or url.rstrip("/") in ("sqlite:", "sqlite+aiosqlite:"):
+            return options
+    else:
+        options = {"pool_recycle": DB_POOL_RECYCLE, "pool_pre_ping": DB_POOL_PRE_PING}
+    options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # busy_timeout first, so switching the journal mode waits out other writers
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    cursor.close()
+
+# SQLite transactions start with BEGIN IMMEDIATE, taking the write lock up
+# front: a deferred transaction that reads before writing cannot wait for
+# another writer (busy_timeout does not apply to the upgrade) and fails with
+# "database is locked". Work that only reads runs with these execution
+# options and keeps a deferred BEGIN, so it never waits for writers.
+READ_ONLY = {"sqlite_begin": "DEFERRED"}
+
+def disable_driver_begin(dbapi_connection, connection_record):
+    # The driver would emit a deferred BEGIN on its own; begin_sqlite_transaction() emits it instead
+    dbapi_connection.isolation_level = None
+
+def begin_sqlite_transaction(connection):
+    connection.exec_driver_sql(f"BEGIN {connection.get_execution_options().get('sqlite_begin', 'IMMEDIATE')}")
+
+def listen_sqlite(sync_engine):
+    event.listen(sync_engine, "connect", set_sqlite_pragmas)
+    event.listen(sync_engine, "connect", disable_driver_begin)
+    event.listen(sync_engine, "begin", begin_sqlite_transaction)
+
+def create_db_engine(url: str = DATABASE_URL, **options):
+    """Create the sync engine with the configured pool settings and SQLite PRAGMAs."""
+    db_engine = create_engine(url, **engine_options(url), **options)
+    if is_sqlite(url):
+        listen_sqlite(db_engine)
+    return db_engine
+
+def create_async_db_engine(url: str = DATABASE_URL, **options):
+    """Create an AsyncEngine for the async driver matching ``url``, configured like create_db_engine()."""
+    db_engine = create_async_engine(async_database_url(url), **engine_options(url), **options)
+    if is_sqlite(url):
+        listen_sqlite(db_engine.sync_engine)
+    return db_engine
+
+# Session.info flag of sessions that read a replica (see src.database.replicas)
+REPLICA_SESSION = "reads_replica"
+
+def reads_replica(db) -> bool:
+    """True when ``db`` reads a replica, whose data may lag the primary."""
+    return db.info.get(REPLICA_SESSION, False)
+
+def read_only(db):
+    """Start the session's SQLite transactions deferred; for sessions that are only read from."""
+    db.bind = db.bind.execution_options(**READ_ONLY)
+    return db
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+if DATABASE_MODE == "async":
+    async_engine = create_async_db_engine()
+    # Objects returned from services are read after commit, outside the session's greenlet
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+else:
+    # Closed on the event loop rather than in the threadpool, so returning a
+    # connection to the pool never waits for a free worker thread
+    async def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+async def run_service(db, fn, *args, **kwargs):
+    """Call a service function with the request's session in either database mode.
+
+    Service functions are written against a synchronous Session. With an
+    AsyncSession they run through ``run_sync``, which drives the async driver
+    from a greenlet so the event loop is never blocked on database I/O. With
+    a Session they run in the threadpool, so waiting for a pooled connection
+    or a slow query blocks one worker thread instead of the event loop.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(session, *args, **kwargs))
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+def dialect_insert(db: Session):
+    """Return the insert() construct for the session's dialect, which supports ON CONFLICT."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """True when an IntegrityError was raised by a UNIQUE constraint or index."""
+    pgcode = getattr(error.orig, "pgcode", None)
+    if pgcode is not None:
+        return pgcode == "23505"
+    return "UNIQUE constraint failed" in str(error.orig)
\ No newline at end of file
@@ -0,0 +1,193 @@
+import asyncio
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from fastapi import Depends, Request, Response
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from src.database.core import (
+    DATABASE_MODE, READ_ONLY, REPLICA_SESSION, create_async_db_engine, create_db_engine, get_db, read_only
+)
+from src.rate_limiter import client_key
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated URLs of read replicas of DATABASE_URL; none routes every read to the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# How often replicas are pinged; a replica that fails is skipped until a ping succeeds
+REPLICA_HEALTH_INTERVAL_SECONDS = float(os.environ.get("REPLICA_HEALTH_INTERVAL_SECONDS", "5"))
+# After a write, the client's reads go to the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.environ.get("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_MAX_KEYS = int(os.environ.get("READ_YOUR_WRITES_MAX_KEYS", "100000"))
+
+# Carries the stickiness deadline to whichever worker serves the next read
+STICKY_COOKIE = "read_primary_until"
+# Writes that change quiz content; the quiz's reads stay on the primary for the
+# window, so every reader sees the new content despite replication lag
+CONTENT_WRITE_ROUTES = {"/quiz/{quiz_id}/question", "/quiz/{quiz_id}/import"}
+
+
+class Replica:
+    def __init__(self, url: str, async_mode: bool = DATABASE_MODE == "async"):
+        self.url = url
+        self.async_mode = async_mode
+        if async_mode:
+            self.engine = create_async_db_engine(url, execution_options=READ_ONLY)
+            self.session_factory = async_sessionmaker(
+                self.engine, autoflush=False, expire_on_commit=False, info={REPLICA_SESSION: True}
+            )
+        else:
+            self.engine = create_db_engine(url, execution_options=READ_ONLY)
+            self.session_factory = sessionmaker(
+                autocommit=False, autoflush=False, bind=self.engine, info={REPLICA_SESSION: True}
+            )
+        self.healthy = True
+
+    def _ping_sync(self):
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    async def ping(self) -> bool:
+        try:
+            if self.async_mode:
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            else:
+                await asyncio.to_thread(self._ping_sync)
+        except Exception:
+            return False
+        return True
+
+
+class ReplicaRouter:
+    """Picks the database for read-only requests.
+
+    Reads go round-robin to the replicas that passed their last health
+    check, and to the primary when none did. Clients that wrote within
+    ``sticky_seconds``, and quizzes whose content changed within it, are
+    read from the primary so they see their own writes despite replication
+    lag. Stickiness is kept in memory, keyed like rate limits, and in a
+    cookie for requests that reach another worker.
+    """
+
+    def __init__(self, replicas: List[Replica], sticky_seconds: float, health_interval: float, max_keys: int):
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self.health_interval = health_interval
+        self.max_keys = max_keys
+        self._turn = itertools.count()
+        self._sticky: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def pick(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def mark(self, key: str, until: float):
+        with self._lock:
+            if len(self._sticky) >= self.max_keys and key not in self._sticky:
+                now = time.time()
+                self._sticky = {other: deadline for other, deadline in self._sticky.items() if deadline > now}
+            self._sticky[key] = until
+
+    def is_sticky(self, keys, now: float) -> bool:
+        return any(self._sticky.get(key, 0) > now for key in keys)
+
+    def clear(self):
+        with self._lock:
+            self._sticky.clear()
+
+    async def route(self, request: Request) -> Optional[Replica]:
+        """The replica to read from, or None for the primary."""
+        if not self.replicas:
+            return None
+        now = time.time()
+        try:
+            if float(request.cookies.get(STICKY_COOKIE, 0)) > now:
+                return None
+        except ValueError:
+            pass
+        keys = [await client_key(request)]
+        quiz_id = request.path_params.get("quiz_id")
+        if quiz_id is not None:
+            keys.append(f"quiz:{quiz_id}")
+        if self.is_sticky(keys, now):
+            return None
+        return self.pick()
+
+    async def check(self):
+        for replica in self.replicas:
+            healthy = await replica.ping()
+            if healthy != replica.healthy:
+                if healthy:
+                    logger.info("Read replica %s is back", replica.engine.url)
+                else:
+                    logger.warning("Read replica %s failed its health check; reading from the primary", replica.engine.url)
+            replica.healthy = healthy
+
+    async def run(self):
+        """Health-check the replicas every ``health_interval`` seconds until stopped."""
+        self._stop.clear()
+        while not self._stop.is_set():
+            await self.check()
+            await asyncio.to_thread(self._stop.wait, self.health_interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+router = ReplicaRouter(
+    [Replica(url) for url in DATABASE_REPLICA_URLS],
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_HEALTH_INTERVAL_SECONDS,
+    READ_YOUR_WRITES_MAX_KEYS
+)
+
+
+async def get_read_db(request: Request, db=Depends(get_db)):
+    """Session for read-only handlers: a replica's, or the request's primary session.
+
+    The primary session is created either way but only connects when used.
+    A replica that fails a query is skipped until its next health check.
+    """
+    replica = await router.route(request)
+    if replica is None:
+        yield read_only(db)
+        return
+    if replica.async_mode:
+        async with replica.session_factory() as replica_db:
+            try:
+                yield replica_db
+            except OperationalError:
+                replica.healthy = False
+                raise
+        return
+    replica_db = replica.session_factory()
+    try:
+        yield replica_db
+    except OperationalError:
+        replica.healthy = False
+        raise
+    finally:
+        replica_db.close()
+
+
+async def read_your_writes(request: Request, response: Response):
+    """App-wide dependency: pins the client's reads, and a changed quiz's, to the primary after a write."""
+    if not router.replicas or request.method in ("GET", "HEAD", "OPTIONS"):
+        return
+    until = time.time() + router.sticky_seconds
+    router.mark(await client_key(request), until)
+    route = request.scope.get("route")
+    if getattr(route, "path", None) in CONTENT_WRITE_ROUTES:
+        router.mark(f"quiz:{request.path_params['quiz_id']}", until)
+    response.set_cookie(STICKY_COOKIE, f"{until:.3f}", max_age=math.ceil(router.sticky_seconds), httponly=True)
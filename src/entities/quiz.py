@@ -1,4 +1,5 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from src.database.core import Base
 
@@ -9,17 +10,36 @@ class Quiz(Base):
     title = Column(String, unique=True, index=True)
     description = Column(String)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Kept up to date by create_question and the importer, so results don't need a COUNT(*)
+    question_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped whenever questions are added; part of the questions payload ETag
+    content_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    questions = relationship("Question", back_populates="quiz", order_by="Question.id")
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # Keyset pages of a quiz's questions seek on (quiz_id, id) without sorting
+        Index("ix_questions_quiz_id_id", "quiz_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"))
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), index=True)
     question_text = Column(String)
+    # Optional labels that question samples can be stratified by
+    tag = Column(String, nullable=True)
+    difficulty = Column(String, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    quiz = relationship("Quiz", back_populates="questions")
+    options = relationship("QuestionOptions", back_populates="question", order_by="QuestionOptions.id")
+
 class QuestionOptions(Base):
     __tablename__ = "question_options"
+    __table_args__ = (
+        Index("ix_question_options_question_id_correct_answer", "question_id", "correct_answer"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"))
@@ -27,8 +47,15 @@ class QuestionOptions(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     correct_answer = Column(Boolean, default=False)
 
+    question = relationship("Question", back_populates="options")
+
 class Result(Base):
     __tablename__ = "results"
+    __table_args__ = (
+        Index("uq_results_quiz_id_user_id", "quiz_id", "user_id", unique=True),
+        Index("ix_results_user_id_quiz_id", "user_id", "quiz_id"),
+        Index("ix_results_quiz_id_score", "quiz_id", "score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     quiz_id = Column(Integer, ForeignKey("quizzes.id"))
@@ -37,10 +64,69 @@ class Result(Base):
 
 class Attempt(Base):
     __tablename__ = "attempts"
+    __table_args__ = (
+        Index("uq_attempts_quiz_id_user_id_question_id", "quiz_id", "user_id", "question_id", unique=True),
+        Index("ix_attempts_user_id_quiz_id_question_id", "user_id", "quiz_id", "question_id"),
+        Index("ix_attempts_question_id_selected_option_id", "question_id", "selected_option_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     quiz_id = Column(Integer, ForeignKey("quizzes.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     question_id = Column(Integer, ForeignKey("questions.id"))
     selected_option = Column(String)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    # Null for text answers that matched no option, and for attempts stored before migration 0009
+    selected_option_id = Column(Integer, ForeignKey("question_options.id"), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+# How many attempts at a question chose each option, or gave each normalized
+# text answer that matched no option; maintained by src.quiz.analytics
+class AnswerCount(Base):
+    __tablename__ = "answer_counts"
+    __table_args__ = (
+        Index(
+            "uq_answer_counts_quiz_id_question_id_option_id", "quiz_id", "question_id", "option_id", unique=True,
+            sqlite_where=text("option_id IS NOT NULL"), postgresql_where=text("option_id IS NOT NULL")
+        ),
+        Index(
+            "uq_answer_counts_quiz_id_question_id_answer", "quiz_id", "question_id", "answer", unique=True,
+            sqlite_where=text("option_id IS NULL"), postgresql_where=text("option_id IS NULL")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    # Set for answers that chose an option, whose answer is then ""
+    option_id = Column(Integer, ForeignKey("question_options.id"), nullable=True)
+    answer = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+# A timed attempt at a quiz; its answers are kept in exam_session_answers until it is scored
+class ExamSession(Base):
+    __tablename__ = "exam_sessions"
+    __table_args__ = (
+        # The expiry sweeper looks up running sessions by expiry time
+        Index("ix_exam_sessions_status_expires_at", "status", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # "running", "finished" or "expired"
+    status = Column(String, nullable=False, default="running")
+    question_count = Column(Integer, nullable=False)
+    # Null while running, and for sessions closed without their answers before migration 0013
+    answered = Column(Integer, nullable=True)
+    score = Column(Integer, nullable=True)
+    started_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+# The option chosen for a question of a running exam session; answering again replaces it.
+# Rows are deleted when the session is scored and its answers stored as attempts.
+class ExamSessionAnswer(Base):
+    __tablename__ = "exam_session_answers"
+
+    session_id = Column(Integer, ForeignKey("exam_sessions.id"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
+    option_id = Column(Integer, ForeignKey("question_options.id"), nullable=False)
@@ -1,8 +1,43 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from src.database.core import Base, engine
+from src.database.replicas import read_your_writes
+from src.database.replicas import router as replica_router
+from src.metrics import MetricsMiddleware, registry
+from src.quiz.attempt_log import attempt_log
+from src.quiz.cache import quiz_cache
 from src.quiz.controller import router as quiz_router
+from src.quiz.exam_sessions import exam_sessions
+from src.rate_limiter import rate_limit
 from src.users.controller import router as user_router
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flusher = None
+    if attempt_log is not None:
+        # Replay attempts a previous process accepted but did not flush
+        await asyncio.to_thread(attempt_log.recover)
+        flusher = asyncio.create_task(attempt_log.run())
+    sweeper = asyncio.create_task(exam_sessions.run())
+    health_checks = asyncio.create_task(replica_router.run()) if replica_router.replicas else None
+    try:
+        yield
+    finally:
+        exam_sessions.stop()
+        await sweeper
+        if health_checks is not None:
+            replica_router.stop()
+            await health_checks
+        if flusher is not None:
+            attempt_log.stop()
+            await flusher
+
+
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(rate_limit), Depends(read_your_writes)])
+app.add_middleware(MetricsMiddleware)
 
 """ Only uncomment below to create new tables, 
 otherwise the tests will fail if not connected
@@ -14,5 +49,13 @@ Base.metadata.create_all(bind=engine)
 async def root():
     return {"message": "Quiz App API"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    cache_stats = quiz_cache.stats()
+    return registry.render(
+        counters={f"quizapp_quiz_cache_{name}_total": cache_stats[name] for name in ("hits", "misses", "evictions", "expirations")},
+        gauges={"quizapp_quiz_cache_entries": cache_stats["size"]}
+    )
+
 app.include_router(quiz_router)
 app.include_router(user_router)
@@ -0,0 +1,234 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Requests running at least this many copies of one SQL statement are logged as possible N+1 queries
+METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get("METRICS_N_PLUS_ONE_THRESHOLD", "10"))
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_LOG_LENGTH = 200
+# Quoted strings, numbers and bind placeholders (qmark, pyformat and asyncpg
+# numbered styles), then IN-lists of any length, are folded before hashing
+_STATEMENT_VALUES = re.compile(r"'(?:[^']|'')*'|%\(\w+\)s|\$\d+|\b\d+(?:\.\d+)?\b")
+_STATEMENT_LISTS = re.compile(r"\(\?(?:\s*,\s*\?)+\)")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """A short hash identifying ``statement`` regardless of its literals, placeholders or IN-list lengths."""
+    normalized = _STATEMENT_VALUES.sub("?", " ".join(statement.split()))
+    normalized = _STATEMENT_LISTS.sub("(?)", normalized)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+class RequestStats:
+    """SQL activity of one request, filled in by the engine event hooks."""
+
+    __slots__ = ("queries", "db_seconds", "slowest_seconds", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.statements = Counter()
+
+    def record_query(self, statement: str, elapsed: float):
+        self.queries += 1
+        self.db_seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_request.get() is not None:
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    start_times = conn.info.get("query_start_times")
+    if stats is not None and start_times:
+        stats.record_query(statement, time.perf_counter() - start_times.pop())
+
+
+class RouteMetrics:
+    __slots__ = ("requests", "bucket_counts", "seconds", "queries", "db_seconds", "slowest_seconds", "slowest_fingerprint")
+
+    def __init__(self):
+        self.requests = Counter()
+        self.bucket_counts = [0] * len(DURATION_BUCKETS)
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_fingerprint = ""
+
+
+class MetricsRegistry:
+    """Per-route request and SQL totals, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        slowest = None
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.requests[status] += 1
+            bucket = bisect_left(DURATION_BUCKETS, seconds)
+            if bucket < len(DURATION_BUCKETS):
+                metrics.bucket_counts[bucket] += 1
+            metrics.seconds += seconds
+            metrics.queries += stats.queries
+            metrics.db_seconds += stats.db_seconds
+            if stats.slowest_seconds > metrics.slowest_seconds:
+                metrics.slowest_seconds = stats.slowest_seconds
+                metrics.slowest_fingerprint = slowest = statement_fingerprint(stats.slowest_statement)
+        if slowest is not None:
+            # The statement itself stays out of /metrics: its text is neither a bounded nor a public label
+            logger.info(
+                "Slowest SQL statement for %s %s so far took %.6fs, fingerprint %s: %s",
+                method, route, stats.slowest_seconds, slowest, " ".join(stats.slowest_statement.split())
+            )
+
+    def render(self, counters: Optional[Dict[str, float]] = None, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Render every route's metrics, plus unlabelled ``counters`` and ``gauges``."""
+        lines = [
+            "# HELP quizapp_http_requests_total Requests handled, by route and status.",
+            "# TYPE quizapp_http_requests_total counter",
+        ]
+        with self._lock:
+            routes = sorted(self._routes.items())
+            for (method, route), metrics in routes:
+                for status, count in sorted(metrics.requests.items()):
+                    lines.append(f'quizapp_http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+            lines += [
+                "# HELP quizapp_http_request_duration_seconds Wall time of requests, by route.",
+                "# TYPE quizapp_http_request_duration_seconds histogram",
+            ]
+            for (method, route), metrics in routes:
+                labels = f'method="{method}",route="{_escape(route)}"'
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, metrics.bucket_counts):
+                    cumulative += count
+                    lines.append(f'quizapp_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                total = sum(metrics.requests.values())
+                lines.append(f'quizapp_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+                lines.append(f"quizapp_http_request_duration_seconds_sum{{{labels}}} {metrics.seconds:.6f}")
+                lines.append(f"quizapp_http_request_duration_seconds_count{{{labels}}} {total}")
+
+            lines += [
+                "# HELP quizapp_db_queries_total SQL statements executed, by route.",
+                "# TYPE quizapp_db_queries_total counter",
+            ]
+            for (method, route), metrics in routes:
+                lines.append(f'quizapp_db_queries_total{{method="{method}",route="{_escape(route)}"}} {metrics.queries}')
+            lines += [
+                "# HELP quizapp_db_query_seconds_total Time spent executing SQL statements, by route.",
+                "# TYPE quizapp_db_query_seconds_total counter",
+            ]
+            for (method, route), metrics in routes:
+                lines.append(f'quizapp_db_query_seconds_total{{method="{method}",route="{_escape(route)}"}} {metrics.db_seconds:.6f}')
+            lines += [
+                "# HELP quizapp_db_slowest_query_seconds Slowest SQL statement seen, by route and statement fingerprint (logged with its text).",
+                "# TYPE quizapp_db_slowest_query_seconds gauge",
+            ]
+            for (method, route), metrics in routes:
+                if metrics.slowest_fingerprint:
+                    lines.append(
+                        f'quizapp_db_slowest_query_seconds{{method="{method}",route="{_escape(route)}",'
+                        f'fingerprint="{metrics.slowest_fingerprint}"}} {metrics.slowest_seconds:.6f}'
+                    )
+
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for name, value in (values or {}).items():
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and counts the SQL statements it runs.
+
+    Adds a ``Server-Timing`` header (total and database time) to the response
+    and records the request in ``registry`` once the body has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter() - start) * 1000
+                timing = (
+                    f'app;dur={elapsed:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "<unmatched>")
+            registry.observe(scope["method"], route_path, status, time.perf_counter() - start, stats)
+            _warn_repeated_statements(scope["method"], route_path, stats)
+
+
+def _warn_repeated_statements(method: str, route: str, stats: RequestStats):
+    if not stats.statements or METRICS_N_PLUS_ONE_THRESHOLD <= 0:
+        return
+    statement, count = stats.statements.most_common(1)[0]
+    if count >= METRICS_N_PLUS_ONE_THRESHOLD:
+        logger.warning(
+            "%s %s ran the same SQL statement %s times (%s statements in total); possible N+1 query: %s",
+            method, route, count, stats.queries, " ".join(statement.split())[:STATEMENT_LOG_LENGTH]
+        )
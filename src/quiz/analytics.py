@@ -0,0 +1,135 @@
+import argparse
+import logging
+import os
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import case, func, text
+from sqlalchemy.orm import Session
+from src.database.core import dialect_insert
+from src.entities import quiz as quiz_entities
+
+logger = logging.getLogger(__name__)
+
+# Questions recounted per transaction by the rebuild job
+ANALYTICS_REBUILD_BATCH_SIZE = int(os.environ.get("ANALYTICS_REBUILD_BATCH_SIZE", "1000"))
+
+# Counter rows per upsert statement, well below the bound-parameter limits
+RECORD_BATCH_SIZE = 1000
+
+AnswerCount = quiz_entities.AnswerCount
+
+
+def normalize_answer(answer: Optional[str]) -> str:
+    """The form answers are graded and counted in."""
+    return (answer or "").strip().lower()
+
+
+def counter_key(answer: Optional[str], option_id: Optional[int]) -> Tuple[Optional[int], str]:
+    """The ``(option_id, answer)`` counter an attempt is counted in.
+
+    Answers that chose an option are counted by its id, so renaming the
+    option or options differing only in case keep their own counts; text
+    answers that matched no option are counted by their normalized text.
+    """
+    if option_id is not None:
+        return option_id, ""
+    return None, normalize_answer(answer)
+
+
+def _upsert_counts(db: Session, counts: Counter, index_element, where: str):
+    insert = dialect_insert(db)
+    # Rows are upserted in key order so concurrent writers lock them in the same order
+    rows = [
+        {"quiz_id": quiz_id, "question_id": question_id, "option_id": option_id, "answer": answer, "count": count}
+        for (quiz_id, question_id, option_id, answer), count in sorted(counts.items())
+    ]
+    for start in range(0, len(rows), RECORD_BATCH_SIZE):
+        stmt = insert(AnswerCount).values(rows[start:start + RECORD_BATCH_SIZE])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[AnswerCount.quiz_id, AnswerCount.question_id, index_element],
+            index_where=text(where),
+            set_={"count": AnswerCount.count + stmt.excluded.count}
+        ))
+
+
+def record_answers(db: Session, answers: Iterable[Tuple[int, int, str, Optional[int]]]):
+    """Add stored ``(quiz_id, question_id, answer, selected option id)`` attempts to the answer counters.
+
+    Runs inside the caller's transaction, so counters commit with the attempts.
+    """
+    by_option, by_text = Counter(), Counter()
+    for quiz_id, question_id, answer, option_id in answers:
+        key = (quiz_id, question_id, *counter_key(answer, option_id))
+        (by_text if key[2] is None else by_option)[key] += 1
+    # Each kind of counter has its own partial unique index to upsert against
+    if by_option:
+        _upsert_counts(db, by_option, AnswerCount.option_id, "option_id IS NOT NULL")
+    if by_text:
+        _upsert_counts(db, by_text, AnswerCount.answer, "option_id IS NULL")
+
+
+def rebuild_answer_counts(db: Session, quiz_id: int) -> int:
+    """Recompute the quiz's counters from ``attempts``; returns the number of attempts counted.
+
+    Each batch of questions is counted with one GROUP BY over the chosen
+    options and raw answers, so the database aggregates and Python only
+    normalizes distinct answers.
+    Answers submitted to a batch while it is being recounted may be missed;
+    rebuild again once writes are quiet if exact counts matter.
+    """
+    question_ids = [
+        question_id for question_id, in db.query(quiz_entities.Question.id).filter(
+            quiz_entities.Question.quiz_id == quiz_id
+        ).order_by(quiz_entities.Question.id)
+    ]
+    total = 0
+    for start in range(0, len(question_ids), ANALYTICS_REBUILD_BATCH_SIZE):
+        batch = question_ids[start:start + ANALYTICS_REBUILD_BATCH_SIZE]
+        counts = Counter()
+        # Text is only grouped on for attempts without an option id
+        answer = case(
+            (quiz_entities.Attempt.selected_option_id.is_(None), quiz_entities.Attempt.selected_option), else_=None
+        )
+        for question_id, option_id, answer, count in db.query(
+            quiz_entities.Attempt.question_id, quiz_entities.Attempt.selected_option_id, answer, func.count()
+        ).filter(
+            quiz_entities.Attempt.quiz_id == quiz_id,
+            quiz_entities.Attempt.question_id.in_(batch)
+        ).group_by(quiz_entities.Attempt.question_id, quiz_entities.Attempt.selected_option_id, answer):
+            counts[(question_id, *counter_key(answer, option_id))] += count
+
+        db.query(AnswerCount).filter(
+            AnswerCount.quiz_id == quiz_id, AnswerCount.question_id.in_(batch)
+        ).delete(synchronize_session=False)
+        if counts:
+            db.execute(AnswerCount.__table__.insert(), [
+                {"quiz_id": quiz_id, "question_id": question_id, "option_id": option_id, "answer": answer, "count": count}
+                for (question_id, option_id, answer), count in counts.items()
+            ])
+        db.commit()
+        total += sum(counts.values())
+    return total
+
+
+def rebuild_all(db: Session, quiz_ids: Optional[List[int]] = None) -> int:
+    """Rebuild the counters of ``quiz_ids``, or of every quiz."""
+    if quiz_ids is None:
+        quiz_ids = [quiz_id for quiz_id, in db.query(quiz_entities.Quiz.id).order_by(quiz_entities.Quiz.id)]
+    total = 0
+    for quiz_id in quiz_ids:
+        counted = rebuild_answer_counts(db, quiz_id)
+        logger.info("Rebuilt answer counts of quiz %s from %s attempts", quiz_id, counted)
+        total += counted
+    return total
+
+
+if __name__ == "__main__":
+    from src.database.core import SessionLocal
+    from src.logging import LogLevels, configure_logging
+
+    parser = argparse.ArgumentParser(description="Recompute answer counters from the attempts table.")
+    parser.add_argument("quiz_ids", nargs="*", type=int, help="quizzes to rebuild (default: all)")
+    args = parser.parse_args()
+    configure_logging(LogLevels.info)
+    with SessionLocal() as db:
+        print(f"Counted {rebuild_all(db, args.quiz_ids or None)} attempts")
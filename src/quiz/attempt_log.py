@@ -0,0 +1,456 @@
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import IO, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from src.database.core import SessionLocal, dialect_insert
+from src.entities import quiz as quiz_entities
+from src.quiz import queries
+from src.quiz.analytics import record_answers
+
+logger = logging.getLogger(__name__)
+
+# "direct" commits every attempt in the request; "write_behind" queues graded
+# attempts in memory (backed by a spool file) and inserts them in batches
+ATTEMPT_WRITE_MODE = os.environ.get("ATTEMPT_WRITE_MODE", "direct")
+# Queued attempts are flushed once this many are waiting, or every interval
+ATTEMPT_FLUSH_BATCH_SIZE = int(os.environ.get("ATTEMPT_FLUSH_BATCH_SIZE", "500"))
+ATTEMPT_FLUSH_INTERVAL_SECONDS = float(os.environ.get("ATTEMPT_FLUSH_INTERVAL_SECONDS", "1"))
+# Each process spools to ATTEMPT_SPOOL_PATH.<pid>; records that failed to insert
+# this many flushes are moved to ATTEMPT_SPOOL_PATH.dead
+ATTEMPT_SPOOL_PATH = os.environ.get("ATTEMPT_SPOOL_PATH", "attempts.spool")
+ATTEMPT_FLUSH_MAX_FAILURES = int(os.environ.get("ATTEMPT_FLUSH_MAX_FAILURES", "5"))
+
+
+class AttemptSpool:
+    """Append-only file of accepted attempts that are not in the database yet.
+
+    Every process spools to its own ``<path>.<pid>`` file and holds an
+    exclusive lock on ``<path>.<pid>.lock`` while it runs, so a spool whose
+    lock can be taken was left by a process that has exited.
+
+    Concurrent appends share fsync calls: ``sync()`` returns once an fsync
+    covering the caller's records has completed, whoever issued it.
+    """
+
+    def __init__(self, base_path: str):
+        self.base_path = base_path
+        self.path = f"{base_path}.{os.getpid()}"
+        self.flushing_path = self.path + ".flushing"
+        self.dead_path = base_path + ".dead"
+        self._owner = _lock_owner(self.path)
+        if self._owner is None:
+            raise RuntimeError(f"Attempt spool {self.path} is in use by another AttemptSpool")
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._file = None
+        self._written = 0
+        self._synced = 0
+
+    def write(self, records: Iterable[dict]) -> int:
+        """Append records without syncing; returns a sequence number for ``sync()``."""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(_lines(records))
+            self._written += 1
+            return self._written
+
+    def sync(self, sequence: int):
+        with self._sync_lock:
+            if self._synced >= sequence:
+                return
+            with self._lock:
+                self._file.flush()
+                target = self._written
+                fd = self._file.fileno()
+            os.fsync(fd)
+            self._synced = target
+
+    def rotate(self):
+        """Move the records written so far to the flushing file and start a new spool.
+
+        A flushing file left behind by a failed flush is kept and extended, so
+        it always holds every record that has not been committed.
+        """
+        with self._sync_lock, self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._synced = self._written
+            if os.path.exists(self.path):
+                self._move_to_flushing(self.path)
+
+    def adopt_orphans(self) -> int:
+        """Move the spools of processes that have exited to this process's flushing file.
+
+        Spools at the bare ``base_path`` were written before each process had
+        its own. Returns the number of files adopted.
+        """
+        directory, name = os.path.split(os.path.abspath(self.base_path))
+        spool_file = re.compile(re.escape(name) + r"(\.\d+)?(\.flushing|\.lock)?")
+        owners = set()
+        for entry in os.listdir(directory):
+            match = spool_file.fullmatch(entry)
+            if match:
+                owners.add(os.path.join(directory, name + (match.group(1) or "")))
+        owners.discard(os.path.abspath(self.path))
+
+        adopted = 0
+        for owner in sorted(owners):
+            lock = _lock_owner(owner)
+            if lock is None:
+                # Its process is still running and flushes the spool itself
+                continue
+            try:
+                with self._sync_lock, self._lock:
+                    for orphan in (owner + ".flushing", owner):
+                        if os.path.exists(orphan):
+                            self._move_to_flushing(orphan)
+                            adopted += 1
+                os.remove(owner + ".lock")
+            finally:
+                lock.close()
+        return adopted
+
+    def read_flushing(self) -> List[dict]:
+        if not os.path.exists(self.flushing_path):
+            return []
+        with open(self.flushing_path, "r", encoding="utf-8") as file:
+            # A torn last line means the process died before that append was acknowledged
+            return [json.loads(line) for line in file if line.endswith("\n")]
+
+    def keep_flushing(self, records: List[dict]):
+        """Replace the flushing file with ``records``, the ones still to be written."""
+        if records:
+            self._write_flushing(_lines(records))
+        else:
+            self.discard_flushing()
+
+    def discard_flushing(self):
+        if os.path.exists(self.flushing_path):
+            os.remove(self.flushing_path)
+
+    def dead_letter(self, records: List[dict]):
+        """Append records that will never be written to the dead-letter file shared by all processes."""
+        with open(self.dead_path, "a", encoding="utf-8") as file:
+            # One write per call, so appends from several processes do not interleave
+            file.write(_lines(records))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def close(self):
+        with self._sync_lock, self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._owner.close()
+
+    def _move_to_flushing(self, path: str):
+        if not os.path.exists(self.flushing_path):
+            os.replace(path, self.flushing_path)
+            return
+        self._write_flushing(_complete_lines(self.flushing_path) + _complete_lines(path))
+        os.remove(path)
+
+    def _write_flushing(self, content: str):
+        temporary = self.flushing_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.flushing_path)
+
+
+def _lines(records: Iterable[dict]) -> str:
+    return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+
+
+def _complete_lines(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as file:
+        content = file.read()
+    # Drop a torn last line, so appending after it cannot corrupt the next record
+    return content[:content.rfind("\n") + 1]
+
+
+def _lock_owner(path: str) -> Optional[IO]:
+    """Take the lock held by the process that owns the spool at ``path``; None if that process is running."""
+    lock = open(path + ".lock", "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether ``error`` comes from the database being unavailable rather than from the records written."""
+    if isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+def write_attempts(db: Session, records: List[dict]):
+    """Insert spooled attempt records and add their points to ``results``, then commit.
+
+    Attempts that are already stored are skipped and earn no points, so
+    replaying a spool that was partly flushed is safe. Answer counters are
+    updated for the inserted attempts only.
+    """
+    insert = dialect_insert(db)
+    attempts, results = quiz_entities.Attempt.__table__, quiz_entities.Result.__table__
+    # One statement executed with many parameter sets: compiled once and
+    # cached, sent by the driver in multi-row batches that still return rows
+    stmt = insert(attempts).on_conflict_do_nothing(
+        index_elements=[attempts.c.quiz_id, attempts.c.user_id, attempts.c.question_id]
+    ).returning(attempts.c.quiz_id, attempts.c.user_id, attempts.c.question_id)
+    connection = db.connection()
+    points = Counter()
+    answers = []
+    for start in range(0, len(records), ATTEMPT_FLUSH_BATCH_SIZE):
+        batch = records[start:start + ATTEMPT_FLUSH_BATCH_SIZE]
+        by_key = {(record["quiz_id"], record["user_id"], record["question_id"]): record for record in batch}
+        rows = [
+            {
+                "quiz_id": record["quiz_id"],
+                "user_id": record["user_id"],
+                "question_id": record["question_id"],
+                "selected_option": record["selected_option"],
+                # Spools written before option ids were recorded lack the key
+                "selected_option_id": record.get("selected_option_id"),
+                "created_at": datetime.fromisoformat(record["created_at"])
+            }
+            for record in batch
+        ]
+        for quiz_id, user_id, question_id in connection.execute(stmt, rows):
+            record = by_key[(quiz_id, user_id, question_id)]
+            points[(quiz_id, user_id)] += 1 if record["is_correct"] else 0
+            answers.append((quiz_id, question_id, record["selected_option"], record.get("selected_option_id")))
+
+    record_answers(db, answers)
+    if points:
+        upsert = insert(results)
+        connection.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[results.c.quiz_id, results.c.user_id],
+                set_={"score": results.c.score + upsert.excluded.score}
+            ),
+            # In key order, so concurrent writers lock result rows in the same order
+            [{"quiz_id": quiz_id, "user_id": user_id, "score": score} for (quiz_id, user_id), score in sorted(points.items())]
+        )
+    db.commit()
+
+
+class AttemptLog:
+    """Write-behind queue of graded attempts.
+
+    Accepted attempts are appended to the spool (and fsynced) before the
+    request returns, kept in memory until a background task inserts them in
+    batches, and deleted from the spool once that transaction commits.
+    Duplicate checks and scores for attempts still in the queue are served
+    from memory.
+    """
+
+    def __init__(
+        self, spool_path: str, batch_size: int, flush_interval: float,
+        max_failures: int = ATTEMPT_FLUSH_MAX_FAILURES, session_factory=SessionLocal
+    ):
+        self.spool = AttemptSpool(spool_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_failures = max_failures
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._waiting = 0
+        self._pending = set()
+        self._scores = {}
+        self._queued = Counter()
+        # Bumped after every commit; readers that raced a flush retry
+        self._generation = 0
+
+    def __len__(self):
+        return self._waiting
+
+    def append(
+        self, db: Session, quiz_id: int, user_id: int, attempts: List[Tuple[int, str, Optional[int], bool]],
+        keep_transaction: bool = False
+    ) -> Tuple[Set[int], int]:
+        """Queue graded ``(question_id, selected_option, selected_option_id, is_correct)`` attempts of one user.
+
+        Returns the accepted question ids and the user's score including them.
+        ``db``'s transaction is ended first, unless ``keep_transaction`` is
+        set by a caller that has written in it and commits after queueing:
+        on SQLite that transaction holds the write lock, so no flush commits
+        after it began, and on Postgres every lookup sees committed flushes.
+        """
+        question_ids = [question_id for question_id, _, _, _ in attempts]
+        score_key = (quiz_id, user_id)
+        while True:
+            generation = self._generation
+            if not keep_transaction:
+                # End any open read transaction so the queries below see every flush up to ``generation``
+                db.rollback()
+            stored = queries.attempted_question_ids(db, quiz_id, user_id, question_ids)
+            stored_score = None
+            if score_key not in self._scores:
+                stored_score = queries.result_score(db, quiz_id, user_id) or 0
+
+            with self._lock:
+                score = self._scores.get(score_key, stored_score)
+                if generation != self._generation or score is None:
+                    continue
+                created_at = datetime.now(timezone.utc).isoformat()
+                accepted = []
+                for question_id, selected_option, selected_option_id, is_correct in attempts:
+                    key = (quiz_id, user_id, question_id)
+                    if question_id in stored or key in self._pending:
+                        continue
+                    self._pending.add(key)
+                    score += 1 if is_correct else 0
+                    accepted.append({
+                        "quiz_id": quiz_id,
+                        "user_id": user_id,
+                        "question_id": question_id,
+                        "selected_option": selected_option,
+                        "selected_option_id": selected_option_id,
+                        "is_correct": is_correct,
+                        "created_at": created_at
+                    })
+                if accepted:
+                    self._waiting += len(accepted)
+                    self._queued[score_key] += len(accepted)
+                    self._scores[score_key] = score
+                    sequence = self.spool.write(accepted)
+                    if self._waiting >= self.batch_size:
+                        self._wake.set()
+                break
+
+        if accepted:
+            self.spool.sync(sequence)
+        return {record["question_id"] for record in accepted}, score
+
+    def queued_scores(self, quiz_id: int) -> Dict[int, int]:
+        """User id -> score including queued attempts, for the quiz's users with attempts in the queue."""
+        with self._lock:
+            return {user_id: score for (score_quiz_id, user_id), score in self._scores.items() if score_quiz_id == quiz_id}
+
+    def flush(self) -> int:
+        """Insert every queued attempt in one transaction; returns the number written.
+
+        If that fails for a reason other than the database being unavailable,
+        the attempts are written one at a time instead, so a record that
+        cannot be inserted does not hold back the others. Such a record is
+        retried with later flushes, then moved to the dead-letter file after
+        ``max_failures`` attempts.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._wake.clear()
+                self._waiting = 0
+                self.spool.rotate()
+            # The flushing file is the batch: it also holds attempts left by a failed flush
+            records = self.spool.read_flushing()
+            if not records:
+                return 0
+            try:
+                with self.session_factory() as db:
+                    write_attempts(db, records)
+            except Exception as error:
+                if _is_transient(error):
+                    raise
+                logger.warning("Writing %s queued attempts failed, writing them one at a time: %s", len(records), error)
+                written, dead = self._write_each(records)
+            else:
+                written, dead = records, []
+                self.spool.discard_flushing()
+
+            with self._lock:
+                for record, is_dead in [(record, False) for record in written] + [(record, True) for record in dead]:
+                    key = (record["quiz_id"], record["user_id"], record["question_id"])
+                    if key not in self._pending:
+                        continue
+                    self._pending.discard(key)
+                    score_key = key[:2]
+                    self._queued[score_key] -= 1
+                    if self._queued[score_key] <= 0:
+                        del self._queued[score_key]
+                        self._scores.pop(score_key, None)
+                    elif is_dead and record["is_correct"]:
+                        # Its point was counted when it was queued
+                        self._scores[score_key] -= 1
+                self._generation += 1
+            return len(written)
+
+    def _write_each(self, records: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """Write records in a transaction each; returns the written and the dead-lettered ones."""
+        written, failed, dead = [], [], []
+        with self.session_factory() as db:
+            for record in records:
+                try:
+                    write_attempts(db, [record])
+                except Exception as error:
+                    db.rollback()
+                    if _is_transient(error):
+                        raise
+                    record["failures"] = record.get("failures", 0) + 1
+                    if record["failures"] < self.max_failures:
+                        failed.append(record)
+                        continue
+                    logger.error(
+                        "Attempt of user %s at question %s of quiz %s failed to insert %s times, moved to %s: %s",
+                        record["user_id"], record["question_id"], record["quiz_id"], record["failures"],
+                        self.spool.dead_path, error
+                    )
+                    dead.append(record)
+                else:
+                    written.append(record)
+        if dead:
+            self.spool.dead_letter(dead)
+        # Written records are dropped and failure counts kept for the next flush
+        self.spool.keep_flushing(failed)
+        return written, dead
+
+    def recover(self) -> int:
+        """Write attempts left in spools by processes that exited; call before serving."""
+        with self._flush_lock:
+            adopted = self.spool.adopt_orphans()
+        if adopted:
+            logger.info("Adopted %s spool files left by exited processes", adopted)
+        return self.flush()
+
+    async def run(self):
+        """Flush whenever ``batch_size`` attempts are queued or ``flush_interval`` passes."""
+        self._stop.clear()
+        while not self._stop.is_set():
+            await asyncio.to_thread(self._wake.wait, self.flush_interval)
+            try:
+                written = await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Flushing queued attempts failed; the spool is kept and retried")
+                continue
+            if written:
+                logger.debug("Flushed %s attempts", written)
+        await asyncio.to_thread(self.flush)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+attempt_log: Optional[AttemptLog] = None
+if ATTEMPT_WRITE_MODE == "write_behind":
+    attempt_log = AttemptLog(ATTEMPT_SPOOL_PATH, ATTEMPT_FLUSH_BATCH_SIZE, ATTEMPT_FLUSH_INTERVAL_SECONDS)
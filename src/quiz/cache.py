@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple
+from src.database.core import reads_replica
+
+
+QUIZ_CACHE_MAX_ENTRIES = int(os.environ.get("QUIZ_CACHE_MAX_ENTRIES", "1024"))
+QUIZ_CACHE_TTL_SECONDS = float(os.environ.get("QUIZ_CACHE_TTL_SECONDS", "300"))
+
+
+class AnswerKey(NamedTuple):
+    """The correct option of a question, cached for grading, and the text of every option by id."""
+    quiz_id: int
+    option_id: int
+    option_text: str
+    options: Dict[int, str] = {}
+
+
+class LRUCache:
+    """Bounded LRU cache whose entries also expire after ``ttl_seconds``.
+
+    A ``ttl_seconds`` of 0 disables expiry and a ``max_entries`` of 0
+    disables the cache entirely.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+quiz_cache = LRUCache(QUIZ_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+
+
+def cache_loaded(db, key: Hashable, value: Any):
+    """Cache ``value`` loaded through ``db``, unless ``db`` reads a replica.
+
+    Writes invalidate entries once the primary commits, but a lagging
+    replica can still return the old content after that; cached, it would
+    be served to every reader until the TTL. Replica reads still use
+    entries loaded from the primary.
+    """
+    if not reads_replica(db):
+        quiz_cache.set(key, value)
+
+
+def quiz_key(quiz_id: int):
+    return ("quiz", quiz_id)
+
+
+def questions_key(quiz_id: int):
+    return ("questions", quiz_id)
+
+
+def snapshot_key(quiz_id: int):
+    return ("questions_snapshot", quiz_id)
+
+
+def answer_key(question_id: int):
+    return ("answer_key", question_id)
+
+
+def exam_layout_key(quiz_id: int):
+    return ("exam_layout", quiz_id)
+
+
+def question_bank_key(quiz_id: int):
+    return ("question_bank", quiz_id)
@@ -1,23 +1,42 @@
-from fastapi import APIRouter, Depends
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from src.database.core import get_db
+from src.database.core import get_db, run_service
+from src.database.replicas import get_read_db
 from src.quiz import service as quiz_service
+from src.quiz import exports as quiz_exports
+from src.quiz.exam_sessions import exam_sessions
+from src.quiz import importer as quiz_importer
 from src.quiz import models as quiz_models
+from src.quiz.cache import quiz_cache
+from src.quiz.pagination import MAX_PAGE_SIZE, PAGE_SIZE
+from src.quiz.sampling import MAX_SAMPLE_SIZE, SAMPLE_SIZE, sample_questions
+from src.quiz.shuffle import shuffle_etag
+from src.quiz.snapshots import etag_matches, render_json, snapshot_response
 
 router = APIRouter(tags=["quiz"])
 
-@router.post("/create-quiz")
+@router.post("/create-quiz", response_model=quiz_models.QuizCreatedResponse)
 async def create_quiz(quiz_data: quiz_models.QuizCreate, db: Session = Depends(get_db)):
-    new_quiz = quiz_service.create_quiz(db, quiz_data)
+    new_quiz = await run_service(db, quiz_service.create_quiz, quiz_data)
     return {
         "message": "Quiz created successfully",
         "id": new_quiz.id,
         "title": new_quiz.title
     }
 
-@router.get("/quiz/{quiz_id}")
-async def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
-    quiz = quiz_service.get_quiz(db, quiz_id)
+@router.get("/quizzes", response_model=quiz_models.QuizListResponse)
+async def list_quizzes(
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    return await run_service(db, quiz_service.list_quizzes, limit, cursor)
+
+@router.get("/quiz/{quiz_id}", response_model=quiz_models.QuizResponse)
+async def get_quiz(quiz_id: int, db: Session = Depends(get_read_db)):
+    quiz = await run_service(db, quiz_service.get_quiz, quiz_id)
     return {
         "id": quiz.id,
         "title": quiz.title,
@@ -25,27 +44,138 @@ async def get_quiz(quiz_id: int, db: Session = Depends(get_db)):
         "created_at": quiz.created_at
     }
 
-@router.post("/quiz/{quiz_id}/question")
+@router.post("/quiz/{quiz_id}/question", response_model=quiz_models.QuestionCreatedResponse)
 async def create_question(
     quiz_id: int, 
     question_data: quiz_models.QuestionCreate, 
     db: Session = Depends(get_db)
 ):
-    new_question = quiz_service.create_question(db, quiz_id, question_data)
+    new_question = await run_service(db, quiz_service.create_question, quiz_id, question_data)
     return {
         "message": "Question created successfully",
         "question_id": new_question.id,
         "quiz_id": quiz_id
     }
 
-@router.post("/quiz/{quiz_id}/answer")
+@router.post("/quiz/{quiz_id}/import", response_model=quiz_models.ImportResponse)
+async def import_questions(
+    quiz_id: int,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    file_format = quiz_importer.detect_format(file.filename, format)
+    return await run_service(db, quiz_importer.import_questions, quiz_id, file.file, file_format)
+
+@router.post("/quiz/{quiz_id}/answer", response_model=quiz_models.AnswerResponse)
 async def submit_answer(
     quiz_id: int, 
     answer_data: quiz_models.AnswerSubmit, 
     db: Session = Depends(get_db)
 ):
-    return quiz_service.submit_answer(db, quiz_id, answer_data)
+    return await run_service(db, quiz_service.submit_answer, quiz_id, answer_data)
+
+@router.post("/quiz/{quiz_id}/answers", response_model=quiz_models.AnswerBatchResponse)
+async def submit_answers(
+    quiz_id: int, 
+    answers: List[quiz_models.AnswerSubmit], 
+    db: Session = Depends(get_db)
+):
+    return await run_service(db, quiz_service.submit_answers, quiz_id, answers)
+
+@router.post("/quiz/{quiz_id}/sessions", response_model=quiz_models.ExamSessionResponse)
+async def start_exam_session(
+    quiz_id: int,
+    data: quiz_models.ExamSessionStart,
+    db: Session = Depends(get_db)
+):
+    return await run_service(db, exam_sessions.start, quiz_id, data)
+
+@router.get("/sessions/{session_id}", response_model=quiz_models.ExamSessionResponse)
+async def get_exam_session(session_id: int, db: Session = Depends(get_db)):
+    return await run_service(db, exam_sessions.get, session_id)
+
+@router.post("/sessions/{session_id}/answers", response_model=quiz_models.ExamSessionResponse)
+async def submit_exam_answers(
+    session_id: int,
+    answers: List[quiz_models.ExamAnswer],
+    db: Session = Depends(get_db)
+):
+    return await run_service(db, exam_sessions.answer, session_id, answers)
+
+@router.post("/sessions/{session_id}/finish", response_model=quiz_models.ExamSessionResponse)
+async def finish_exam_session(session_id: int, db: Session = Depends(get_db)):
+    return await run_service(db, exam_sessions.finish, session_id)
+
+@router.get("/quiz/{quiz_id}/questions", response_model=quiz_models.QuizWithQuestionsResponse)
+async def get_quiz_questions(
+    quiz_id: int,
+    request: Request,
+    shuffle: bool = False,
+    user_id: Optional[int] = None,
+    seed: int = 0,
+    db: Session = Depends(get_read_db)
+):
+    snapshot = await run_service(db, quiz_service.get_quiz_questions_snapshot, quiz_id)
+    if not shuffle:
+        return snapshot_response(snapshot, request.headers)
+    if user_id is None:
+        raise HTTPException(status_code=400, detail="user_id is required to shuffle questions")
+    # Per-user bodies are not precompressed, but still revalidate without being rebuilt
+    headers = {"ETag": shuffle_etag(snapshot.etag, user_id, seed), "Cache-Control": "private"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    payload = await run_service(db, quiz_service.get_shuffled_questions, quiz_id, user_id, seed)
+    return Response(content=render_json(payload), media_type="application/json", headers=headers)
+
+@router.get("/quiz/{quiz_id}/questions/page", response_model=quiz_models.QuestionPageResponse)
+async def get_quiz_questions_page(
+    quiz_id: int,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    return await run_service(db, quiz_service.get_quiz_questions_page, quiz_id, limit, cursor)
+
+@router.get("/quiz/{quiz_id}/sample", response_model=quiz_models.QuestionSampleResponse)
+async def sample_quiz_questions(
+    quiz_id: int,
+    n: int = Query(SAMPLE_SIZE, ge=1, le=MAX_SAMPLE_SIZE),
+    stratify: Optional[Literal["tag", "difficulty"]] = None,
+    seed: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    return await run_service(db, sample_questions, quiz_id, n, stratify, seed)
+
+@router.get("/quiz/{quiz_id}/leaderboard", response_model=quiz_models.LeaderboardResponse)
+async def get_leaderboard(
+    quiz_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    user_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    return await run_service(db, quiz_service.get_leaderboard, quiz_id, limit, user_id)
+
+@router.get("/quiz/{quiz_id}/analytics/difficulty", response_model=quiz_models.QuizDifficultyResponse)
+async def get_question_difficulty(quiz_id: int, db: Session = Depends(get_read_db)):
+    return await run_service(db, quiz_service.get_question_difficulty, quiz_id)
+
+@router.get("/quiz/{quiz_id}/analytics/distribution", response_model=quiz_models.AnswerDistributionResponse)
+async def get_answer_distribution(quiz_id: int, db: Session = Depends(get_read_db)):
+    return await run_service(db, quiz_service.get_answer_distribution, quiz_id)
+
+@router.get("/quiz/{quiz_id}/export/attempts", response_class=StreamingResponse)
+async def export_quiz_attempts(quiz_id: int, format: Optional[str] = None, db: Session = Depends(get_read_db)):
+    file_format = quiz_exports.export_format(format)
+    await run_service(db, quiz_service.get_quiz, quiz_id)
+    return quiz_exports.export_response(db, quiz_exports.quiz_attempts(quiz_id), file_format, f"quiz-{quiz_id}-attempts")
+
+@router.get("/quiz/{quiz_id}/export/results", response_class=StreamingResponse)
+async def export_quiz_results(quiz_id: int, format: Optional[str] = None, db: Session = Depends(get_read_db)):
+    file_format = quiz_exports.export_format(format)
+    await run_service(db, quiz_service.get_quiz, quiz_id)
+    return quiz_exports.export_response(db, quiz_exports.quiz_results(quiz_id), file_format, f"quiz-{quiz_id}-results")
 
-@router.get("/quiz/{quiz_id}/questions")
-async def get_quiz_questions(quiz_id: int, db: Session = Depends(get_db)):
-    return quiz_service.get_quiz_questions(db, quiz_id)
\ No newline at end of file
+@router.get("/quiz-cache/stats", response_model=quiz_models.CacheStatsResponse)
+async def get_quiz_cache_stats():
+    return quiz_cache.stats()
\ No newline at end of file
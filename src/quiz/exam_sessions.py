@@ -0,0 +1,345 @@
+import asyncio
+import logging
+import operator
+import os
+import threading
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session
+from src.database.core import SessionLocal, dialect_insert
+from src.entities import quiz as quiz_entities
+from src.quiz import models as quiz_models
+from src.quiz import queries
+from src.quiz import service as quiz_service
+from src.quiz.attempt_log import attempt_log, write_attempts
+from src.quiz.cache import cache_loaded, exam_layout_key, quiz_cache
+from src.quiz.leaderboard import leaderboard
+
+logger = logging.getLogger(__name__)
+
+# Default and longest allowed session length
+EXAM_DURATION_SECONDS = int(os.environ.get("EXAM_DURATION_SECONDS", "1800"))
+EXAM_MAX_DURATION_SECONDS = int(os.environ.get("EXAM_MAX_DURATION_SECONDS", "14400"))
+# How often the sweeper finalizes expired sessions, and how many it scores per transaction
+EXAM_SWEEP_INTERVAL_SECONDS = float(os.environ.get("EXAM_SWEEP_INTERVAL_SECONDS", "30"))
+EXAM_SWEEP_BATCH_SIZE = int(os.environ.get("EXAM_SWEEP_BATCH_SIZE", "200"))
+
+ExamSession = quiz_entities.ExamSession
+ExamSessionAnswer = quiz_entities.ExamSessionAnswer
+
+# Slot values of a session's ``chosen`` array that are not option ids
+UNANSWERED = 0
+NO_CORRECT_OPTION = -1
+
+
+class ExamLayout(NamedTuple):
+    """A quiz's questions in id order, as parallel arrays indexed by position."""
+    question_ids: array
+    # Correct option id per position, NO_CORRECT_OPTION when the question has none
+    correct: array
+    positions: Dict[int, int]
+    # Option id -> position of its question
+    option_positions: Dict[int, int]
+    option_texts: Dict[int, str]
+
+
+def load_layout(db: Session, quiz_id: int) -> ExamLayout:
+    layout = quiz_cache.get(exam_layout_key(quiz_id))
+    if layout is not None:
+        return layout
+
+    quiz_service.get_quiz(db, quiz_id)
+    rows = db.query(
+        quiz_entities.Question.id,
+        quiz_entities.QuestionOptions.id,
+        quiz_entities.QuestionOptions.option_text,
+        quiz_entities.QuestionOptions.correct_answer
+    ).outerjoin(
+        quiz_entities.QuestionOptions,
+        quiz_entities.QuestionOptions.question_id == quiz_entities.Question.id
+    ).filter(
+        quiz_entities.Question.quiz_id == quiz_id
+    ).order_by(quiz_entities.Question.id, quiz_entities.QuestionOptions.id).all()
+
+    question_ids, correct = array("q"), array("q")
+    positions, option_positions, option_texts = {}, {}, {}
+    for question_id, option_id, option_text, is_correct in rows:
+        position = positions.get(question_id)
+        if position is None:
+            position = positions[question_id] = len(question_ids)
+            question_ids.append(question_id)
+            correct.append(NO_CORRECT_OPTION)
+        if option_id is None:
+            continue
+        option_positions[option_id] = position
+        option_texts[option_id] = option_text
+        if is_correct and correct[position] == NO_CORRECT_OPTION:
+            correct[position] = option_id
+
+    layout = ExamLayout(question_ids, correct, positions, option_positions, option_texts)
+    cache_loaded(db, exam_layout_key(quiz_id), layout)
+    return layout
+
+
+class RunningExam:
+    """A session's stored answers as one chosen option id per question position."""
+    __slots__ = ("layout", "chosen")
+
+    def __init__(self, layout: ExamLayout, answers: Iterable[Tuple[int, int]]):
+        self.layout = layout
+        self.chosen = array("q", [UNANSWERED]) * len(layout.question_ids)
+        for question_id, option_id in answers:
+            position = layout.positions.get(question_id)
+            # Answers to questions or options deleted since they were given are dropped
+            if position is not None and layout.option_positions.get(option_id) == position:
+                self.chosen[position] = option_id
+
+    def answered(self) -> int:
+        return len(self.chosen) - self.chosen.count(UNANSWERED)
+
+    def score(self) -> int:
+        # One C-level pass over both arrays; unanswered slots never equal an option id
+        return sum(map(operator.eq, self.chosen, self.layout.correct))
+
+    def attempts(self) -> List[Tuple[int, str, int, bool]]:
+        """``(question_id, selected_option, selected_option_id, is_correct)`` per answered question."""
+        layout = self.layout
+        return [
+            (layout.question_ids[position], layout.option_texts[option_id], option_id, option_id == layout.correct[position])
+            for position, option_id in enumerate(self.chosen)
+            if option_id != UNANSWERED
+        ]
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored times are UTC but come back naive from databases without time zone support
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _row_response(row: ExamSession, answered: Optional[int] = None) -> dict:
+    return {
+        "session_id": row.id,
+        "quiz_id": row.quiz_id,
+        "user_id": row.user_id,
+        "status": row.status,
+        "question_count": row.question_count,
+        "answered": row.answered if answered is None else answered,
+        "score": row.score,
+        "started_at": _utc(row.started_at),
+        "expires_at": _utc(row.expires_at),
+        "finished_at": _utc(row.finished_at)
+    }
+
+
+class ExamSessions:
+    """Exam sessions, scored once when they are finished or found expired.
+
+    Answers are stored as they arrive, one chosen option per question,
+    without being graded. Finalizing loads a session's answers into its
+    ``chosen`` array, scores the whole array in one pass, closes the session
+    row and stores the answers as attempts, with their points and answer
+    counters, in one transaction. Every step holds the session row's lock,
+    so any worker can serve any session and each session is scored exactly
+    once; if finalizing fails, the session keeps running with its answers
+    and the next finish or sweep finalizes it.
+    """
+
+    def __init__(
+        self,
+        sweep_interval: float = EXAM_SWEEP_INTERVAL_SECONDS,
+        batch_size: int = EXAM_SWEEP_BATCH_SIZE,
+        session_factory=SessionLocal
+    ):
+        self.sweep_interval = sweep_interval
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+
+    def start(self, db: Session, quiz_id: int, data: quiz_models.ExamSessionStart) -> dict:
+        duration = data.duration_seconds or EXAM_DURATION_SECONDS
+        if duration > EXAM_MAX_DURATION_SECONDS:
+            raise HTTPException(
+                status_code=400, detail=f"duration_seconds must be at most {EXAM_MAX_DURATION_SECONDS}"
+            )
+        layout = load_layout(db, quiz_id)
+        if not layout.question_ids:
+            raise HTTPException(status_code=400, detail="Quiz has no questions")
+
+        started_at = datetime.now(timezone.utc)
+        row = ExamSession(
+            quiz_id=quiz_id,
+            user_id=data.user_id,
+            status="running",
+            question_count=len(layout.question_ids),
+            started_at=started_at,
+            expires_at=started_at + timedelta(seconds=duration)
+        )
+        db.add(row)
+        db.commit()
+        return _row_response(row, answered=0)
+
+    def answer(self, db: Session, session_id: int, answers: List[quiz_models.ExamAnswer]) -> dict:
+        """Store chosen options; answering a question again replaces the earlier choice."""
+        row = self._lock_running(db, session_id)
+        if datetime.now(timezone.utc) >= _utc(row.expires_at):
+            self._finalize(db, [row], datetime.now(timezone.utc))
+            raise HTTPException(status_code=409, detail="Exam session has expired")
+
+        layout = load_layout(db, row.quiz_id)
+        chosen = {}
+        for answer in answers:
+            position = layout.positions.get(answer.question_id)
+            if position is None:
+                raise HTTPException(status_code=400, detail=f"Question {answer.question_id} not found in this quiz")
+            if layout.option_positions.get(answer.option_id) != position:
+                raise HTTPException(status_code=400, detail=f"Option {answer.option_id} not found for question {answer.question_id}")
+            chosen[answer.question_id] = answer.option_id
+
+        if chosen:
+            insert = dialect_insert(db)(ExamSessionAnswer.__table__)
+            db.execute(
+                insert.on_conflict_do_update(
+                    index_elements=[ExamSessionAnswer.session_id, ExamSessionAnswer.question_id],
+                    set_={"option_id": insert.excluded.option_id}
+                ),
+                [
+                    {"session_id": session_id, "question_id": question_id, "option_id": option_id}
+                    for question_id, option_id in chosen.items()
+                ]
+            )
+        response = _row_response(row, answered=self._answered(db, session_id))
+        db.commit()
+        return response
+
+    def finish(self, db: Session, session_id: int) -> dict:
+        row = self._lock_running(db, session_id)
+        self._finalize(db, [row], datetime.now(timezone.utc))
+        return _row_response(db.get(ExamSession, session_id))
+
+    def get(self, db: Session, session_id: int) -> dict:
+        row = db.get(ExamSession, session_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Exam session not found")
+        if row.status == "running":
+            return _row_response(row, answered=self._answered(db, session_id))
+        return _row_response(row)
+
+    def _answered(self, db: Session, session_id: int) -> int:
+        return db.query(func.count()).select_from(ExamSessionAnswer).filter(
+            ExamSessionAnswer.session_id == session_id
+        ).scalar()
+
+    def _lock_running(self, db: Session, session_id: int) -> ExamSession:
+        """The running session's row, locked until the transaction ends, so it cannot be finalized meanwhile."""
+        row = db.query(ExamSession).filter(
+            ExamSession.id == session_id
+        ).with_for_update().populate_existing().one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Exam session not found")
+        if row.status != "running":
+            raise HTTPException(status_code=409, detail=f"Exam session is already {row.status}")
+        return row
+
+    def _finalize(self, db: Session, rows: List[ExamSession], now: datetime) -> int:
+        """Score running sessions whose ``rows`` this transaction has locked, close them and store their answers.
+
+        Sessions are closed as ``expired`` when ``now`` is past their expiry
+        and ``finished`` otherwise. With write-behind attempts the answers
+        are queued in ``attempt_log`` before the rows are committed, so
+        attempts of the session already queued by other requests are kept
+        and scored once. Returns the number finalized.
+        """
+        session_ids = [row.id for row in rows]
+        answers = defaultdict(list)
+        for session_id, question_id, option_id in db.query(
+            ExamSessionAnswer.session_id, ExamSessionAnswer.question_id, ExamSessionAnswer.option_id
+        ).filter(ExamSessionAnswer.session_id.in_(session_ids)):
+            answers[session_id].append((question_id, option_id))
+
+        closed = []
+        # Questions the user already answered outside the session keep their first attempt
+        attempts = defaultdict(list)
+        for row in rows:
+            exam = RunningExam(load_layout(db, row.quiz_id), answers[row.id])
+            closed.append({
+                "id": row.id,
+                "status": "expired" if now >= _utc(row.expires_at) else "finished",
+                "answered": exam.answered(),
+                "score": exam.score(),
+                "finished_at": now
+            })
+            attempts[(row.quiz_id, row.user_id)].extend(exam.attempts())
+        db.execute(update(ExamSession), closed)
+        db.execute(delete(ExamSessionAnswer).where(ExamSessionAnswer.session_id.in_(session_ids)))
+
+        scores = {}
+        if attempt_log is not None:
+            for (quiz_id, user_id), graded in attempts.items():
+                accepted, score = attempt_log.append(db, quiz_id, user_id, graded, keep_transaction=True)
+                if accepted:
+                    scores[(quiz_id, user_id)] = score
+            db.commit()
+        else:
+            created_at = now.isoformat()
+            write_attempts(db, [
+                {
+                    "quiz_id": quiz_id,
+                    "user_id": user_id,
+                    "question_id": question_id,
+                    "selected_option": selected_option,
+                    "selected_option_id": selected_option_id,
+                    "is_correct": is_correct,
+                    "created_at": created_at
+                }
+                for (quiz_id, user_id), graded in attempts.items()
+                for question_id, selected_option, selected_option_id, is_correct in graded
+            ])
+            for quiz_id, user_id in attempts:
+                score = queries.result_score(db, quiz_id, user_id)
+                if score is not None:
+                    scores[(quiz_id, user_id)] = score
+            db.commit()
+        for (quiz_id, user_id), score in scores.items():
+            leaderboard.record(quiz_id, user_id, score)
+        return len(rows)
+
+    def sweep(self) -> int:
+        """Finalize every expired session, ``batch_size`` per transaction; returns the number finalized."""
+        now = datetime.now(timezone.utc)
+        finalized = 0
+        with self.session_factory() as db:
+            while True:
+                # Sessions being answered or finished elsewhere are left to that request
+                rows = db.query(ExamSession).filter(
+                    ExamSession.status == "running", ExamSession.expires_at <= now
+                ).order_by(ExamSession.expires_at).limit(self.batch_size).with_for_update(skip_locked=True).all()
+                if rows:
+                    finalized += self._finalize(db, rows, now)
+                if len(rows) < self.batch_size:
+                    break
+        return finalized
+
+    async def run(self):
+        """Sweep every ``sweep_interval`` seconds until stopped."""
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                swept = await asyncio.to_thread(self.sweep)
+            except Exception:
+                logger.exception("Sweeping expired exam sessions failed; retrying next interval")
+            else:
+                if swept:
+                    logger.debug("Finalized %s expired exam sessions", swept)
+            await asyncio.to_thread(self._stop.wait, self.sweep_interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+exam_sessions = ExamSessions()
@@ -0,0 +1,118 @@
+import csv
+import io
+import os
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, Select, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from src.database.core import READ_ONLY
+from src.entities import quiz as quiz_entities
+from src.quiz.snapshots import render_json
+
+# Rows fetched from the server-side cursor per round trip; each batch is sent as one chunk
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+Attempt = quiz_entities.Attempt
+Result = quiz_entities.Result
+
+# Every export is ordered along an index that starts with its filter column,
+# so the database streams rows in index order instead of sorting the table first
+
+def quiz_attempts(quiz_id: int) -> Select:
+    return select(
+        Attempt.id, Attempt.quiz_id, Attempt.user_id, Attempt.question_id, Attempt.selected_option,
+        Attempt.selected_option_id, Attempt.created_at
+    ).where(Attempt.quiz_id == quiz_id).order_by(Attempt.user_id, Attempt.question_id)
+
+def user_attempts(user_id: int) -> Select:
+    return select(
+        Attempt.id, Attempt.quiz_id, Attempt.user_id, Attempt.question_id, Attempt.selected_option,
+        Attempt.selected_option_id, Attempt.created_at
+    ).where(Attempt.user_id == user_id).order_by(Attempt.quiz_id, Attempt.question_id)
+
+def quiz_results(quiz_id: int) -> Select:
+    return select(Result.id, Result.quiz_id, Result.user_id, Result.score).where(
+        Result.quiz_id == quiz_id
+    ).order_by(Result.user_id)
+
+def user_results(user_id: int) -> Select:
+    return select(Result.id, Result.quiz_id, Result.user_id, Result.score).where(
+        Result.user_id == user_id
+    ).order_by(Result.quiz_id)
+
+
+def export_format(requested: Optional[str]) -> str:
+    file_format = requested or "csv"
+    if file_format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Export format must be 'csv' or 'ndjson'")
+    return file_format
+
+
+def datetime_positions(stmt: Select) -> Tuple[int, ...]:
+    return tuple(i for i, column in enumerate(stmt.selected_columns) if isinstance(column.type, DateTime))
+
+
+def encode_rows(file_format: str, columns: List[str], rows: Sequence, datetimes: Tuple[int, ...] = ()) -> bytes:
+    """Render a batch of rows as CSV lines or NDJSON objects.
+
+    Values at the ``datetimes`` positions are written as ISO 8601.
+    """
+    if datetimes:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            for i in datetimes:
+                if row[i] is not None:
+                    row[i] = row[i].isoformat()
+    if file_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+    return b"".join(render_json(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def _header(file_format: str, columns: List[str]) -> bytes:
+    # Sent before the query runs, so CSV clients get their first byte immediately
+    return encode_rows("csv", columns, [columns]) if file_format == "csv" else b""
+
+
+def iter_export(bind: Engine, stmt: Select, file_format: str) -> Iterator[bytes]:
+    """Stream ``stmt`` from a server-side cursor on its own connection."""
+    columns, datetimes = list(stmt.selected_columns.keys()), datetime_positions(stmt)
+    yield _header(file_format, columns)
+    with bind.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE, **READ_ONLY).execute(stmt)
+        for rows in result.partitions():
+            yield encode_rows(file_format, columns, rows, datetimes)
+
+
+async def aiter_export(bind: AsyncEngine, stmt: Select, file_format: str) -> AsyncIterator[bytes]:
+    """Async-mode counterpart of ``iter_export``."""
+    columns, datetimes = list(stmt.selected_columns.keys()), datetime_positions(stmt)
+    yield _header(file_format, columns)
+    async with bind.connect() as connection:
+        await connection.execution_options(**READ_ONLY)
+        result = await connection.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode_rows(file_format, columns, rows, datetimes)
+
+
+def export_response(db, stmt: Select, file_format: str, filename: str) -> StreamingResponse:
+    """Stream the rows of ``stmt`` as a file download.
+
+    Rows are read on a connection of their own, checked out from the
+    request session's engine, in batches of ``EXPORT_BATCH_SIZE``; memory
+    use does not grow with the number of rows exported.
+    """
+    if isinstance(db, AsyncSession):
+        body = aiter_export(db.bind, stmt, file_format)
+    else:
+        body = iter_export(db.get_bind(), stmt, file_format)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{file_format}"'}
+    )
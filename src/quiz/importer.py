@@ -0,0 +1,181 @@
+import codecs
+import csv
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterator, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from src.entities import quiz as quiz_entities
+from src.quiz import models as quiz_models
+from src.quiz import service as quiz_service
+from src.quiz.cache import answer_key, exam_layout_key, question_bank_key, questions_key, quiz_cache, snapshot_key
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.environ.get("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+FORMATS_BY_EXTENSION = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# Each row yields (row number, parsed question or None, error message or None)
+ParsedRow = Tuple[int, Optional[quiz_models.QuestionCreate], Optional[str]]
+
+
+def detect_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    if requested:
+        if requested not in ("jsonl", "csv"):
+            raise HTTPException(status_code=400, detail="Import format must be 'jsonl' or 'csv'")
+        return requested
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in FORMATS_BY_EXTENSION:
+        raise HTTPException(status_code=400, detail="Could not detect import format; pass format=jsonl or format=csv")
+    return FORMATS_BY_EXTENSION[extension]
+
+
+def _validate(data) -> quiz_models.QuestionCreate:
+    question = quiz_models.QuestionCreate.model_validate(data)
+    if question.correct_answer >= len(question.options) or question.correct_answer < 0:
+        raise ValueError("Invalid correct_answer index")
+    return question
+
+
+def _error_message(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
+
+
+def _decode_line(line: bytes, line_number: int) -> str:
+    # Decoded line by line rather than through a TextIOWrapper, so an invalid
+    # byte is reported on its own line and the upload is never closed with it
+    if line_number == 1 and line.startswith(codecs.BOM_UTF8):
+        line = line[len(codecs.BOM_UTF8):]
+    return line.decode("utf-8")
+
+
+def iter_jsonl_rows(stream: BinaryIO) -> Iterator[ParsedRow]:
+    """One JSON object per line: {"question_text": ..., "options": [...], "correct_answer": 0}, plus optional "tag" and "difficulty"."""
+    for row_number, line in enumerate(stream, start=1):
+        try:
+            line = _decode_line(line, row_number)
+        except UnicodeDecodeError as error:
+            yield row_number, None, f"Not valid UTF-8: {error.reason}"
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield row_number, _validate(json.loads(line)), None
+        except ValueError as error:
+            yield row_number, None, _error_message(error)
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[ParsedRow]:
+    """A header row with question_text, correct_answer and one or more option* columns; tag and difficulty are optional.
+
+    A line that is not UTF-8 or cannot be parsed as CSV ends the import with
+    an error for that line, since the records after it cannot be told apart.
+    """
+    reader = csv.DictReader(_decode_line(line, line_number) for line_number, line in enumerate(stream, start=1))
+    try:
+        option_columns = [name for name in reader.fieldnames or [] if name.startswith("option")]
+        for row in reader:
+            try:
+                yield reader.line_num, _validate({
+                    "question_text": row.get("question_text"),
+                    "options": [row[name] for name in option_columns if row.get(name)],
+                    "correct_answer": row.get("correct_answer"),
+                    "tag": row.get("tag") or None,
+                    "difficulty": row.get("difficulty") or None,
+                }), None
+            except ValueError as error:
+                yield reader.line_num, None, _error_message(error)
+    except UnicodeDecodeError as error:
+        # Raised while fetching the next line, before it is counted. DictReader
+        # only copies line_num after a complete row, so read the reader's own.
+        yield reader.reader.line_num + 1, None, f"Not valid UTF-8: {error.reason}; later rows were not read"
+    except csv.Error as error:
+        yield reader.reader.line_num, None, f"Malformed CSV: {error}; later rows were not read"
+
+
+def _insert_batch(db: Session, quiz_id: int, batch):
+    # Core inserts on the tables skip the per-row ORM bookkeeping of bulk ORM inserts
+    questions = quiz_entities.Question.__table__
+    options = quiz_entities.QuestionOptions.__table__
+    created_at = datetime.now(timezone.utc)
+
+    question_ids = db.execute(
+        insert(questions).returning(questions.c.id, sort_by_parameter_order=True),
+        [
+            {
+                "quiz_id": quiz_id,
+                "question_text": question.question_text,
+                "tag": question.tag,
+                "difficulty": question.difficulty,
+                "created_at": created_at
+            }
+            for question in batch
+        ]
+    ).scalars().all()
+    db.execute(
+        insert(options),
+        [
+            {
+                "question_id": question_id,
+                "option_text": option_text,
+                "correct_answer": i == question.correct_answer,
+                "created_at": created_at
+            }
+            for question_id, question in zip(question_ids, batch)
+            for i, option_text in enumerate(question.options)
+        ]
+    )
+    quiz_service.record_new_questions(db, quiz_id, len(batch))
+    db.commit()
+    quiz_cache.invalidate(
+        questions_key(quiz_id), snapshot_key(quiz_id), exam_layout_key(quiz_id), question_bank_key(quiz_id),
+        *(answer_key(question_id) for question_id in question_ids)
+    )
+
+
+def import_questions(db: Session, quiz_id: int, stream: BinaryIO, file_format: str):
+    """Stream questions from a JSONL or CSV file into a quiz, in batches of IMPORT_BATCH_SIZE.
+
+    Each batch is committed on its own, so rows imported before a failure are kept.
+    """
+    quiz_service.get_quiz(db, quiz_id)
+
+    rows = iter_csv_rows(stream) if file_format == "csv" else iter_jsonl_rows(stream)
+
+    imported = 0
+    failed = 0
+    errors = []
+    batch = []
+    for row_number, question, error in rows:
+        if error is not None:
+            failed += 1
+            if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({"row": row_number, "error": error})
+            continue
+        batch.append(question)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            _insert_batch(db, quiz_id, batch)
+            imported += len(batch)
+            batch.clear()
+            logger.info("Quiz %s import: %s questions imported, %s rows failed", quiz_id, imported, failed)
+    if batch:
+        _insert_batch(db, quiz_id, batch)
+        imported += len(batch)
+
+    logger.info("Quiz %s import finished: %s questions imported, %s rows failed", quiz_id, imported, failed)
+    return {
+        "quiz_id": quiz_id,
+        "imported": imported,
+        "failed": failed,
+        "errors": errors
+    }
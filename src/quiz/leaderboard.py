@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from src.entities import quiz as quiz_entities
+
+# "memory" keeps a sorted index per quiz; "table" always queries the results table
+LEADERBOARD_BACKEND = os.environ.get("LEADERBOARD_BACKEND", "memory")
+# Quizzes with more participants than this are served from the results table
+LEADERBOARD_MAX_PARTICIPANTS = int(os.environ.get("LEADERBOARD_MAX_PARTICIPANTS", "500000"))
+LEADERBOARD_MAX_QUIZZES = int(os.environ.get("LEADERBOARD_MAX_QUIZZES", "256"))
+# Indexes are rebuilt from the results table after this long, to pick up
+# scores written by other worker processes
+LEADERBOARD_REFRESH_SECONDS = float(os.environ.get("LEADERBOARD_REFRESH_SECONDS", "30"))
+
+# Keys per bucket of a ranking's sorted list; a bucket is split at twice this
+RANKING_BUCKET_SIZE = 1000
+
+
+class SortedKeys:
+    """A sorted list stored as buckets of at most ``2 * bucket_size`` keys.
+
+    Adding or removing a key is a binary search over the bucket maxima plus
+    an insertion into one bucket, O(log n + bucket_size), instead of
+    shifting the tail of one flat list. Counting the keys below a key sums
+    the lengths of the buckets before it, O(n / bucket_size).
+    """
+
+    def __init__(self, keys=(), bucket_size: int = RANKING_BUCKET_SIZE):
+        keys = sorted(keys)
+        self.bucket_size = bucket_size
+        self._buckets = [keys[start:start + bucket_size] for start in range(0, len(keys), bucket_size)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(keys)
+
+    def __len__(self):
+        return self._len
+
+    def add(self, key):
+        buckets, maxes = self._buckets, self._maxes
+        self._len += 1
+        if not buckets:
+            buckets.append([key])
+            maxes.append(key)
+            return
+        i = min(bisect_left(maxes, key), len(maxes) - 1)
+        bucket = buckets[i]
+        insort(bucket, key)
+        maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.bucket_size:
+            half = self.bucket_size
+            buckets[i:i + 1] = [bucket[:half], bucket[half:]]
+            maxes[i:i + 1] = [bucket[half - 1], bucket[-1]]
+
+    def remove(self, key):
+        """Remove ``key``, which must be present."""
+        i = bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, key)]
+        self._len -= 1
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def count_below(self, key) -> int:
+        """The number of keys less than ``key``."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return sum(map(len, islice(self._buckets, i))) + bisect_left(self._buckets[i], key)
+
+    def head(self, n: int) -> list:
+        """The ``n`` smallest keys."""
+        keys = []
+        for bucket in self._buckets:
+            if len(keys) >= n:
+                break
+            keys.extend(bucket[:n - len(keys)])
+        return keys
+
+
+class QuizRanking:
+    """Scores of one quiz kept sorted by (-score, user_id).
+
+    An update is a remove and an add on SortedKeys, so it stays cheap at
+    LEADERBOARD_MAX_PARTICIPANTS; rank lookups count the keys above a score
+    and top-N reads take the first keys.
+    """
+
+    def __init__(self, scores=()):
+        self._scores = dict(scores)
+        self._keys = SortedKeys((-score, user_id) for user_id, score in self._scores.items())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, user_id: int, score: int):
+        previous = self._scores.get(user_id)
+        if previous == score:
+            return
+        if previous is not None:
+            self._keys.remove((-previous, user_id))
+        self._scores[user_id] = score
+        self._keys.add((-score, user_id))
+
+    def rank_of_score(self, score: int) -> int:
+        """Competition rank ("1224") of a score: one more than the number of higher scores."""
+        return self._keys.count_below((-score,)) + 1
+
+    def rank(self, user_id: int) -> Optional[Tuple[int, int]]:
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return self.rank_of_score(score), score
+
+    def top(self, n: int) -> List[Tuple[int, int]]:
+        return [(user_id, -negative_score) for negative_score, user_id in self._keys.head(n)]
+
+
+class Leaderboard:
+    """Per-process registry of QuizRanking indexes, hydrated lazily from the results table.
+
+    One request at a time loads a quiz's index. While it does, others are
+    served the expired index, which still receives score changes, or, when
+    there is none yet, read the results table. They never block: in async
+    mode they share the event loop with the load.
+    """
+
+    def __init__(self):
+        self._rankings: OrderedDict = OrderedDict()
+        # Quiz id -> score changes recorded while its index is being loaded
+        self._loading: Dict[int, List[Tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._rankings.clear()
+
+    def record(self, quiz_id: int, user_id: int, score: int):
+        """Apply a score change to the quiz's index, if it is loaded or being loaded."""
+        with self._lock:
+            entry = self._rankings.get(quiz_id)
+            if entry is not None:
+                entry[0].update(user_id, score)
+            changes = self._loading.get(quiz_id)
+            if changes is not None:
+                changes.append((user_id, score))
+
+    def ranking(self, db: Session, quiz_id: int, attempt_log=None) -> Optional[QuizRanking]:
+        """The quiz's in-memory index, or None when the quiz must be served from the table.
+
+        With write-behind ``attempt_log``, scores that include attempts still
+        in its queue take precedence over the results table.
+        """
+        if LEADERBOARD_BACKEND != "memory":
+            return None
+        with self._lock:
+            entry = self._rankings.get(quiz_id)
+            if entry is not None:
+                self._rankings.move_to_end(quiz_id)
+                if entry[1] > time.monotonic() or quiz_id in self._loading:
+                    return entry[0]
+            elif quiz_id in self._loading:
+                return None
+            changes = self._loading[quiz_id] = []
+
+        try:
+            queued = {}
+            if attempt_log is not None:
+                # Queued scores first, then a fresh read transaction: an attempt
+                # flushed in between has already been committed when it leaves the queue
+                queued = attempt_log.queued_scores(quiz_id)
+                db.rollback()
+            rows = db.query(quiz_entities.Result.user_id, quiz_entities.Result.score).filter(
+                quiz_entities.Result.quiz_id == quiz_id
+            ).limit(LEADERBOARD_MAX_PARTICIPANTS + 1).all()
+        finally:
+            with self._lock:
+                del self._loading[quiz_id]
+        if len(rows) > LEADERBOARD_MAX_PARTICIPANTS:
+            return None
+
+        scores = dict(rows)
+        # Scores only grow, so the highest seen for a user is the latest
+        for user_id, score in (*queued.items(), *changes):
+            if user_id not in scores or score > scores[user_id]:
+                scores[user_id] = score
+        ranking = QuizRanking(scores.items())
+        with self._lock:
+            self._rankings[quiz_id] = (ranking, time.monotonic() + LEADERBOARD_REFRESH_SECONDS)
+            self._rankings.move_to_end(quiz_id)
+            while len(self._rankings) > LEADERBOARD_MAX_QUIZZES:
+                self._rankings.popitem(last=False)
+        return ranking
+
+
+leaderboard = Leaderboard()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional
 from datetime import datetime
 
@@ -11,13 +11,40 @@ class QuestionCreate(BaseModel):
     question_text: str
     options: List[str]
     correct_answer: int
+    tag: Optional[str] = None
+    difficulty: Optional[str] = None
 
 class AnswerSubmit(BaseModel):
+    """An answer given as the chosen option's id, its position in the user's shuffled order or, for older clients, its text."""
     question_id: int
-    answer: str
+    answer: Optional[str] = None
+    option_id: Optional[int] = None
+    option_position: Optional[int] = None
+    # The seed the shuffled questions were requested with; only used with option_position
+    seed: int = 0
     user_id: int
 
+    @model_validator(mode="after")
+    def check_one_answer(self):
+        if sum(value is not None for value in (self.answer, self.option_id, self.option_position)) != 1:
+            raise ValueError("Provide exactly one of answer, option_id or option_position")
+        return self
+
+class ExamSessionStart(BaseModel):
+    user_id: int
+    # Defaults to EXAM_DURATION_SECONDS
+    duration_seconds: Optional[int] = Field(None, ge=1)
+
+class ExamAnswer(BaseModel):
+    question_id: int
+    option_id: int
+
 # Response models
+class QuizCreatedResponse(BaseModel):
+    message: str
+    id: int
+    title: str
+
 class QuizResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
@@ -25,6 +52,32 @@ class QuizResponse(BaseModel):
     description: str
     created_at: datetime
 
+class QuizSummary(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    question_count: int
+
+class QuizListResponse(BaseModel):
+    quizzes: List[QuizSummary]
+    next_cursor: Optional[str] = None
+
+class QuestionCreatedResponse(BaseModel):
+    message: str
+    question_id: int
+    quiz_id: int
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportResponse(BaseModel):
+    quiz_id: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+
 class OptionResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: int
@@ -41,8 +94,91 @@ class QuizWithQuestionsResponse(BaseModel):
     quiz_id: int
     questions: List[QuestionResponse]
 
+class SampledQuestion(QuestionResponse):
+    tag: Optional[str] = None
+    difficulty: Optional[str] = None
+
+class QuestionSampleResponse(BaseModel):
+    quiz_id: int
+    questions: List[SampledQuestion]
+
+class QuestionPageResponse(BaseModel):
+    quiz_id: int
+    questions: List[QuestionResponse]
+    next_cursor: Optional[str] = None
+
 class AnswerResponse(BaseModel):
     message: str
     is_correct: bool
     correct_answer: Optional[str] = None
-    current_score: int
\ No newline at end of file
+    current_score: int
+
+class AnswerResultItem(BaseModel):
+    question_id: int
+    accepted: bool
+    message: str
+    is_correct: bool
+    correct_answer: Optional[str] = None
+
+class AnswerBatchResponse(BaseModel):
+    results: List[AnswerResultItem]
+    current_score: int
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    score: int
+
+class LeaderboardResponse(BaseModel):
+    quiz_id: int
+    participants: int
+    top: List[LeaderboardEntry]
+    me: Optional[LeaderboardEntry] = None
+
+class QuestionDifficulty(BaseModel):
+    question_id: int
+    attempts: int
+    correct: int
+    correct_rate: Optional[float] = None
+
+class QuizDifficultyResponse(BaseModel):
+    quiz_id: int
+    questions: List[QuestionDifficulty]
+
+class OptionCount(BaseModel):
+    option_id: int
+    text: str
+    count: int
+
+class QuestionDistribution(BaseModel):
+    question_id: int
+    attempts: int
+    options: List[OptionCount]
+    other: int
+
+class AnswerDistributionResponse(BaseModel):
+    quiz_id: int
+    questions: List[QuestionDistribution]
+
+class ExamSessionResponse(BaseModel):
+    session_id: int
+    quiz_id: int
+    user_id: int
+    status: str
+    question_count: int
+    # Null for sessions closed without their answers
+    answered: Optional[int] = None
+    # Set once the session is finished or expired
+    score: Optional[int] = None
+    started_at: datetime
+    expires_at: datetime
+    finished_at: Optional[datetime] = None
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
\ No newline at end of file
@@ -0,0 +1,27 @@
+import base64
+import json
+import os
+from typing import Optional
+from fastapi import HTTPException
+
+# Default and largest page size of the listing endpoints
+PAGE_SIZE = int(os.environ.get("PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", "500"))
+
+
+def encode_cursor(after_id: int) -> str:
+    """Opaque cursor for the page that starts after ``after_id``."""
+    return base64.urlsafe_b64encode(json.dumps({"after": after_id}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """The id a cursor from ``encode_cursor`` continues after; None for the first page."""
+    if not cursor:
+        return None
+    try:
+        after_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["after"]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(after_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_id
@@ -0,0 +1,66 @@
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import and_, bindparam, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from src.entities import quiz as quiz_entities
+
+# Prebuilt Core statements for the service's hot lookups.
+#
+# Each statement is built once, against table columns rather than ORM
+# attributes, with bound parameters for every value. SQLAlchemy memoizes
+# the cache key of a statement object, so executions skip building the
+# expression and computing its key and go straight to the engine's compiled
+# cache. They run on the session's connection, bypassing ORM execution, and
+# return plain rows.
+
+quizzes = quiz_entities.Quiz.__table__
+questions = quiz_entities.Question.__table__
+options = quiz_entities.QuestionOptions.__table__
+attempts = quiz_entities.Attempt.__table__
+results = quiz_entities.Result.__table__
+
+QUIZ_ROW = select(
+    quizzes.c.id, quizzes.c.title, quizzes.c.description, quizzes.c.created_at
+).where(quizzes.c.id == bindparam("quiz_id"))
+
+# Quiz existence, question-in-quiz and the question's options (with the
+# correct one flagged) in one round trip: no row means no quiz, a null
+# question id means the question is not in the quiz
+ANSWER_KEY_OPTIONS = select(
+    quizzes.c.id, questions.c.id, options.c.id, options.c.option_text, options.c.correct_answer
+).select_from(quizzes).outerjoin(
+    questions, and_(questions.c.quiz_id == quizzes.c.id, questions.c.id == bindparam("question_id"))
+).outerjoin(
+    options, options.c.question_id == questions.c.id
+).where(quizzes.c.id == bindparam("quiz_id")).order_by(options.c.id)
+
+ATTEMPTED_QUESTIONS = select(attempts.c.question_id).where(
+    attempts.c.quiz_id == bindparam("quiz_id"),
+    attempts.c.user_id == bindparam("user_id"),
+    attempts.c.question_id.in_(bindparam("question_ids", expanding=True))
+)
+
+RESULT_SCORE = select(results.c.score).where(
+    results.c.quiz_id == bindparam("quiz_id"),
+    results.c.user_id == bindparam("user_id")
+)
+
+
+def quiz_row(db: Session, quiz_id: int) -> Optional[Row]:
+    return db.connection().execute(QUIZ_ROW, {"quiz_id": quiz_id}).first()
+
+
+def answer_key_options(db: Session, quiz_id: int, question_id: int) -> List[Row]:
+    """``(quiz id, question id, option id, option text, correct)`` rows; see ANSWER_KEY_OPTIONS."""
+    return db.connection().execute(ANSWER_KEY_OPTIONS, {"quiz_id": quiz_id, "question_id": question_id}).all()
+
+
+def attempted_question_ids(db: Session, quiz_id: int, user_id: int, question_ids: Iterable[int]) -> Set[int]:
+    """The ids among ``question_ids`` the user has a stored attempt for."""
+    return set(db.connection().execute(
+        ATTEMPTED_QUESTIONS, {"quiz_id": quiz_id, "user_id": user_id, "question_ids": list(question_ids)}
+    ).scalars())
+
+
+def result_score(db: Session, quiz_id: int, user_id: int) -> Optional[int]:
+    return db.connection().execute(RESULT_SCORE, {"quiz_id": quiz_id, "user_id": user_id}).scalar()
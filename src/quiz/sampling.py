@@ -0,0 +1,131 @@
+import os
+import random
+from array import array
+from typing import Dict, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from src.entities import quiz as quiz_entities
+from src.quiz import service as quiz_service
+from src.quiz.cache import cache_loaded, question_bank_key, quiz_cache
+
+# Default and largest number of questions one sample draws
+SAMPLE_SIZE = int(os.environ.get("SAMPLE_SIZE", "20"))
+MAX_SAMPLE_SIZE = int(os.environ.get("MAX_SAMPLE_SIZE", "500"))
+
+# Question columns a sample can be stratified by
+STRATA = ("tag", "difficulty")
+
+
+class QuestionBank(NamedTuple):
+    """A quiz's question ids, cached so samples are drawn without touching the questions table."""
+    ids: array
+    # Stratum column -> value (None for unlabelled questions) -> ids with that value
+    strata: Dict[str, Dict[Optional[str], array]]
+
+
+def load_bank(db: Session, quiz_id: int) -> QuestionBank:
+    bank = quiz_cache.get(question_bank_key(quiz_id))
+    if bank is not None:
+        return bank
+
+    quiz_service.get_quiz(db, quiz_id)
+    rows = db.query(
+        quiz_entities.Question.id,
+        quiz_entities.Question.tag,
+        quiz_entities.Question.difficulty
+    ).filter(
+        quiz_entities.Question.quiz_id == quiz_id
+    ).order_by(quiz_entities.Question.id).all()
+
+    ids = array("q")
+    strata = {column: {} for column in STRATA}
+    for question_id, tag, difficulty in rows:
+        ids.append(question_id)
+        for column, value in zip(STRATA, (tag, difficulty)):
+            stratum = strata[column].get(value)
+            if stratum is None:
+                stratum = strata[column][value] = array("q")
+            stratum.append(question_id)
+
+    bank = QuestionBank(ids, strata)
+    cache_loaded(db, question_bank_key(quiz_id), bank)
+    return bank
+
+
+def allocate(sizes: Dict[Optional[str], int], n: int) -> Dict[Optional[str], int]:
+    """Split ``n`` draws across strata in proportion to their sizes (largest remainder).
+
+    ``n`` must not exceed the total size; no stratum is given more draws
+    than it has questions.
+    """
+    total = sum(sizes.values())
+    if not total:
+        return {value: 0 for value in sizes}
+    quotas = {value: n * size // total for value, size in sizes.items()}
+    # Hand the draws lost to rounding down to the largest remainders
+    remainders = sorted(sizes, key=lambda value: n * sizes[value] % total, reverse=True)
+    for value in remainders[:n - sum(quotas.values())]:
+        quotas[value] += 1
+    return quotas
+
+
+def sample_ids(bank: QuestionBank, n: int, stratify: Optional[str] = None, rng=random) -> List[int]:
+    """``n`` distinct question ids in random order, or every id when the bank is smaller."""
+    n = min(n, len(bank.ids))
+    if stratify is None:
+        return rng.sample(bank.ids, n)
+
+    strata = bank.strata[stratify]
+    quotas = allocate({value: len(ids) for value, ids in strata.items()}, n)
+    sampled = []
+    for value, ids in strata.items():
+        sampled.extend(rng.sample(ids, quotas[value]))
+    rng.shuffle(sampled)
+    return sampled
+
+
+def sample_questions(
+    db: Session, quiz_id: int, n: int = SAMPLE_SIZE, stratify: Optional[str] = None, seed: Optional[int] = None
+):
+    """``n`` random questions of the quiz with their options.
+
+    The draw is made from the cached question bank, so only the sampled
+    questions are read from the database, together with their options in
+    one query. With ``stratify`` each tag or difficulty level gets a share
+    of the sample proportional to its share of the quiz. The same ``seed``
+    draws the same sample while the quiz is unchanged.
+    """
+    bank = load_bank(db, quiz_id)
+    sampled = sample_ids(bank, n, stratify, random.Random(seed) if seed is not None else random)
+    if not sampled:
+        return {"quiz_id": quiz_id, "questions": []}
+
+    rows = db.query(
+        quiz_entities.Question.id,
+        quiz_entities.Question.question_text,
+        quiz_entities.Question.tag,
+        quiz_entities.Question.difficulty,
+        quiz_entities.QuestionOptions.id,
+        quiz_entities.QuestionOptions.option_text
+    ).outerjoin(
+        quiz_entities.QuestionOptions,
+        quiz_entities.QuestionOptions.question_id == quiz_entities.Question.id
+    ).filter(
+        quiz_entities.Question.id.in_(sampled)
+    ).order_by(quiz_entities.Question.id, quiz_entities.QuestionOptions.id).all()
+
+    questions = {}
+    for question_id, question_text, tag, difficulty, option_id, option_text in rows:
+        question = questions.get(question_id)
+        if question is None:
+            question = questions[question_id] = {
+                "id": question_id,
+                "question_text": question_text,
+                "tag": tag,
+                "difficulty": difficulty,
+                "options": []
+            }
+        if option_id is not None:
+            question["options"].append({"id": option_id, "text": option_text})
+
+    # A question deleted since the bank was cached is left out rather than failing the draw
+    return {"quiz_id": quiz_id, "questions": [questions[i] for i in sampled if i in questions]}
@@ -1,7 +1,22 @@
-from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
+from src.database.core import dialect_insert, is_unique_violation
 from src.quiz import models as quiz_models
+from src.quiz import queries
 from src.entities import quiz as quiz_entities
+from src.quiz.analytics import normalize_answer, record_answers
+from src.quiz.attempt_log import attempt_log
+from src.quiz.leaderboard import leaderboard
+from src.quiz.pagination import decode_cursor, encode_cursor
+from src.quiz.shuffle import get_shuffle, option_at, shuffled_payload
+from src.quiz.cache import (
+    AnswerKey, answer_key, cache_loaded, exam_layout_key, question_bank_key, questions_key, quiz_cache, quiz_key,
+    snapshot_key
+)
+from src.quiz.snapshots import Snapshot, build_snapshot
 
 def create_quiz(db: Session, quiz_data: quiz_models.QuizCreate):
     existing_quiz = db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.title == quiz_data.title).first()
@@ -12,29 +27,52 @@ def create_quiz(db: Session, quiz_data: quiz_models.QuizCreate):
     db.add(new_quiz)
     db.commit()
     db.refresh(new_quiz)
+    quiz_cache.invalidate(
+        quiz_key(new_quiz.id), questions_key(new_quiz.id), snapshot_key(new_quiz.id), question_bank_key(new_quiz.id)
+    )
     return new_quiz
 
 def get_quiz(db: Session, quiz_id: int):
-    quiz = db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == quiz_id).first()
+    quiz = quiz_cache.get(quiz_key(quiz_id))
+    if quiz is not None:
+        return quiz
+
+    quiz = queries.quiz_row(db, quiz_id)
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
+    quiz = quiz_models.QuizResponse.model_validate(quiz)
+    cache_loaded(db, quiz_key(quiz_id), quiz)
     return quiz
 
+def record_new_questions(db: Session, quiz_id: int, count: int = 1) -> bool:
+    """Add ``count`` to the quiz's question_count and bump its content_version.
+
+    Returns False if the quiz does not exist.
+    """
+    return bool(db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == quiz_id).update(
+        {
+            quiz_entities.Quiz.question_count: quiz_entities.Quiz.question_count + count,
+            quiz_entities.Quiz.content_version: quiz_entities.Quiz.content_version + 1
+        },
+        synchronize_session=False
+    ))
+
 def create_question(db: Session, quiz_id: int, question_data: quiz_models.QuestionCreate):
-    quiz = db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == quiz_id).first()
-    if not quiz:
+    if not record_new_questions(db, quiz_id):
         raise HTTPException(status_code=404, detail="Quiz not found")
     
     if question_data.correct_answer >= len(question_data.options) or question_data.correct_answer < 0:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Invalid correct_answer index")
     
     new_question = quiz_entities.Question(
         quiz_id=quiz_id, 
-        question_text=question_data.question_text
+        question_text=question_data.question_text,
+        tag=question_data.tag,
+        difficulty=question_data.difficulty
     )
     db.add(new_question)
-    db.commit()
-    db.refresh(new_question)
+    db.flush()
     
     for i, option_text in enumerate(question_data.options):
         is_correct = (i == question_data.correct_answer)
@@ -46,92 +84,464 @@ def create_question(db: Session, quiz_id: int, question_data: quiz_models.Questi
         db.add(new_option)
     
     db.commit()
+    quiz_cache.invalidate(
+        questions_key(quiz_id), snapshot_key(quiz_id), exam_layout_key(quiz_id), question_bank_key(quiz_id),
+        answer_key(new_question.id)
+    )
     return new_question
 
-def submit_answer(db: Session, quiz_id: int, answer_data: quiz_models.AnswerSubmit):
-    quiz = db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == quiz_id).first()
-    if not quiz:
+def get_answer_key(db: Session, quiz_id: int, question_id: int) -> AnswerKey:
+    key = quiz_cache.get(answer_key(question_id))
+    if key is not None and key.quiz_id == quiz_id:
+        return key
+
+    # Validate the quiz and the question and load its options in one query
+    rows = queries.answer_key_options(db, quiz_id, question_id)
+    if not rows:
         raise HTTPException(status_code=404, detail="Quiz not found")
-    
-    question = db.query(quiz_entities.Question).filter(
-        quiz_entities.Question.id == answer_data.question_id,
-        quiz_entities.Question.quiz_id == quiz_id
-    ).first()
-    if not question:
+    if rows[0][1] is None:
         raise HTTPException(status_code=404, detail="Question not found in this quiz")
-    
-    existing_attempt = db.query(quiz_entities.Attempt).filter(
-        quiz_entities.Attempt.quiz_id == quiz_id,
-        quiz_entities.Attempt.user_id == answer_data.user_id,
-        quiz_entities.Attempt.question_id == answer_data.question_id
-    ).first()
-    
-    if existing_attempt:
-        raise HTTPException(status_code=400, detail="You have already attempted this question")
+    key = _answer_key(quiz_id, [(option_id, option_text, correct) for _, _, option_id, option_text, correct in rows])
+    if key is None:
+        raise HTTPException(status_code=500, detail="No correct option found for this question")
 
-    new_attempt = quiz_entities.Attempt(
-        quiz_id=quiz_id,
-        user_id=answer_data.user_id,
-        question_id=answer_data.question_id,
-        selected_option=answer_data.answer
+    cache_loaded(db, answer_key(question_id), key)
+    return key
+
+def _answer_key(quiz_id: int, options) -> Optional[AnswerKey]:
+    """Build the AnswerKey of a question from its ``(option_id, option_text, correct_answer)`` rows."""
+    correct = next(((option_id, option_text) for option_id, option_text, is_correct in options if is_correct), None)
+    if correct is None:
+        return None
+    return AnswerKey(
+        quiz_id, correct[0], correct[1],
+        {option_id: option_text for option_id, option_text, _ in options if option_id is not None}
     )
-    db.add(new_attempt)
-    db.commit()
-    db.refresh(new_attempt)
 
-    correct_option = db.query(quiz_entities.QuestionOptions).filter(
-        quiz_entities.QuestionOptions.question_id == answer_data.question_id,
-        quiz_entities.QuestionOptions.correct_answer == True
-    ).first()
+def get_answer_keys(db: Session, quiz_id: int, question_ids) -> dict:
+    """Return ``{question_id: AnswerKey}`` for the questions of the quiz among ``question_ids``.
 
-    if not correct_option:
-        raise HTTPException(status_code=500, detail="No correct option found for this question")
+    Questions that are not in the quiz or have no correct option are left out.
+    """
+    keys = {}
+    missing = []
+    for question_id in set(question_ids):
+        key = quiz_cache.get(answer_key(question_id))
+        if key is not None and key.quiz_id == quiz_id:
+            keys[question_id] = key
+        else:
+            missing.append(question_id)
+    if not missing:
+        return keys
 
-    is_correct = answer_data.answer.strip().lower() == correct_option.option_text.strip().lower()
+    get_quiz(db, quiz_id)
+    rows = db.query(
+        quiz_entities.QuestionOptions.question_id,
+        quiz_entities.QuestionOptions.id,
+        quiz_entities.QuestionOptions.option_text,
+        quiz_entities.QuestionOptions.correct_answer
+    ).join(
+        quiz_entities.Question,
+        quiz_entities.Question.id == quiz_entities.QuestionOptions.question_id
+    ).filter(
+        quiz_entities.Question.quiz_id == quiz_id,
+        quiz_entities.Question.id.in_(missing)
+    ).order_by(quiz_entities.QuestionOptions.id).all()
+    options = {}
+    for question_id, option_id, option_text, correct in rows:
+        options.setdefault(question_id, []).append((option_id, option_text, correct))
+    for question_id, question_options in options.items():
+        key = _answer_key(quiz_id, question_options)
+        if key is None:
+            continue
+        cache_loaded(db, answer_key(question_id), key)
+        keys[question_id] = key
+    return keys
 
-    user_result = db.query(quiz_entities.Result).filter(
-        quiz_entities.Result.quiz_id == quiz_id,
-        quiz_entities.Result.user_id == answer_data.user_id
-    ).first()
+def add_to_score(db: Session, quiz_id: int, user_id: int, points: int) -> int:
+    """Atomically add ``points`` to the user's result row and return the new score.
 
-    if user_result:
-        if is_correct:
-            user_result.score += 1
-    else:
-        user_result = quiz_entities.Result(
-            quiz_id=quiz_id,
-            user_id=answer_data.user_id,
-            score=1 if is_correct else 0
+    Runs inside the caller's transaction; the caller commits.
+    """
+    insert = dialect_insert(db)
+    stmt = insert(quiz_entities.Result).values(quiz_id=quiz_id, user_id=user_id, score=points)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[quiz_entities.Result.quiz_id, quiz_entities.Result.user_id],
+        set_={"score": quiz_entities.Result.score + points}
+    ).returning(quiz_entities.Result.score)
+    return db.execute(stmt).scalar_one()
+
+def _grade(key: AnswerKey, answer_data: quiz_models.AnswerSubmit) -> Optional[Tuple[bool, str, Optional[int]]]:
+    """Return ``(is_correct, selected text, selected option id)``, or None for an option not in the question.
+
+    Answers by option id are graded by comparing ids; positions in the
+    user's shuffled order are first resolved to the option id shown there.
+    Text answers are compared case- and whitespace-insensitively, and
+    linked to the option with the same text when there is one.
+    """
+    option_id = answer_data.option_id
+    if answer_data.option_position is not None:
+        option_id = option_at(
+            key.quiz_id, answer_data.user_id, answer_data.seed, answer_data.question_id,
+            list(key.options), answer_data.option_position
+        )
+        if option_id is None:
+            return None
+    if option_id is not None:
+        text = key.options.get(option_id)
+        if text is None:
+            return None
+        return option_id == key.option_id, text, option_id
+    answer = normalize_answer(answer_data.answer)
+    option_id = next((option_id for option_id, text in key.options.items() if normalize_answer(text) == answer), None)
+    return answer == normalize_answer(key.option_text), answer_data.answer, option_id
+
+def submit_answer(db: Session, quiz_id: int, answer_data: quiz_models.AnswerSubmit):
+    correct_option = get_answer_key(db, quiz_id, answer_data.question_id)
+    graded = _grade(correct_option, answer_data)
+    if graded is None:
+        raise HTTPException(status_code=400, detail="Option not found for this question")
+    is_correct, selected_option, selected_option_id = graded
+
+    if attempt_log is not None:
+        accepted, current_score = attempt_log.append(
+            db, quiz_id, answer_data.user_id,
+            [(answer_data.question_id, selected_option, selected_option_id, is_correct)]
         )
-        db.add(user_result)
+        if not accepted:
+            raise HTTPException(status_code=400, detail="You have already attempted this question")
+        leaderboard.record(quiz_id, answer_data.user_id, current_score)
+        return _graded_answer(is_correct, correct_option, current_score)
 
+    # The unique index on (quiz_id, user_id, question_id) rejects duplicate attempts
+    db.add(quiz_entities.Attempt(
+        quiz_id=quiz_id,
+        user_id=answer_data.user_id,
+        question_id=answer_data.question_id,
+        selected_option=selected_option,
+        selected_option_id=selected_option_id
+    ))
+    try:
+        db.flush()
+    except IntegrityError as error:
+        db.rollback()
+        if not is_unique_violation(error):
+            raise
+        raise HTTPException(status_code=400, detail="You have already attempted this question")
+
+    record_answers(db, [(quiz_id, answer_data.question_id, selected_option, selected_option_id)])
+    current_score = add_to_score(db, quiz_id, answer_data.user_id, 1 if is_correct else 0)
     db.commit()
-    db.refresh(user_result)
+    leaderboard.record(quiz_id, answer_data.user_id, current_score)
+    return _graded_answer(is_correct, correct_option, current_score)
 
+def _graded_answer(is_correct: bool, correct_option: AnswerKey, current_score: int):
     return {
         "message": "Correct answer!" if is_correct else "Incorrect answer",
         "is_correct": is_correct,
         "correct_answer": correct_option.option_text if not is_correct else None,
-        "current_score": user_result.score
+        "current_score": current_score
     }
 
-def get_quiz_questions(db: Session, quiz_id: int):
-    quiz = db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == quiz_id).first()
+def _rejected_answer(question_id: int, message: str):
+    return {
+        "question_id": question_id,
+        "accepted": False,
+        "message": message,
+        "is_correct": False,
+        "correct_answer": None
+    }
+
+def _insert_attempts(db: Session, quiz_id: int, user_id: int, graded: dict, selected: dict):
+    """Store new attempts and their points; returns the inserted question ids and the new score.
+
+    ``selected`` maps question ids to the ``(selected text, selected option id)`` of the answer.
+    """
+    already_attempted = queries.attempted_question_ids(db, quiz_id, user_id, graded)
+    rows = [
+        {
+            "quiz_id": quiz_id,
+            "user_id": user_id,
+            "question_id": question_id,
+            "selected_option": selected[question_id][0],
+            "selected_option_id": selected[question_id][1]
+        }
+        for question_id in graded if question_id not in already_attempted
+    ]
+
+    inserted = set()
+    if rows:
+        # Rows that lost a race with a concurrent submission are skipped by the unique index
+        insert = dialect_insert(db)
+        stmt = insert(quiz_entities.Attempt).values(rows).on_conflict_do_nothing(
+            index_elements=[
+                quiz_entities.Attempt.quiz_id,
+                quiz_entities.Attempt.user_id,
+                quiz_entities.Attempt.question_id
+            ]
+        ).returning(quiz_entities.Attempt.question_id)
+        inserted = set(db.execute(stmt).scalars())
+        record_answers(db, [(quiz_id, question_id, *selected[question_id]) for question_id in inserted])
+
+    if not inserted:
+        # Nothing was stored, so the user must not gain a result row (and a leaderboard place)
+        current_score = queries.result_score(db, quiz_id, user_id) or 0
+        db.commit()
+        return inserted, current_score
+
+    points = sum(1 for question_id in inserted if graded[question_id])
+    current_score = add_to_score(db, quiz_id, user_id, points)
+    db.commit()
+    return inserted, current_score
+
+def submit_answers(db: Session, quiz_id: int, answers: List[quiz_models.AnswerSubmit]):
+    if not answers:
+        raise HTTPException(status_code=400, detail="No answers submitted")
+    user_id = answers[0].user_id
+    if any(answer.user_id != user_id for answer in answers):
+        raise HTTPException(status_code=400, detail="All answers in a batch must belong to the same user")
+
+    keys = get_answer_keys(db, quiz_id, [answer.question_id for answer in answers])
+    grades = [_grade(keys[answer.question_id], answer) if answer.question_id in keys else None for answer in answers]
+    graded = {}
+    selected = {}
+    for answer, grade in zip(answers, grades):
+        if grade is not None and answer.question_id not in graded:
+            graded[answer.question_id] = grade[0]
+            selected[answer.question_id] = grade[1:]
+
+    if attempt_log is not None:
+        inserted, current_score = attempt_log.append(db, quiz_id, user_id, [
+            (question_id, *selected[question_id], graded[question_id]) for question_id in graded
+        ])
+    else:
+        inserted, current_score = _insert_attempts(db, quiz_id, user_id, graded, selected)
+    if inserted:
+        leaderboard.record(quiz_id, user_id, current_score)
+
+    results = []
+    reported = set()
+    for answer, grade in zip(answers, grades):
+        question_id = answer.question_id
+        if question_id not in keys:
+            results.append(_rejected_answer(question_id, "Question not found in this quiz"))
+        elif grade is None:
+            results.append(_rejected_answer(question_id, "Option not found for this question"))
+        elif question_id not in inserted or question_id in reported:
+            results.append(_rejected_answer(question_id, "You have already attempted this question"))
+        else:
+            reported.add(question_id)
+            is_correct = graded[question_id]
+            results.append({
+                "question_id": question_id,
+                "accepted": True,
+                "message": "Correct answer!" if is_correct else "Incorrect answer",
+                "is_correct": is_correct,
+                "correct_answer": keys[question_id].option_text if not is_correct else None
+            })
+
+    return {"results": results, "current_score": current_score}
+
+def _load_quiz_questions(db: Session, quiz_id: int):
+    """Return the questions payload and the quiz's content_version."""
+    # Load the quiz, its questions and their options in a single round trip
+    quiz = db.query(quiz_entities.Quiz).options(
+        joinedload(quiz_entities.Quiz.questions).joinedload(quiz_entities.Question.options)
+    ).filter(quiz_entities.Quiz.id == quiz_id).one_or_none()
     if not quiz:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    questions = db.query(quiz_entities.Question).filter(quiz_entities.Question.quiz_id == quiz_id).all()
-    
     result = []
-    for question in questions:
-        options = db.query(quiz_entities.QuestionOptions).filter(
-            quiz_entities.QuestionOptions.question_id == question.id
-        ).all()
-        
+    for question in quiz.questions:
         result.append({
             "id": question.id,
             "question_text": question.question_text,
-            "options": [{"id": opt.id, "text": opt.option_text} for opt in options]
+            "options": [{"id": opt.id, "text": opt.option_text} for opt in question.options]
         })
     
+    payload = {"quiz_id": quiz_id, "questions": result}
+    cache_loaded(db, questions_key(quiz_id), payload)
+    return payload, quiz.content_version
+
+def get_quiz_questions(db: Session, quiz_id: int):
+    cached = quiz_cache.get(questions_key(quiz_id))
+    if cached is not None:
+        return cached
+    payload, _ = _load_quiz_questions(db, quiz_id)
+    return payload
+
+def get_quiz_questions_snapshot(db: Session, quiz_id: int) -> Snapshot:
+    """The questions payload pre-rendered to JSON, gzip and brotli bytes for the quiz's content version."""
+    snapshot = quiz_cache.get(snapshot_key(quiz_id))
+    if snapshot is not None:
+        return snapshot
+
+    payload, version = _load_quiz_questions(db, quiz_id)
+    snapshot = build_snapshot(payload, f'W/"quiz-{quiz_id}-v{version}"')
+    cache_loaded(db, snapshot_key(quiz_id), snapshot)
+    return snapshot
+
+def get_shuffled_questions(db: Session, quiz_id: int, user_id: int, seed: int = 0):
+    """The questions payload with questions and options in the user's deterministic shuffled order."""
+    payload = get_quiz_questions(db, quiz_id)
+    return shuffled_payload(quiz_id, get_shuffle(quiz_id, user_id, seed, payload["questions"]))
+
+def list_quizzes(db: Session, limit: int, cursor: Optional[str] = None):
+    """One page of quizzes ordered by id; pass ``next_cursor`` back as ``cursor`` for the next page.
+
+    Pages seek past the cursor's id on the primary key, so every page costs the same.
+    """
+    query = db.query(
+        quiz_entities.Quiz.id,
+        quiz_entities.Quiz.title,
+        quiz_entities.Quiz.description,
+        quiz_entities.Quiz.created_at,
+        quiz_entities.Quiz.question_count
+    )
+    after_id = decode_cursor(cursor)
+    if after_id is not None:
+        query = query.filter(quiz_entities.Quiz.id > after_id)
+    # Fetch one extra row to know whether there is a next page
+    rows = query.order_by(quiz_entities.Quiz.id).limit(limit + 1).all()
+
+    quizzes = [row._asdict() for row in rows[:limit]]
+    return {
+        "quizzes": quizzes,
+        "next_cursor": encode_cursor(quizzes[-1]["id"]) if len(rows) > limit else None
+    }
+
+def get_quiz_questions_page(db: Session, quiz_id: int, limit: int, cursor: Optional[str] = None):
+    """One page of a quiz's questions and their options, ordered by question id."""
+    get_quiz(db, quiz_id)
+    query = db.query(quiz_entities.Question.id, quiz_entities.Question.question_text).filter(
+        quiz_entities.Question.quiz_id == quiz_id
+    )
+    after_id = decode_cursor(cursor)
+    if after_id is not None:
+        query = query.filter(quiz_entities.Question.id > after_id)
+    rows = query.order_by(quiz_entities.Question.id).limit(limit + 1).all()
+
+    questions = {
+        question_id: {"id": question_id, "question_text": question_text, "options": []}
+        for question_id, question_text in rows[:limit]
+    }
+    if questions:
+        options = db.query(
+            quiz_entities.QuestionOptions.question_id,
+            quiz_entities.QuestionOptions.id,
+            quiz_entities.QuestionOptions.option_text
+        ).filter(
+            quiz_entities.QuestionOptions.question_id.in_(questions)
+        ).order_by(quiz_entities.QuestionOptions.id)
+        for question_id, option_id, option_text in options:
+            questions[question_id]["options"].append({"id": option_id, "text": option_text})
+
+    return {
+        "quiz_id": quiz_id,
+        "questions": list(questions.values()),
+        "next_cursor": encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    }
+
+def _table_top(db: Session, quiz_id: int, limit: int):
+    return db.query(quiz_entities.Result.user_id, quiz_entities.Result.score).filter(
+        quiz_entities.Result.quiz_id == quiz_id
+    ).order_by(quiz_entities.Result.score.desc(), quiz_entities.Result.user_id).limit(limit).all()
+
+def _table_rank_of_score(db: Session, quiz_id: int, score: int) -> int:
+    return db.query(func.count(quiz_entities.Result.id)).filter(
+        quiz_entities.Result.quiz_id == quiz_id,
+        quiz_entities.Result.score > score
+    ).scalar() + 1
+
+def get_leaderboard(db: Session, quiz_id: int, limit: int = 10, user_id: Optional[int] = None):
+    get_quiz(db, quiz_id)
+
+    ranking = leaderboard.ranking(db, quiz_id, attempt_log)
+    if ranking is not None:
+        top = [
+            {"rank": ranking.rank_of_score(score), "user_id": row_user_id, "score": score}
+            for row_user_id, score in ranking.top(limit)
+        ]
+        participants = len(ranking)
+        me = None
+        if user_id is not None:
+            position = ranking.rank(user_id)
+            if position is not None:
+                me = {"rank": position[0], "user_id": user_id, "score": position[1]}
+    else:
+        # Ranks within the top page can be derived from the page itself
+        rows = _table_top(db, quiz_id, limit)
+        top = []
+        for i, (row_user_id, score) in enumerate(rows):
+            rank = top[-1]["rank"] if top and top[-1]["score"] == score else i + 1
+            top.append({"rank": rank, "user_id": row_user_id, "score": score})
+        participants = db.query(func.count(quiz_entities.Result.id)).filter(
+            quiz_entities.Result.quiz_id == quiz_id
+        ).scalar()
+        me = None
+        if user_id is not None:
+            score = queries.result_score(db, quiz_id, user_id)
+            if score is not None:
+                me = {"rank": _table_rank_of_score(db, quiz_id, score), "user_id": user_id, "score": score}
+
+    return {"quiz_id": quiz_id, "participants": participants, "top": top, "me": me}
+
+def _answer_counts(db: Session, quiz_id: int) -> dict:
+    """``{question_id: {counter key: count}}`` from the quiz's answer counters.
+
+    Keys are option ids for answers that chose an option and normalized
+    text for the rest.
+    """
+    counts = {}
+    for question_id, option_id, answer, count in db.query(
+        quiz_entities.AnswerCount.question_id, quiz_entities.AnswerCount.option_id,
+        quiz_entities.AnswerCount.answer, quiz_entities.AnswerCount.count
+    ).filter(quiz_entities.AnswerCount.quiz_id == quiz_id):
+        counts.setdefault(question_id, {})[option_id if option_id is not None else answer] = count
+    return counts
+
+def get_question_difficulty(db: Session, quiz_id: int):
+    """Attempts, correct attempts and the share answered correctly for every question of the quiz."""
+    questions = get_quiz_questions(db, quiz_id)["questions"]
+    keys = get_answer_keys(db, quiz_id, [question["id"] for question in questions])
+    counts = _answer_counts(db, quiz_id)
+
+    result = []
+    for question in questions:
+        answers = counts.get(question["id"], {})
+        attempts = sum(answers.values())
+        key = keys.get(question["id"])
+        # Counters written before migration 0012 are keyed by text only
+        correct = answers.get(key.option_id, 0) + answers.get(normalize_answer(key.option_text), 0) if key else 0
+        result.append({
+            "question_id": question["id"],
+            "attempts": attempts,
+            "correct": correct,
+            "correct_rate": correct / attempts if attempts else None
+        })
+    return {"quiz_id": quiz_id, "questions": result}
+
+def get_answer_distribution(db: Session, quiz_id: int):
+    """How often each option of every question was chosen; answers matching no option are counted as ``other``."""
+    questions = get_quiz_questions(db, quiz_id)["questions"]
+    counts = _answer_counts(db, quiz_id)
+
+    result = []
+    for question in questions:
+        answers = counts.get(question["id"], {})
+        attempts = sum(answers.values())
+        options = []
+        counted = set()
+        for option in question["options"]:
+            answer = normalize_answer(option["text"])
+            # Text counters written before migration 0012 go to the first option with that text
+            count = answers.get(option["id"], 0) + (answers.get(answer, 0) if answer not in counted else 0)
+            counted.add(answer)
+            options.append({"option_id": option["id"], "text": option["text"], "count": count})
+        result.append({
+            "question_id": question["id"],
+            "attempts": attempts,
+            "options": options,
+            "other": attempts - sum(option["count"] for option in options)
+        })
     return {"quiz_id": quiz_id, "questions": result}
\ No newline at end of file
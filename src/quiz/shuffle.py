@@ -0,0 +1,109 @@
+import hashlib
+import os
+import random
+from array import array
+from typing import Dict, List, NamedTuple, Optional
+from src.quiz.cache import QUIZ_CACHE_TTL_SECONDS, LRUCache
+
+# One entry per (quiz, user, seed) served recently; kept apart from the quiz
+# content cache so per-user entries never evict shared ones
+SHUFFLE_CACHE_MAX_ENTRIES = int(os.environ.get("SHUFFLE_CACHE_MAX_ENTRIES", "10000"))
+
+shuffle_cache = LRUCache(SHUFFLE_CACHE_MAX_ENTRIES, QUIZ_CACHE_TTL_SECONDS)
+
+
+def shuffle_key(quiz_id: int, user_id: int, seed: int):
+    return ("shuffle", quiz_id, user_id, seed)
+
+
+# Permutations of up to this many items (every option list) are drawn from
+# one 64-byte digest; seeding a Mersenne Twister costs more than the shuffle
+DIGEST_SHUFFLE_MAX = 32
+
+
+def permutation(n: int, *parts) -> array:
+    """A permutation of ``range(n)`` that only depends on ``parts``, in every process."""
+    key = ":".join(map(str, parts)).encode()
+    order = array("l", range(n))
+    if n <= DIGEST_SHUFFLE_MAX:
+        # Fisher-Yates with two digest bytes per swap
+        digest = hashlib.blake2b(key, digest_size=64).digest()
+        for i in range(n - 1, 0, -1):
+            j = (digest[2 * i - 2] << 8 | digest[2 * i - 1]) % (i + 1)
+            order[i], order[j] = order[j], order[i]
+    else:
+        random.Random(int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")).shuffle(order)
+    return order
+
+
+class Shuffle(NamedTuple):
+    """The order one user sees a quiz in, as indexes into the canonical questions list."""
+    # The cached canonical list the orders index into
+    questions: list
+    # Canonical index of the question shown at each position
+    question_order: array
+    # Question id -> canonical index of the option shown at each position
+    option_orders: Dict[int, array]
+
+
+def get_shuffle(quiz_id: int, user_id: int, seed: int, questions: list) -> Shuffle:
+    """The user's shuffle of ``questions``, built on first use and cached.
+
+    A cached shuffle is only reused for the same canonical list object, so
+    it is rebuilt whenever the questions payload is reloaded.
+    """
+    key = shuffle_key(quiz_id, user_id, seed)
+    shuffle = shuffle_cache.get(key)
+    if shuffle is not None and shuffle.questions is questions:
+        return shuffle
+
+    shuffle = Shuffle(
+        questions,
+        permutation(len(questions), quiz_id, user_id, seed),
+        {
+            question["id"]: permutation(len(question["options"]), quiz_id, user_id, seed, question["id"])
+            for question in questions
+        }
+    )
+    shuffle_cache.set(key, shuffle)
+    return shuffle
+
+
+def shuffled_payload(quiz_id: int, shuffle: Shuffle) -> dict:
+    """The questions payload in the shuffle's order.
+
+    Only the lists are new: question texts and option objects are the
+    cached canonical ones.
+    """
+    questions = shuffle.questions
+    result = []
+    for index in shuffle.question_order:
+        question = questions[index]
+        options = question["options"]
+        result.append({
+            "id": question["id"],
+            "question_text": question["question_text"],
+            "options": [options[i] for i in shuffle.option_orders[question["id"]]]
+        })
+    return {"quiz_id": quiz_id, "questions": result}
+
+
+def shuffle_etag(etag: str, user_id: int, seed: int) -> str:
+    """Extend the canonical snapshot's ETag so it names the user's order too."""
+    return f'{etag[:-1]}-u{user_id}-s{seed}"'
+
+
+def option_at(quiz_id: int, user_id: int, seed: int, question_id: int, option_ids: List[int], position: int) -> Optional[int]:
+    """The id of the option the user was shown at ``position``, or None when there is none.
+
+    ``option_ids`` are the question's options in canonical (id) order. The
+    order comes from the cached shuffle when there is one; permutations are
+    deterministic, so it is recomputed identically otherwise.
+    """
+    shuffle = shuffle_cache.get(shuffle_key(quiz_id, user_id, seed))
+    order = shuffle.option_orders.get(question_id) if shuffle is not None else None
+    if order is None or len(order) != len(option_ids):
+        order = permutation(len(option_ids), quiz_id, user_id, seed, question_id)
+    if not 0 <= position < len(order):
+        return None
+    return option_ids[order[position]]
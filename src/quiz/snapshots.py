@@ -0,0 +1,77 @@
+import gzip
+import json
+from typing import NamedTuple, Optional
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+class Snapshot(NamedTuple):
+    """A response body rendered once per content version, in every encoding we serve."""
+    etag: str
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+
+def render_json(payload) -> bytes:
+    """Compact UTF-8 JSON, rendered with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def build_snapshot(payload, etag: str) -> Snapshot:
+    body = render_json(payload)
+    return Snapshot(
+        etag=etag,
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=9),
+        br=brotli.compress(body, quality=11) if brotli is not None else None
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> set:
+    encodings = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        if coding and (not params or q not in ("0", "0.0", "0.00", "0.000")):
+            encodings.add(coding.strip().lower())
+    return encodings
+
+
+def snapshot_response(snapshot: Snapshot, headers) -> Response:
+    """Serve a snapshot, honoring If-None-Match (304) and Accept-Encoding (br, gzip)."""
+    response_headers = {"ETag": snapshot.etag, "Vary": "Accept-Encoding"}
+    if etag_matches(headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=response_headers)
+
+    encodings = accepted_encodings(headers.get("accept-encoding"))
+    if snapshot.br is not None and "br" in encodings:
+        body = snapshot.br
+        response_headers["Content-Encoding"] = "br"
+    elif "gzip" in encodings:
+        body = snapshot.gzip
+        response_headers["Content-Encoding"] = "gzip"
+    else:
+        body = snapshot.identity
+    return Response(content=body, media_type="application/json", headers=response_headers)
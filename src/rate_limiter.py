@@ -1,5 +1,257 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# "memory" keeps buckets in each worker; "shared" keeps them in a SQLite file
+# at RATE_LIMIT_SHARED_PATH that every worker on the host opens
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SHARED_PATH = os.environ.get("RATE_LIMIT_SHARED_PATH", "rate_limits.db")
+# Idle buckets are dropped once a worker tracks more keys than this
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+# "<METHOD> <route path>=<requests>/<s|m|h>[:<burst>]" entries separated by ";".
+# The method or the whole key may be "*"; the most specific entry applies.
+RATE_LIMITS = os.environ.get(
+    "RATE_LIMITS",
+    "POST /quiz/{quiz_id}/answer=10/s:20;"
+    "POST /quiz/{quiz_id}/answers=2/s:5;"
+    "POST /quiz/{quiz_id}/import=6/m:3;"
+    "POST /quiz/{quiz_id}/sessions=1/s:3;"
+    "POST /sessions/{session_id}/answers=10/s:20;"
+    "POST /sessions/{session_id}/finish=1/s:3;"
+    "GET *=100/s:200;"
+    "*=20/s:50"
+)
+# Every client IP also has a bucket per route, this many times the route's
+# budget, so users sharing an address (a class behind one NAT) are not
+# limited together, while switching user_id cannot go past it
+RATE_LIMIT_IP_FACTOR = float(os.environ.get("RATE_LIMIT_IP_FACTOR", "25"))
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+PERIODS = {"s": 1, "m": 60, "h": 3600}
+
+
+class Budget(NamedTuple):
+    """A token bucket refilled at ``rate`` tokens per second and holding at most ``burst``."""
+    rate: float
+    burst: int
+
+    @property
+    def interval(self) -> float:
+        return 1 / self.rate
+
+    @property
+    def tolerance(self) -> float:
+        return (self.burst - 1) / self.rate
+
+
+# The buckets one request takes a token from: ((route, user or IP key), budget) pairs
+Buckets = List[Tuple[Tuple[str, str], Budget]]
+
+
+def _take(arrival: Optional[float], now: float, budget: Budget) -> Tuple[float, float]:
+    """GCRA step for one bucket: the seconds to wait (allowed when <= 0) and its arrival time after a token is taken."""
+    if arrival is None or arrival < now:
+        arrival = now
+    return arrival - now - budget.tolerance, arrival + budget.interval
+
+
+def parse_budgets(spec: str) -> Dict[str, Budget]:
+    """Parse a RATE_LIMITS string into ``{"POST /quiz/{quiz_id}/answer": Budget, ...}``."""
+    budgets = {}
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        route, _, limit = entry.rpartition("=")
+        limit, _, burst = limit.partition(":")
+        requests, _, period = limit.partition("/")
+        if not route or period not in PERIODS:
+            raise ValueError(f"Invalid RATE_LIMITS entry: {entry!r}")
+        rate = int(requests) / PERIODS[period]
+        budgets[" ".join(route.split())] = Budget(rate, int(burst) if burst else max(1, int(requests)))
+    return budgets
+
+
+class MemoryStore:
+    """Buckets of one worker process.
+
+    Every bucket is a single float, its theoretical arrival time (GCRA, the
+    token bucket expressed as a timestamp), so a hit is a dict read and a
+    dict write per bucket. Hits run on the event loop, so no lock is needed.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._arrivals: Dict[Tuple[str, str], float] = {}
+
+    def hit(self, buckets: Buckets, now: float) -> float:
+        """Take a token from every bucket if all have one; returns 0 if so, else the seconds until they do."""
+        arrivals = self._arrivals
+        taken = []
+        wait = 0
+        for key, budget in buckets:
+            bucket_wait, arrival = _take(arrivals.get(key), now, budget)
+            wait = max(wait, bucket_wait)
+            taken.append((key, arrival))
+        if wait > 0:
+            return wait
+        for key, arrival in taken:
+            if len(self._arrivals) >= self.max_keys and key not in self._arrivals:
+                self._evict(now)
+            self._arrivals[key] = arrival
+        return 0
+
+    def _evict(self, now: float):
+        # A bucket whose arrival time has passed is full again; forgetting it changes nothing
+        self._arrivals = {key: arrival for key, arrival in self._arrivals.items() if arrival > now}
+
+    def reset(self):
+        self._arrivals.clear()
+
+
+class SharedStore:
+    """Buckets shared by the workers on one host, in a SQLite file.
+
+    A stand-in for a networked store such as Redis: each hit reads and
+    updates its buckets in one write transaction, so workers never grant the
+    same token twice. Hits block on SQLite, so they run in the threadpool.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        # Losing recent hits in a crash only loosens limits briefly
+        self._connection.execute("PRAGMA synchronous = OFF")
+        self._connection.execute("PRAGMA busy_timeout = 1000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, arrival REAL NOT NULL)"
+        )
+
+    def hit(self, buckets: Buckets, now: float) -> float:
+        """Take a token from every bucket if all have one; returns 0 if so, else the seconds until they do."""
+        names = ["|".join(key) for key, _ in buckets]
+        with self._lock:
+            # The write lock up front, so no other worker changes the buckets between the read and the update
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                arrivals = dict(self._connection.execute(
+                    f"SELECT key, arrival FROM rate_limit_buckets WHERE key IN ({', '.join('?' * len(names))})", names
+                ).fetchall())
+                wait = 0
+                taken = []
+                for name, (_, budget) in zip(names, buckets):
+                    bucket_wait, arrival = _take(arrivals.get(name), now, budget)
+                    wait = max(wait, bucket_wait)
+                    taken.append((name, arrival))
+                if wait <= 0:
+                    self._connection.executemany(
+                        "INSERT INTO rate_limit_buckets (key, arrival) VALUES (?, ?) "
+                        "ON CONFLICT (key) DO UPDATE SET arrival = excluded.arrival",
+                        taken
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return max(wait, 0)
+
+    def reset(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM rate_limit_buckets")
+
+
+class RateLimiter:
+    def __init__(self, budgets: Dict[str, Budget], store, enabled: bool = True, ip_factor: float = RATE_LIMIT_IP_FACTOR):
+        self.budgets = budgets
+        self.store = store
+        self.enabled = enabled
+        self.ip_factor = ip_factor
+
+    def budget_for(self, method: str, path: str) -> Optional[Budget]:
+        budgets = self.budgets
+        return budgets.get(f"{method} {path}") or budgets.get(f"{method} *") or budgets.get("*")
+
+    def hit(self, method: str, path: str, client: Optional[str], ip: str) -> float:
+        """Count a request to a route; returns 0 if allowed, else the seconds to wait.
+
+        The request takes a token from the bucket of ``client`` (the user or
+        session it acts for, if any) and from the bucket of its ``ip``, only
+        when both have one: a request either limit rejects spends neither.
+        Wall-clock time is used so the shared store works across processes.
+        """
+        budget = self.budget_for(method, path)
+        if budget is None:
+            return 0
+        route = f"{method} {path}"
+        buckets = [((route, ip), Budget(budget.rate * self.ip_factor, max(1, round(budget.burst * self.ip_factor))))]
+        if client is not None:
+            buckets.append(((route, client), budget))
+        return self.store.hit(buckets, time.time())
+
+    def reset(self):
+        self.store.reset()
+
+
+def create_store():
+    if RATE_LIMIT_BACKEND == "shared":
+        return SharedStore(RATE_LIMIT_SHARED_PATH)
+    return MemoryStore(RATE_LIMIT_MAX_KEYS)
+
+
+limiter = RateLimiter(parse_budgets(RATE_LIMITS), create_store(), RATE_LIMIT_ENABLED)
+
+
+async def client_identity(request: Request) -> Optional[str]:
+    """The user or exam session the request acts for, if it names one.
+
+    ``user_id`` is looked up in the path, the query string and JSON bodies
+    (which FastAPI has already parsed and cached by the time dependencies run).
+    """
+    user_id = request.path_params.get("user_id") or request.query_params.get("user_id")
+    if user_id is None and request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if isinstance(body, list) and body:
+            body = body[0]
+        if isinstance(body, dict):
+            user_id = body.get("user_id")
+    if user_id is not None:
+        return f"user:{user_id}"
+    session_id = request.path_params.get("session_id")
+    if session_id is not None:
+        return f"session:{session_id}"
+    return None
+
+
+def client_ip(request: Request) -> str:
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+async def client_key(request: Request) -> str:
+    """The user or session the request acts for, or the caller's IP address when it names none."""
+    return await client_identity(request) or client_ip(request)
+
+
+async def rate_limit(request: Request):
+    """App-wide dependency enforcing the route's budgets for the calling user and IP."""
+    if not limiter.enabled:
+        return
+    route = request.scope.get("route")
+    args = (request.method, getattr(route, "path", request.url.path), await client_identity(request), client_ip(request))
+    # A shared store waits on SQLite's write lock, which must not stall the event loop
+    wait = await run_in_threadpool(limiter.hit, *args) if limiter.store.blocking else limiter.hit(*args)
+    if wait > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(wait))}
+        )
@@ -1,10 +1,30 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from src.database.core import get_db
+from src.database.core import run_service
+from src.database.replicas import get_read_db
+from src.quiz import exports as quiz_exports
+from src.users import models as user_models
 from src.users import service as user_service
 
 router = APIRouter(tags=["users"])
 
-@router.get("/user/{user_id}/results")
-async def get_user_results(user_id: int, db: Session = Depends(get_db)):
-    return user_service.get_user_results(db, user_id)
\ No newline at end of file
+@router.get("/user/{user_id}/results", response_model=user_models.UserResultsResponse)
+async def get_user_results(
+    user_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    after_quiz_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    return await run_service(db, user_service.get_user_results, user_id, limit, after_quiz_id)
+
+@router.get("/user/{user_id}/export/attempts", response_class=StreamingResponse)
+async def export_user_attempts(user_id: int, format: Optional[str] = None, db: Session = Depends(get_read_db)):
+    file_format = quiz_exports.export_format(format)
+    return quiz_exports.export_response(db, quiz_exports.user_attempts(user_id), file_format, f"user-{user_id}-attempts")
+
+@router.get("/user/{user_id}/export/results", response_class=StreamingResponse)
+async def export_user_results(user_id: int, format: Optional[str] = None, db: Session = Depends(get_read_db)):
+    file_format = quiz_exports.export_format(format)
+    return quiz_exports.export_response(db, quiz_exports.user_results(user_id), file_format, f"user-{user_id}-results")
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class UserResult(BaseModel):
     quiz_id: int
@@ -11,3 +11,4 @@ class UserResult(BaseModel):
 class UserResultsResponse(BaseModel):
     user_id: int
     results: List[UserResult]
+    next_after_quiz_id: Optional[int] = None
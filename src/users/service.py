@@ -1,21 +1,39 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from src.entities import quiz as quiz_entities
 from src.entities import user as user_entities
 
-def get_user_results(db: Session, user_id: int):
-    results = db.query(quiz_entities.Result).filter(quiz_entities.Result.user_id == user_id).all()
+def get_user_results(db: Session, user_id: int, limit: int = 50, after_quiz_id: Optional[int] = None):
+    """One page of the user's results, ordered by quiz id.
+
+    Pass the returned ``next_after_quiz_id`` as ``after_quiz_id`` to fetch the next page.
+    """
+    query = db.query(
+        quiz_entities.Result.quiz_id,
+        quiz_entities.Quiz.title,
+        quiz_entities.Result.score,
+        quiz_entities.Quiz.question_count
+    ).outerjoin(
+        quiz_entities.Quiz, quiz_entities.Quiz.id == quiz_entities.Result.quiz_id
+    ).filter(quiz_entities.Result.user_id == user_id)
+    if after_quiz_id is not None:
+        query = query.filter(quiz_entities.Result.quiz_id > after_quiz_id)
+    # Fetch one extra row to know whether there is a next page
+    rows = query.order_by(quiz_entities.Result.quiz_id).limit(limit + 1).all()
     
     user_results = []
-    for result in results:
-        quiz = db.query(quiz_entities.Quiz).filter(quiz_entities.Quiz.id == result.quiz_id).first()
-        total_questions = db.query(quiz_entities.Question).filter(quiz_entities.Question.quiz_id == result.quiz_id).count()
-        
+    for quiz_id, quiz_title, score, total_questions in rows[:limit]:
+        total_questions = total_questions or 0
         user_results.append({
-            "quiz_id": result.quiz_id,
-            "quiz_title": quiz.title if quiz else "Unknown",
-            "score": result.score,
+            "quiz_id": quiz_id,
+            "quiz_title": quiz_title if quiz_title is not None else "Unknown",
+            "score": score,
             "total_questions": total_questions,
-            "percentage": (result.score / total_questions * 100) if total_questions > 0 else 0
+            "percentage": (score / total_questions * 100) if total_questions > 0 else 0
         })
     
-    return {"user_id": user_id, "results": user_results}
\ No newline at end of file
+    return {
+        "user_id": user_id,
+        "results": user_results,
+        "next_after_quiz_id": user_results[-1]["quiz_id"] if len(rows) > limit else None
+    }
\ No newline at end of file
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.main import app
+from src.database.core import get_db, Base, async_database_url
+from src.quiz.cache import quiz_cache
+from src.quiz.leaderboard import leaderboard
+from src.rate_limiter import limiter
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path):
+    # Create test database, served through the async driver
+    database_url = f"sqlite:///{tmp_path / 'test_async.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    quiz_cache.clear()
+    leaderboard.clear()
+    limiter.reset()
+    async_engine = create_async_engine(async_database_url(database_url))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    previous_overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides = previous_overrides
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///quizapp.db") == "sqlite+aiosqlite:///quizapp.db"
+    assert async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+
+class TestAsyncMode:
+    def test_quiz_flow(self, async_client):
+        quiz_response = async_client.post("/create-quiz", json={"title": "Async Quiz", "description": "Test"})
+        assert quiz_response.status_code == 200
+        quiz_id = quiz_response.json()["id"]
+        
+        question_response = async_client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "What is 2+2?",
+            "options": ["3", "4"],
+            "correct_answer": 1
+        })
+        question_id = question_response.json()["question_id"]
+        
+        assert async_client.get(f"/quiz/{quiz_id}").json()["title"] == "Async Quiz"
+        assert len(async_client.get(f"/quiz/{quiz_id}/questions").json()["questions"]) == 1
+        
+        answer_data = {"question_id": question_id, "answer": "4", "user_id": 1}
+        response = async_client.post(f"/quiz/{quiz_id}/answer", json=answer_data)
+        assert response.json()["current_score"] == 1
+        
+        response = async_client.post(f"/quiz/{quiz_id}/answer", json=answer_data)
+        assert response.status_code == 400
+        
+        results = async_client.get("/user/1/results").json()["results"]
+        assert results[0]["percentage"] == 100.0
+        
+        export = async_client.get(f"/quiz/{quiz_id}/export/attempts").text.splitlines()
+        assert len(export) == 2 and export[1].split(",")[2:5] == ["1", str(question_id), "4"]
+
+    def test_quiz_not_found(self, async_client):
+        response = async_client.get("/quiz/999")
+        assert response.status_code == 404
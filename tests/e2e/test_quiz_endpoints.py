@@ -1,16 +1,22 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from src.main import app
 from src.database.core import get_db, Base
+from src.quiz import service as quiz_service
+from src.quiz.attempt_log import AttemptLog
+from src.quiz.cache import quiz_cache
+from src.quiz.leaderboard import leaderboard
+from src.rate_limiter import Budget, limiter
+from src.metrics import registry
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_quiz.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Override get_db dependency
 def override_get_db():
     try:
         db = TestingSessionLocal()
@@ -18,14 +24,18 @@ def override_get_db():
     finally:
         db.close()
 
-app.dependency_overrides[get_db] = override_get_db
-
 client = TestClient(app)
 
 @pytest.fixture(scope="function")
 def setup_database():
     Base.metadata.create_all(bind=engine)
+    quiz_cache.clear()
+    leaderboard.clear()
+    limiter.reset()
+    # Override get_db dependency
+    app.dependency_overrides[get_db] = override_get_db
     yield
+    app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
 
 class TestQuizEndpoints:
@@ -207,6 +217,225 @@ class TestQuizEndpoints:
         assert response.status_code == 400
         assert "already attempted" in response.json()["detail"]
 
+    def test_submit_answer_accumulates_score(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        question_ids = []
+        for text in ["What is 2+2?", "What is 3+3?", "What is 4+4?"]:
+            question_response = client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": text,
+                "options": ["4", "6", "8"],
+                "correct_answer": len(question_ids)
+            })
+            question_ids.append(question_response.json()["question_id"])
+        
+        scores = [
+            client.post(f"/quiz/{quiz_id}/answer", json={"question_id": qid, "answer": answer, "user_id": 1}).json()["current_score"]
+            for qid, answer in zip(question_ids, ["4", "4", "8"])
+        ]
+        assert scores == [1, 1, 2]
+
+    def test_submit_answer_question_not_in_quiz(self, setup_database):
+        first_quiz = client.post("/create-quiz", json={"title": "Quiz A", "description": "Test"}).json()["id"]
+        second_quiz = client.post("/create-quiz", json={"title": "Quiz B", "description": "Test"}).json()["id"]
+        question_response = client.post(f"/quiz/{first_quiz}/question", json={
+            "question_text": "What is 2+2?",
+            "options": ["3", "4"],
+            "correct_answer": 1
+        })
+        question_id = question_response.json()["question_id"]
+        
+        response = client.post(f"/quiz/{second_quiz}/answer", json={"question_id": question_id, "answer": "4", "user_id": 1})
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Question not found in this quiz"
+        
+        response = client.post("/quiz/999/answer", json={"question_id": question_id, "answer": "4", "user_id": 1})
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Quiz not found"
+
+    def test_submit_answers_batch(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        question_ids = []
+        for i in range(3):
+            question_response = client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": f"Question {i}?",
+                "options": ["A", "B", "C"],
+                "correct_answer": i
+            })
+            question_ids.append(question_response.json()["question_id"])
+        
+        client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_ids[0], "answer": "A", "user_id": 1})
+        
+        answers = [
+            {"question_id": question_ids[0], "answer": "A", "user_id": 1},
+            {"question_id": question_ids[1], "answer": "b", "user_id": 1},
+            {"question_id": question_ids[2], "answer": "A", "user_id": 1},
+            {"question_id": 999, "answer": "A", "user_id": 1}
+        ]
+        response = client.post(f"/quiz/{quiz_id}/answers", json=answers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["current_score"] == 2
+        assert [r["accepted"] for r in data["results"]] == [False, True, True, False]
+        assert "already attempted" in data["results"][0]["message"]
+        assert data["results"][1]["is_correct"] is True
+        assert data["results"][2]["is_correct"] is False
+        assert data["results"][2]["correct_answer"] == "C"
+        assert data["results"][3]["message"] == "Question not found in this quiz"
+        
+        # A batch that stores nothing does not make the user a participant
+        response = client.post(f"/quiz/{quiz_id}/answers", json=[{"question_id": 999, "answer": "A", "user_id": 42}])
+        assert response.status_code == 200
+        assert response.json()["current_score"] == 0
+        assert client.get(f"/quiz/{quiz_id}/leaderboard").json()["participants"] == 1
+        assert client.get("/user/42/results").json()["results"] == []
+
+    def test_submit_answers_batch_mixed_users(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        answers = [
+            {"question_id": 1, "answer": "A", "user_id": 1},
+            {"question_id": 2, "answer": "A", "user_id": 2}
+        ]
+        response = client.post(f"/quiz/{quiz_id}/answers", json=answers)
+        assert response.status_code == 400
+
+    def test_import_questions_jsonl(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        lines = [
+            json.dumps({"question_text": "What is 2+2?", "options": ["3", "4"], "correct_answer": 1}),
+            "not json",
+            json.dumps({"question_text": "What is 3+3?", "options": ["6", "7"], "correct_answer": 5}),
+            "",
+            json.dumps({"question_text": "What is 4+4?", "options": ["8", "9"], "correct_answer": 0})
+        ]
+        response = client.post(
+            f"/quiz/{quiz_id}/import",
+            files={"file": ("bank.jsonl", "\n".join(lines).encode(), "application/x-ndjson")}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [error["row"] for error in data["errors"]] == [2, 3]
+        assert "Invalid correct_answer index" in data["errors"][1]["error"]
+        
+        questions = client.get(f"/quiz/{quiz_id}/questions").json()["questions"]
+        assert [q["question_text"] for q in questions] == ["What is 2+2?", "What is 4+4?"]
+        
+        answer = {"question_id": questions[0]["id"], "answer": "4", "user_id": 1}
+        assert client.post(f"/quiz/{quiz_id}/answer", json=answer).json()["is_correct"] is True
+
+    def test_import_questions_csv(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        content = (
+            "question_text,correct_answer,option_1,option_2,option_3\n"
+            "Capital of France?,1,London,Paris,Berlin\n"
+            "Capital of Spain?,abc,Madrid,Rome,\n"
+            "\"Largest planet, by mass?\",0,Jupiter,Saturn,\n"
+        )
+        response = client.post(f"/quiz/{quiz_id}/import", files={"file": ("bank.csv", content.encode(), "text/csv")})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 1
+        assert data["errors"][0]["row"] == 3
+        
+        questions = client.get(f"/quiz/{quiz_id}/questions").json()["questions"]
+        assert questions[1]["question_text"] == "Largest planet, by mass?"
+        assert [o["text"] for o in questions[1]["options"]] == ["Jupiter", "Saturn"]
+
+    def test_import_questions_reports_undecodable_lines(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+
+        content = b"\n".join([
+            json.dumps({"question_text": "What is 2+2?", "options": ["3", "4"], "correct_answer": 1}).encode(),
+            b'{"question_text": "caf\xe9?", "options": ["a", "b"], "correct_answer": 0}',
+            json.dumps({"question_text": "What is 4+4?", "options": ["8", "9"], "correct_answer": 0}).encode()
+        ])
+        response = client.post(f"/quiz/{quiz_id}/import", files={"file": ("bank.jsonl", content, "application/x-ndjson")})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["imported"], data["failed"]) == (2, 1)
+        assert data["errors"][0]["row"] == 2
+        assert "Not valid UTF-8" in data["errors"][0]["error"]
+
+    @pytest.mark.parametrize("bad_line, message", [
+        (b"Capital of Spain?,0,Madrid,R\xf4me\n", "Not valid UTF-8"),
+        (b'"' + b"x" * 200000 + b'",0,A,B\n', "Malformed CSV"),
+    ], ids=["undecodable", "oversized_field"])
+    def test_import_questions_stops_at_unreadable_csv(self, setup_database, bad_line, message):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+
+        content = (
+            b"question_text,correct_answer,option_1,option_2\n"
+            b"Capital of France?,1,London,Paris\n"
+            + bad_line +
+            b"Capital of Italy?,0,Rome,Milan\n"
+        )
+        response = client.post(f"/quiz/{quiz_id}/import", files={"file": ("bank.csv", content, "text/csv")})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["imported"], data["failed"]) == (1, 1)
+        assert data["errors"][0]["row"] == 3
+        assert message in data["errors"][0]["error"]
+
+    def test_import_questions_unknown_format(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        response = client.post(f"/quiz/{quiz_id}/import", files={"file": ("bank.txt", b"", "text/plain")})
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("backend", ["memory", "table"])
+    def test_leaderboard(self, setup_database, monkeypatch, backend):
+        monkeypatch.setattr("src.quiz.leaderboard.LEADERBOARD_BACKEND", backend)
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        question_ids = [
+            client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": f"Question {i}?",
+                "options": ["A", "B"],
+                "correct_answer": 0
+            }).json()["question_id"]
+            for i in range(2)
+        ]
+        
+        # Read once so the in-memory index is loaded before scores change
+        assert client.get(f"/quiz/{quiz_id}/leaderboard").json()["participants"] == 0
+        
+        answers = {1: ["A", "B"], 2: ["A", "A"], 3: ["B", "A"], 4: ["B", "B"]}
+        for user_id, choices in answers.items():
+            for question_id, choice in zip(question_ids, choices):
+                client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "answer": choice, "user_id": user_id})
+        
+        response = client.get(f"/quiz/{quiz_id}/leaderboard", params={"limit": 3, "user_id": 4})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["participants"] == 4
+        assert data["top"] == [
+            {"rank": 1, "user_id": 2, "score": 2},
+            {"rank": 2, "user_id": 1, "score": 1},
+            {"rank": 2, "user_id": 3, "score": 1}
+        ]
+        assert data["me"] == {"rank": 4, "user_id": 4, "score": 0}
+        
+        assert client.get("/quiz/999/leaderboard").status_code == 404
+
     def test_get_quiz_questions(self, setup_database):
         quiz_data = {"title": "Test Quiz", "description": "Test"}
         quiz_response = client.post("/create-quiz", json=quiz_data)
@@ -229,6 +458,119 @@ class TestQuizEndpoints:
         assert data["questions"][0]["question_text"] == "What is 2+2?"
         assert len(data["questions"][0]["options"]) == 4
 
+    def test_list_quizzes_paginated(self, setup_database):
+        quiz_ids = [
+            client.post("/create-quiz", json={"title": f"Quiz {i}", "description": "Test"}).json()["id"]
+            for i in range(5)
+        ]
+        
+        pages = []
+        cursor = None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = client.get("/quizzes", params=params).json()
+            pages.append([quiz["id"] for quiz in page["quizzes"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert pages == [quiz_ids[:2], quiz_ids[2:4], quiz_ids[4:]]
+        assert client.get("/quizzes").json()["quizzes"][0] == {
+            "id": quiz_ids[0], "title": "Quiz 0", "description": "Test",
+            "created_at": client.get(f"/quiz/{quiz_ids[0]}").json()["created_at"], "question_count": 0
+        }
+        assert client.get("/quizzes", params={"cursor": "not-a-cursor"}).status_code == 400
+        assert client.get("/quizzes", params={"limit": 0}).status_code == 422
+
+    def test_get_quiz_questions_page(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        question_ids = [
+            client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": f"Question {i}?", "options": ["A", "B", "C"], "correct_answer": 0
+            }).json()["question_id"]
+            for i in range(3)
+        ]
+        
+        first = client.get(f"/quiz/{quiz_id}/questions/page", params={"limit": 2}).json()
+        assert [question["id"] for question in first["questions"]] == question_ids[:2]
+        assert [option["text"] for option in first["questions"][0]["options"]] == ["A", "B", "C"]
+        
+        second = client.get(f"/quiz/{quiz_id}/questions/page", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        assert [question["id"] for question in second["questions"]] == question_ids[2:]
+        assert second["next_cursor"] is None
+        
+        assert client.get("/quiz/999/questions/page").status_code == 404
+
+    def test_get_quiz_questions_single_query(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        for i in range(5):
+            client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": f"Question {i}?",
+                "options": ["A", "B", "C"],
+                "correct_answer": i % 3
+            })
+        
+        statements = []
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.get(f"/quiz/{quiz_id}/questions")
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [q["question_text"] for q in data["questions"]] == [f"Question {i}?" for i in range(5)]
+        assert all([o["text"] for o in q["options"]] == ["A", "B", "C"] for q in data["questions"])
+        assert len(statements) == 1
+
+    def test_create_question_invalidates_cached_questions(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q1?", "options": ["A", "B"], "correct_answer": 0})
+        
+        assert len(client.get(f"/quiz/{quiz_id}/questions").json()["questions"]) == 1
+        hits = client.get("/quiz-cache/stats").json()["hits"]
+        assert len(client.get(f"/quiz/{quiz_id}/questions").json()["questions"]) == 1
+        assert client.get("/quiz-cache/stats").json()["hits"] == hits + 1
+        
+        client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q2?", "options": ["A", "B"], "correct_answer": 1})
+        assert len(client.get(f"/quiz/{quiz_id}/questions").json()["questions"]) == 2
+
+    def test_get_quiz_questions_etag(self, setup_database):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q1?", "options": ["A", "B"], "correct_answer": 0})
+        
+        response = client.get(f"/quiz/{quiz_id}/questions")
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        
+        response = client.get(f"/quiz/{quiz_id}/questions", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        
+        client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q2?", "options": ["A", "B"], "correct_answer": 1})
+        response = client.get(f"/quiz/{quiz_id}/questions", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()["questions"]) == 2
+
+    @pytest.mark.parametrize("accept_encoding, content_encoding", [("gzip", "gzip"), ("br, gzip", "br"), ("identity", None)])
+    def test_get_quiz_questions_encodings(self, setup_database, accept_encoding, content_encoding):
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q1?", "options": ["A", "B"], "correct_answer": 0})
+        
+        response = client.get(f"/quiz/{quiz_id}/questions", headers={"Accept-Encoding": accept_encoding})
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == content_encoding
+        assert response.json()["questions"][0]["question_text"] == "Q1?"
+
     def test_case_insensitive_answer(self, setup_database):
         quiz_data = {"title": "Test Quiz", "description": "Test"}
         quiz_response = client.post("/create-quiz", json=quiz_data)
@@ -252,3 +594,272 @@ class TestQuizEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["is_correct"] is True
+
+    def test_routes_declare_response_models(self, setup_database):
+        paths = client.get("/openapi.json").json()["paths"]
+        
+        schema = paths["/quiz/{quiz_id}/questions"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["$ref"].endswith("/QuizWithQuestionsResponse")
+        schema = paths["/quiz/{quiz_id}/answer"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["$ref"].endswith("/AnswerResponse")
+
+    def test_submit_answer_by_option_id(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        question_id = client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Capital of France?", "options": ["London", "Paris"], "correct_answer": 1
+        }).json()["question_id"]
+        other_question_id = client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Q2?", "options": ["A", "B"], "correct_answer": 0
+        }).json()["question_id"]
+        options = {
+            question["id"]: [option["id"] for option in question["options"]]
+            for question in client.get(f"/quiz/{quiz_id}/questions").json()["questions"]
+        }
+        
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "option_id": options[question_id][1], "user_id": 1})
+        assert response.json()["is_correct"] is True
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "option_id": options[question_id][0], "user_id": 2})
+        assert response.json()["correct_answer"] == "Paris"
+        # Another question's option is not a valid answer
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "option_id": options[other_question_id][0], "user_id": 3})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Option not found for this question"
+        # Text answers are linked to the matching option
+        client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "answer": " paris", "user_id": 4})
+        
+        assert client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "user_id": 5}).status_code == 422
+        assert client.post(f"/quiz/{quiz_id}/answer", json={
+            "question_id": question_id, "answer": "Paris", "option_id": options[question_id][1], "user_id": 5
+        }).status_code == 422
+        
+        response = client.post(f"/quiz/{quiz_id}/answers", json=[
+            {"question_id": question_id, "option_id": options[other_question_id][1], "user_id": 6},
+            {"question_id": other_question_id, "option_id": options[other_question_id][0], "user_id": 6}
+        ])
+        assert [result["message"] for result in response.json()["results"]] == ["Option not found for this question", "Correct answer!"]
+        
+        rows = [json.loads(line) for line in client.get(f"/quiz/{quiz_id}/export/attempts", params={"format": "ndjson"}).text.splitlines()]
+        assert [(row["user_id"], row["selected_option"], row["selected_option_id"]) for row in rows] == [
+            (1, "Paris", options[question_id][1]),
+            (2, "London", options[question_id][0]),
+            (4, " paris", options[question_id][1]),
+            (6, "A", options[other_question_id][0])
+        ]
+
+    def test_shuffled_questions(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        for i in range(8):
+            client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": f"Q{i}?", "options": ["A", "B", "C", "D"], "correct_answer": i % 4
+            })
+        canonical = client.get(f"/quiz/{quiz_id}/questions").json()["questions"]
+        
+        response = client.get(f"/quiz/{quiz_id}/questions", params={"shuffle": True, "user_id": 1})
+        assert response.status_code == 200
+        shuffled = response.json()["questions"]
+        assert response.headers["Cache-Control"] == "private"
+        assert sorted(question["id"] for question in shuffled) == [question["id"] for question in canonical]
+        assert shuffled != canonical
+        assert client.get(f"/quiz/{quiz_id}/questions", params={"shuffle": True, "user_id": 1}).json()["questions"] == shuffled
+        assert client.get(f"/quiz/{quiz_id}/questions", params={"shuffle": True, "user_id": 2}).json()["questions"] != shuffled
+        assert client.get(f"/quiz/{quiz_id}/questions", params={"shuffle": True, "user_id": 1, "seed": 5}).json()["questions"] != shuffled
+        response = client.get(f"/quiz/{quiz_id}/questions", params={"shuffle": True, "user_id": 1}, headers={"If-None-Match": response.headers["ETag"]})
+        assert response.status_code == 304
+        assert client.get(f"/quiz/{quiz_id}/questions", params={"shuffle": True}).status_code == 400
+        
+        # Positions are graded against the order the user was shown
+        question = shuffled[0]
+        correct_text = "ABCD"[[q["id"] for q in canonical].index(question["id"]) % 4]
+        position = [option["text"] for option in question["options"]].index(correct_text)
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question["id"], "option_position": position, "user_id": 1})
+        assert response.json()["is_correct"] is True
+        response = client.post(f"/quiz/{quiz_id}/answers", json=[
+            {"question_id": shuffled[1]["id"], "option_position": 4, "user_id": 1},
+            {"question_id": shuffled[2]["id"], "option_position": 0, "user_id": 1}
+        ])
+        assert [result["accepted"] for result in response.json()["results"]] == [False, True]
+        assert response.json()["results"][0]["message"] == "Option not found for this question"
+        rows = [json.loads(line) for line in client.get(f"/quiz/{quiz_id}/export/attempts", params={"format": "ndjson"}).text.splitlines()]
+        assert {row["question_id"]: row["selected_option_id"] for row in rows} == {
+            question["id"]: question["options"][position]["id"], shuffled[2]["id"]: shuffled[2]["options"][0]["id"]
+        }
+
+    def test_sample_questions(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        content = "question_text,correct_answer,option_1,option_2,tag,difficulty\n" + "".join(
+            f"Q{i}?,0,A,B,{'algebra' if i < 6 else 'geometry'},{'easy' if i % 2 else 'hard'}\n" for i in range(8)
+        )
+        assert client.post(f"/quiz/{quiz_id}/import", files={"file": ("bank.csv", content.encode(), "text/csv")}).json()["imported"] == 8
+        
+        response = client.get(f"/quiz/{quiz_id}/sample", params={"n": 4, "seed": 3})
+        assert response.status_code == 200
+        sampled = response.json()["questions"]
+        assert len({question["id"] for question in sampled}) == 4
+        assert all([option["text"] for option in question["options"]] == ["A", "B"] for question in sampled)
+        assert client.get(f"/quiz/{quiz_id}/sample", params={"n": 4, "seed": 3}).json()["questions"] == sampled
+        
+        # Tags split 6:2, so a sample of 4 takes 3 and 1
+        sampled = client.get(f"/quiz/{quiz_id}/sample", params={"n": 4, "stratify": "tag"}).json()["questions"]
+        assert sorted(question["tag"] for question in sampled) == ["algebra"] * 3 + ["geometry"]
+        
+        # A new question is part of the next draw
+        client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q8?", "options": ["A", "B"], "correct_answer": 0, "tag": "logic"})
+        sampled = client.get(f"/quiz/{quiz_id}/sample", params={"n": 50, "stratify": "tag"}).json()["questions"]
+        assert len(sampled) == 9
+        assert client.get(f"/quiz/{quiz_id}/sample", params={"stratify": "topic"}).status_code == 422
+        assert client.get(f"/quiz/{quiz_id}/sample", params={"n": 0}).status_code == 422
+        assert client.get("/quiz/999/sample").status_code == 404
+
+    def test_exam_session(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        for i in range(3):
+            client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": f"Q{i}?", "options": ["A", "B"], "correct_answer": 0
+            })
+        questions = client.get(f"/quiz/{quiz_id}/questions").json()["questions"]
+        
+        response = client.post(f"/quiz/{quiz_id}/sessions", json={"user_id": 1, "duration_seconds": 600})
+        assert response.status_code == 200
+        session = response.json()
+        assert (session["status"], session["question_count"], session["score"]) == ("running", 3, None)
+        session_id = session["session_id"]
+        
+        response = client.post(f"/sessions/{session_id}/answers", json=[
+            {"question_id": questions[0]["id"], "option_id": questions[0]["options"][0]["id"]},
+            {"question_id": questions[1]["id"], "option_id": questions[1]["options"][1]["id"]}
+        ])
+        assert response.json()["answered"] == 2
+        response = client.post(f"/sessions/{session_id}/answers", json=[
+            {"question_id": questions[2]["id"], "option_id": questions[0]["options"][0]["id"]}
+        ])
+        assert response.status_code == 400
+        # Nothing is scored until the session finishes
+        assert client.get(f"/quiz/{quiz_id}/leaderboard").json()["participants"] == 0
+        
+        response = client.post(f"/sessions/{session_id}/finish")
+        assert response.status_code == 200
+        assert (response.json()["status"], response.json()["answered"], response.json()["score"]) == ("finished", 2, 1)
+        assert client.get(f"/sessions/{session_id}").json()["status"] == "finished"
+        assert client.get(f"/quiz/{quiz_id}/leaderboard").json()["top"] == [{"rank": 1, "user_id": 1, "score": 1}]
+        assert client.post(f"/sessions/{session_id}/finish").status_code == 409
+        assert client.get("/sessions/999").status_code == 404
+        assert client.post("/quiz/999/sessions", json={"user_id": 1}).status_code == 404
+
+    def test_question_analytics(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        q1 = client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Q1?", "options": ["A", "B", "C"], "correct_answer": 1
+        }).json()["question_id"]
+        q2 = client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Q2?", "options": ["Yes", "No"], "correct_answer": 0
+        }).json()["question_id"]
+        for user_id, answer in ((1, "B"), (2, " b"), (3, "A"), (4, "maybe")):
+            client.post(f"/quiz/{quiz_id}/answer", json={"question_id": q1, "answer": answer, "user_id": user_id})
+        client.post(f"/quiz/{quiz_id}/answers", json=[{"question_id": q1, "answer": "C", "user_id": 5}])
+        # Options differing only in case are counted apart when chosen by id
+        q3 = client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Q3?", "options": ["Paris", "paris "], "correct_answer": 1
+        }).json()["question_id"]
+        q3_options = client.get(f"/quiz/{quiz_id}/questions").json()["questions"][2]["options"]
+        for user_id, option in ((1, q3_options[1]), (2, q3_options[1]), (3, q3_options[0])):
+            client.post(f"/quiz/{quiz_id}/answer", json={"question_id": q3, "option_id": option["id"], "user_id": user_id})
+        
+        difficulty = client.get(f"/quiz/{quiz_id}/analytics/difficulty").json()
+        assert difficulty == {"quiz_id": quiz_id, "questions": [
+            {"question_id": q1, "attempts": 5, "correct": 2, "correct_rate": 0.4},
+            {"question_id": q2, "attempts": 0, "correct": 0, "correct_rate": None},
+            {"question_id": q3, "attempts": 3, "correct": 2, "correct_rate": 2 / 3}
+        ]}
+        
+        distribution = client.get(f"/quiz/{quiz_id}/analytics/distribution").json()["questions"]
+        assert [(option["text"], option["count"]) for option in distribution[0]["options"]] == [("A", 1), ("B", 2), ("C", 1)]
+        assert distribution[0]["other"] == 1
+        assert [(option["text"], option["count"]) for option in distribution[2]["options"]] == [("Paris", 1), ("paris ", 2)]
+        assert distribution[2]["other"] == 0
+        
+        assert client.get("/quiz/999/analytics/difficulty").status_code == 404
+
+    def test_export_quiz_attempts_and_results(self, setup_database):
+        quiz_id = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"}).json()["id"]
+        question_id = client.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Q1?", "options": ["A", "B"], "correct_answer": 0
+        }).json()["question_id"]
+        for user_id, answer in ((2, "B"), (1, "A")):
+            client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "answer": answer, "user_id": user_id})
+        
+        response = client.get(f"/quiz/{quiz_id}/export/attempts")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert response.headers["content-disposition"] == f'attachment; filename="quiz-{quiz_id}-attempts.csv"'
+        lines = response.text.splitlines()
+        assert lines[0] == "id,quiz_id,user_id,question_id,selected_option,selected_option_id,created_at"
+        assert [line.split(",")[2:5] for line in lines[1:]] == [["1", str(question_id), "A"], ["2", str(question_id), "B"]]
+        
+        response = client.get(f"/quiz/{quiz_id}/export/results", params={"format": "ndjson"})
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [(row["user_id"], row["score"]) for row in rows] == [(1, 1), (2, 0)]
+        
+        assert client.get("/quiz/999/export/attempts").status_code == 404
+        assert client.get(f"/quiz/{quiz_id}/export/attempts", params={"format": "xml"}).status_code == 400
+
+    def test_submit_answer_write_behind(self, setup_database, monkeypatch, tmp_path):
+        log = AttemptLog(str(tmp_path / "attempts.spool"), batch_size=100, flush_interval=1, session_factory=TestingSessionLocal)
+        monkeypatch.setattr(quiz_service, "attempt_log", log)
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        question_response = client.post(f"/quiz/{quiz_id}/question", json={"question_text": "Q1?", "options": ["A", "B"], "correct_answer": 0})
+        question_id = question_response.json()["question_id"]
+        
+        answer_data = {"question_id": question_id, "answer": "A", "user_id": 1}
+        response = client.post(f"/quiz/{quiz_id}/answer", json=answer_data)
+        assert response.status_code == 200
+        assert response.json()["current_score"] == 1
+        response = client.post(f"/quiz/{quiz_id}/answer", json=answer_data)
+        assert response.status_code == 400
+        assert len(log) == 1
+        # The leaderboard counts attempts that are still queued
+        leaderboard = client.get(f"/quiz/{quiz_id}/leaderboard").json()
+        assert (leaderboard["participants"], leaderboard["top"][0]["score"]) == (1, 1)
+        
+        assert log.flush() == 1
+        response = client.get("/user/1/results")
+        assert response.json()["results"][0]["score"] == 1
+        response = client.post(f"/quiz/{quiz_id}/answer", json=answer_data)
+        assert response.status_code == 400
+
+    def test_server_timing_and_metrics(self, setup_database):
+        registry.clear()
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        response = client.get(f"/quiz/{quiz_id}")
+        assert response.headers["server-timing"].startswith("app;dur=")
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+        
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert 'quizapp_http_requests_total{method="GET",route="/quiz/{quiz_id}",status="200"} 1' in response.text
+        assert 'quizapp_db_queries_total{method="GET",route="/quiz/{quiz_id}"} 1' in response.text
+        assert "quizapp_quiz_cache_misses_total" in response.text
+
+    def test_submit_answer_rate_limited_per_user(self, setup_database, monkeypatch):
+        monkeypatch.setitem(limiter.budgets, "POST /quiz/{quiz_id}/answer", Budget(rate=0.1, burst=2))
+        monkeypatch.setattr(limiter, "ip_factor", 2)
+        quiz_response = client.post("/create-quiz", json={"title": "Test Quiz", "description": "Test"})
+        quiz_id = quiz_response.json()["id"]
+        
+        for question_id in (1, 2):
+            response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "answer": "A", "user_id": 1})
+            assert response.status_code == 404
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": 3, "answer": "A", "user_id": 1})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "10"
+        
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": 3, "answer": "A", "user_id": 2})
+        assert response.status_code == 404
+        # Switching user_id does not get past the IP's budget (twice the route's here)
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": 3, "answer": "A", "user_id": 3})
+        assert response.status_code == 404
+        response = client.post(f"/quiz/{quiz_id}/answer", json={"question_id": 3, "answer": "A", "user_id": 4})
+        assert response.status_code == 429
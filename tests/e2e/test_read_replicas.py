@@ -0,0 +1,92 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.main import app
+from src.database.core import get_db, Base
+from src.database import replicas
+from src.entities import quiz as quiz_entities
+from src.quiz.cache import quiz_cache
+from src.quiz.leaderboard import leaderboard
+from src.rate_limiter import limiter
+
+def add_quiz(engine, title):
+    with sessionmaker(bind=engine)() as db:
+        quiz = quiz_entities.Quiz(title=title, description="Test")
+        db.add(quiz)
+        db.commit()
+        return quiz.id
+
+@pytest.fixture(scope="function")
+def primary_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test_primary.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    PrimarySession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = PrimarySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield engine
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def replica(tmp_path, primary_engine, monkeypatch):
+    # Two SQLite files stand in for a primary and a replica that has not caught up
+    quiz_cache.clear()
+    leaderboard.clear()
+    limiter.reset()
+    replica = replicas.Replica(f"sqlite:///{tmp_path / 'test_replica.db'}", async_mode=False)
+    Base.metadata.create_all(bind=replica.engine)
+    monkeypatch.setattr(replicas.router, "replicas", [replica])
+    replicas.router.clear()
+    yield replica
+    replica.engine.dispose()
+
+class TestReadReplicas:
+    def test_reads_go_to_the_replica(self, primary_engine, replica):
+        quiz_id = add_quiz(primary_engine, "Primary")
+        add_quiz(replica.engine, "Replica")
+
+        assert TestClient(app).get(f"/quiz/{quiz_id}").json()["title"] == "Replica"
+        quiz_cache.clear()
+        # An unhealthy replica falls back to the primary
+        replica.healthy = False
+        assert TestClient(app).get(f"/quiz/{quiz_id}").json()["title"] == "Primary"
+
+    def test_replica_reads_are_not_cached(self, primary_engine, replica):
+        quiz_id = add_quiz(primary_engine, "Primary")
+        add_quiz(replica.engine, "Replica")
+        client = TestClient(app)
+
+        assert client.get(f"/quiz/{quiz_id}").json()["title"] == "Replica"
+        assert client.get(f"/quiz/{quiz_id}/questions").status_code == 200
+        assert quiz_cache.stats()["size"] == 0
+        # Primary reads do not get the lagging replica's copy; what they load is cached for replica reads too
+        replica.healthy = False
+        assert client.get(f"/quiz/{quiz_id}").json()["title"] == "Primary"
+        replica.healthy = True
+        assert client.get(f"/quiz/{quiz_id}").json()["title"] == "Primary"
+
+    def test_writers_read_their_writes(self, primary_engine, replica):
+        quiz_id = add_quiz(primary_engine, "Primary")
+        add_quiz(replica.engine, "Replica")
+        writer = TestClient(app)
+        question_id = writer.post(f"/quiz/{quiz_id}/question", json={
+            "question_text": "Q1?", "options": ["A", "B"], "correct_answer": 0
+        }).json()["question_id"]
+
+        response = writer.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "answer": "A", "user_id": 7})
+        assert replicas.STICKY_COOKIE in response.cookies
+        assert writer.get("/user/7/results").json()["results"][0]["score"] == 1
+        # Another worker's client without the cookie is still recognized by user
+        assert TestClient(app).get("/user/7/results").json()["results"][0]["score"] == 1
+        assert TestClient(app).get("/user/8/results").json()["results"] == []
+        # The quiz's content changed, so its reads stay on the primary for everyone
+        page = TestClient(app).get(f"/quiz/{quiz_id}/questions/page", params={"user_id": 8}).json()
+        assert [question["id"] for question in page["questions"]] == [question_id]
@@ -1,16 +1,19 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.main import app
 from src.database.core import get_db, Base
+from src.quiz.cache import quiz_cache
+from src.quiz.leaderboard import leaderboard
+from src.rate_limiter import limiter
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_users.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Override get_db dependency
 def override_get_db():
     try:
         db = TestingSessionLocal()
@@ -18,14 +21,18 @@ def override_get_db():
     finally:
         db.close()
 
-app.dependency_overrides[get_db] = override_get_db
-
 client = TestClient(app)
 
 @pytest.fixture(scope="function")
 def setup_database():
     Base.metadata.create_all(bind=engine)
+    quiz_cache.clear()
+    leaderboard.clear()
+    limiter.reset()
+    # Override get_db dependency
+    app.dependency_overrides[get_db] = override_get_db
     yield
+    app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=engine)
 
 class TestUserEndpoints:
@@ -59,4 +66,52 @@ class TestUserEndpoints:
         assert data["results"][0]["quiz_id"] == quiz_id
         assert data["results"][0]["score"] == 1
         assert data["results"][0]["total_questions"] == 1
-        assert data["results"][0]["percentage"] == 100.0
\ No newline at end of file
+        assert data["results"][0]["percentage"] == 100.0
+
+    def test_get_user_results_paginated(self, setup_database):
+        quiz_ids = []
+        for i in range(3):
+            quiz_id = client.post("/create-quiz", json={"title": f"Quiz {i}", "description": "Test"}).json()["id"]
+            quiz_ids.append(quiz_id)
+            question_ids = [
+                client.post(f"/quiz/{quiz_id}/question", json={
+                    "question_text": f"Question {j}?",
+                    "options": ["A", "B"],
+                    "correct_answer": 0
+                }).json()["question_id"]
+                for j in range(2)
+            ]
+            client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_ids[0], "answer": "A", "user_id": 7})
+        
+        first_page = client.get("/user/7/results", params={"limit": 2}).json()
+        assert [r["quiz_id"] for r in first_page["results"]] == quiz_ids[:2]
+        assert first_page["results"][0]["total_questions"] == 2
+        assert first_page["results"][0]["percentage"] == 50.0
+        assert first_page["next_after_quiz_id"] == quiz_ids[1]
+        
+        second_page = client.get(
+            "/user/7/results", params={"limit": 2, "after_quiz_id": first_page["next_after_quiz_id"]}
+        ).json()
+        assert [r["quiz_id"] for r in second_page["results"]] == quiz_ids[2:]
+        assert second_page["next_after_quiz_id"] is None
+
+    def test_export_user_attempts_and_results(self, setup_database):
+        quiz_ids = []
+        for i in range(2):
+            quiz_id = client.post("/create-quiz", json={"title": f"Quiz {i}", "description": "Test"}).json()["id"]
+            quiz_ids.append(quiz_id)
+            question_id = client.post(f"/quiz/{quiz_id}/question", json={
+                "question_text": "Question?", "options": ["A", "B"], "correct_answer": 0
+            }).json()["question_id"]
+            client.post(f"/quiz/{quiz_id}/answer", json={"question_id": question_id, "answer": "A", "user_id": 7})
+        
+        response = client.get("/user/7/export/attempts", params={"format": "ndjson"})
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["quiz_id"] for row in rows] == quiz_ids
+        assert rows[0]["selected_option"] == "A"
+        
+        response = client.get("/user/7/export/results")
+        assert response.text.splitlines() == ["id,quiz_id,user_id,score", f"1,{quiz_ids[0]},7,1", f"2,{quiz_ids[1]},7,1"]
+        
+        assert client.get("/user/8/export/results").text == "id,quiz_id,user_id,score\n"
@@ -0,0 +1,83 @@
+from src.entities import quiz as quiz_entities
+from src.quiz import analytics
+from src.quiz.attempt_log import write_attempts
+
+def add_quiz(db_session, questions=2):
+    quiz = quiz_entities.Quiz(title="Quiz", description="Test")
+    db_session.add(quiz)
+    db_session.flush()
+    question_ids = []
+    for i in range(questions):
+        question = quiz_entities.Question(quiz_id=quiz.id, question_text=f"Question {i}?")
+        db_session.add(question)
+        db_session.flush()
+        question_ids.append(question.id)
+    db_session.commit()
+    return quiz.id, question_ids
+
+def add_options(db_session, question_id, *texts):
+    options = [quiz_entities.QuestionOptions(question_id=question_id, option_text=text) for text in texts]
+    db_session.add_all(options)
+    db_session.commit()
+    return [option.id for option in options]
+
+def counters(db_session):
+    """Counts keyed by ``(question_id, option id)``, or ``(question_id, normalized text)`` for text answers."""
+    return {
+        (row.question_id, row.option_id if row.option_id is not None else row.answer): row.count
+        for row in db_session.query(quiz_entities.AnswerCount)
+    }
+
+def test_record_answers_counts_normalized_answers(db_session):
+    quiz_id, (q1, q2) = add_quiz(db_session)
+
+    analytics.record_answers(db_session, [
+        (quiz_id, q1, "Paris", None), (quiz_id, q1, " paris ", None), (quiz_id, q2, "B", None)
+    ])
+    analytics.record_answers(db_session, [(quiz_id, q1, "PARIS", None)])
+    db_session.commit()
+
+    assert counters(db_session) == {(q1, "paris"): 3, (q2, "b"): 1}
+
+def test_record_answers_counts_chosen_options_by_id(db_session):
+    quiz_id, (q1, _) = add_quiz(db_session)
+    # Options whose text differs only in case and spacing keep separate counts
+    upper, lower = add_options(db_session, q1, "Paris", " paris")
+
+    analytics.record_answers(db_session, [
+        (quiz_id, q1, "Paris", upper), (quiz_id, q1, " paris", lower), (quiz_id, q1, "Lyon", None)
+    ])
+    analytics.record_answers(db_session, [(quiz_id, q1, "Paris", upper)])
+    db_session.commit()
+
+    assert counters(db_session) == {(q1, upper): 2, (q1, lower): 1, (q1, "lyon"): 1}
+
+def test_rebuild_answer_counts_matches_attempts(db_session, monkeypatch):
+    monkeypatch.setattr(analytics, "ANALYTICS_REBUILD_BATCH_SIZE", 1)
+    quiz_id, (q1, q2) = add_quiz(db_session)
+    option_a, = add_options(db_session, q1, "A")
+    db_session.add_all([
+        quiz_entities.Attempt(quiz_id=quiz_id, user_id=1, question_id=q1, selected_option="A", selected_option_id=option_a),
+        quiz_entities.Attempt(quiz_id=quiz_id, user_id=2, question_id=q1, selected_option="a ", selected_option_id=option_a),
+        quiz_entities.Attempt(quiz_id=quiz_id, user_id=3, question_id=q1, selected_option="B"),
+        quiz_entities.Attempt(quiz_id=quiz_id, user_id=4, question_id=q1, selected_option="b"),
+        quiz_entities.Attempt(quiz_id=quiz_id, user_id=1, question_id=q2, selected_option="C"),
+    ])
+    # A stale counter the rebuild must replace
+    db_session.add(quiz_entities.AnswerCount(quiz_id=quiz_id, question_id=q2, answer="d", count=5))
+    db_session.commit()
+
+    assert analytics.rebuild_all(db_session) == 5
+    assert counters(db_session) == {(q1, option_a): 2, (q1, "b"): 2, (q2, "c"): 1}
+
+def test_write_attempts_counts_only_new_attempts(db_session):
+    quiz_id, (q1, _) = add_quiz(db_session)
+    record = {
+        "quiz_id": quiz_id, "user_id": 1, "question_id": q1, "selected_option": "A",
+        "is_correct": True, "created_at": "2026-01-01T00:00:00+00:00"
+    }
+
+    write_attempts(db_session, [record])
+    write_attempts(db_session, [record])
+
+    assert counters(db_session) == {(q1, "a"): 1}
@@ -0,0 +1,113 @@
+import json
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.core import Base
+from src.entities import quiz as quiz_entities
+from src.entities import user as user_entities  # noqa: F401 - registers the users table
+from src.quiz.attempt_log import AttemptLog
+from src.quiz.leaderboard import Leaderboard
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'attempts.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        quiz = quiz_entities.Quiz(title="Quiz", description="Test")
+        db.add(quiz)
+        db.flush()
+        db.add_all([quiz_entities.Question(id=question_id, quiz_id=quiz.id, question_text="Q?") for question_id in (1, 2)])
+        db.commit()
+    yield SessionLocal
+    engine.dispose()
+
+def stored_attempts(db):
+    return sorted((row.user_id, row.question_id) for row in db.query(quiz_entities.Attempt))
+
+def test_queued_attempts_are_deduplicated_and_scored_before_flush(session_factory, tmp_path):
+    log = AttemptLog(str(tmp_path / "attempts.spool"), batch_size=100, flush_interval=1, session_factory=session_factory)
+    with session_factory() as db:
+        assert log.append(db, 1, 7, [(1, "A", None, True)]) == ({1}, 1)
+        assert log.append(db, 1, 7, [(1, "A", None, True), (2, "B", None, False)]) == ({2}, 1)
+        assert stored_attempts(db) == []
+
+    assert log.flush() == 2
+    with session_factory() as db:
+        assert stored_attempts(db) == [(7, 1), (7, 2)]
+        assert db.query(quiz_entities.Result.score).filter(quiz_entities.Result.user_id == 7).scalar() == 1
+        # Flushed attempts are rejected by the database lookup
+        assert log.append(db, 1, 7, [(1, "A", None, True)]) == (set(), 1)
+
+def test_recover_writes_spooled_attempts_once(session_factory, tmp_path, monkeypatch):
+    spool_path = str(tmp_path / "attempts.spool")
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "getpid", lambda: 12345)
+        crashed = AttemptLog(spool_path, batch_size=100, flush_interval=1, session_factory=session_factory)
+    with session_factory() as db:
+        crashed.append(db, 1, 7, [(1, "A", None, True), (2, "B", None, True)])
+
+    restarted = AttemptLog(spool_path, batch_size=100, flush_interval=1, session_factory=session_factory)
+    # The other process still holds its spool
+    assert restarted.recover() == 0
+    crashed.spool.close()
+    assert restarted.recover() == 2
+    assert restarted.recover() == 0
+    with session_factory() as db:
+        assert stored_attempts(db) == [(7, 1), (7, 2)]
+        assert db.query(quiz_entities.Result.score).filter(quiz_entities.Result.user_id == 7).scalar() == 2
+    assert sorted(os.listdir(tmp_path)) == ["attempts.db", f"attempts.spool.{os.getpid()}.lock"]
+
+def test_records_that_keep_failing_are_dead_lettered(session_factory, tmp_path):
+    log = AttemptLog(
+        str(tmp_path / "attempts.spool"), batch_size=100, flush_interval=1, max_failures=2, session_factory=session_factory
+    )
+    poison = {
+        "quiz_id": 1, "user_id": 8, "question_id": 1, "selected_option": "A",
+        "selected_option_id": None, "is_correct": True, "created_at": "not a date"
+    }
+    log.spool.write([poison])
+    with session_factory() as db:
+        log.append(db, 1, 7, [(1, "A", None, True)])
+
+    # The failing record does not hold back the others
+    assert log.flush() == 1
+    with session_factory() as db:
+        assert stored_attempts(db) == [(7, 1)]
+        log.append(db, 1, 7, [(2, "B", None, True)])
+    assert log.flush() == 1
+    assert log.spool.read_flushing() == []
+    with open(log.spool.dead_path, encoding="utf-8") as file:
+        assert [json.loads(line) for line in file] == [{**poison, "failures": 2}]
+    with session_factory() as db:
+        assert stored_attempts(db) == [(7, 1), (7, 2)]
+        assert db.query(quiz_entities.Result.score).filter(quiz_entities.Result.user_id == 7).scalar() == 2
+
+def test_leaderboard_ranks_queued_attempts(session_factory, tmp_path):
+    log = AttemptLog(str(tmp_path / "attempts.spool"), batch_size=100, flush_interval=1, session_factory=session_factory)
+    board = Leaderboard()
+    with session_factory() as db:
+        db.add(quiz_entities.Result(quiz_id=1, user_id=8, score=1))
+        db.commit()
+        log.append(db, 1, 7, [(1, "A", None, True), (2, "B", None, True)])
+
+        assert board.ranking(db, 1, log).top(3) == [(7, 2), (8, 1)]
+
+    log.flush()
+    board.clear()
+    with session_factory() as db:
+        assert board.ranking(db, 1, log).top(3) == [(7, 2), (8, 1)]
+
+def test_leaderboard_keeps_scores_recorded_while_loading(session_factory):
+    board = Leaderboard()
+
+    class RecordingLog:
+        def queued_scores(self, quiz_id):
+            # Another request commits and records a score while the index loads
+            board.record(quiz_id, 9, 4)
+            return {}
+
+    with session_factory() as db:
+        assert board.ranking(db, 1, RecordingLog()).top(3) == [(9, 4)]
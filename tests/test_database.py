@@ -0,0 +1,50 @@
+import asyncio
+import sqlite3
+import pytest
+from sqlalchemy import text
+from src.database.core import READ_ONLY, create_async_db_engine, create_db_engine
+
+def write_lock_is_free(path) -> bool:
+    other = sqlite3.connect(path, timeout=0, isolation_level=None)
+    try:
+        other.execute("BEGIN IMMEDIATE")
+        other.execute("ROLLBACK")
+        return True
+    except sqlite3.OperationalError as error:
+        assert "locked" in str(error)
+        return False
+    finally:
+        other.close()
+
+def test_sqlite_transactions_take_the_write_lock_up_front(tmp_path):
+    path = tmp_path / "app.db"
+    engine = create_db_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+
+    # A transaction that reads first cannot later fail to upgrade to a write
+    with engine.connect() as connection:
+        connection.execute(text("SELECT count(*) FROM items")).scalar()
+        assert not write_lock_is_free(path)
+    assert write_lock_is_free(path)
+
+    # Read-only work keeps a deferred BEGIN and does not hold writers up
+    with engine.connect().execution_options(**READ_ONLY) as connection:
+        connection.execute(text("SELECT count(*) FROM items")).scalar()
+        assert write_lock_is_free(path)
+    engine.dispose()
+
+def test_async_sqlite_transactions_take_the_write_lock_up_front(tmp_path):
+    pytest.importorskip("aiosqlite")
+    path = tmp_path / "app.db"
+
+    async def check():
+        engine = create_async_db_engine(f"sqlite:///{path}")
+        async with engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT count(*) FROM items"))
+            assert not write_lock_is_free(path)
+        await engine.dispose()
+
+    asyncio.run(check())
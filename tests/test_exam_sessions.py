@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+from src.entities import quiz as quiz_entities
+from src.entities import user as user_entities  # noqa: F401 - registers the users table
+from src.quiz import models as quiz_models
+from src.quiz.attempt_log import AttemptLog, write_attempts
+from src.quiz.exam_sessions import ExamSessions
+
+def add_quiz(db_session, n_questions=3):
+    """A quiz whose questions each have options "A" (correct) and "B"; returns its id and ``[(question_id, a_id, b_id), ...]``."""
+    quiz = quiz_entities.Quiz(title="Exam", description="Test")
+    db_session.add(quiz)
+    db_session.flush()
+    options = []
+    for i in range(n_questions):
+        question = quiz_entities.Question(quiz_id=quiz.id, question_text=f"Question {i}?")
+        db_session.add(question)
+        db_session.flush()
+        correct = quiz_entities.QuestionOptions(question_id=question.id, option_text="A", correct_answer=True)
+        wrong = quiz_entities.QuestionOptions(question_id=question.id, option_text="B", correct_answer=False)
+        db_session.add_all([correct, wrong])
+        db_session.flush()
+        options.append((question.id, correct.id, wrong.id))
+    db_session.commit()
+    return quiz.id, options
+
+def make_sessions(db_session, **kwargs):
+    return ExamSessions(session_factory=sessionmaker(bind=db_session.get_bind()), **kwargs)
+
+def answer(question_id, option_id):
+    return quiz_models.ExamAnswer(question_id=question_id, option_id=option_id)
+
+def expire(db_session, session_ids):
+    db_session.query(quiz_entities.ExamSession).filter(quiz_entities.ExamSession.id.in_(session_ids)).update(
+        {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+    )
+    db_session.commit()
+
+def test_answers_are_scored_once_at_finish(db_session):
+    quiz_id, options = add_quiz(db_session)
+    sessions = make_sessions(db_session)
+    started = sessions.start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=1))
+    session_id = started["session_id"]
+    assert (started["status"], started["question_count"], started["answered"]) == ("running", 3, 0)
+
+    (q1, a1, b1), (q2, a2, _), _ = options
+    sessions.answer(db_session, session_id, [answer(q1, b1), answer(q2, a2)])
+    # A later choice replaces the earlier one
+    running = sessions.answer(db_session, session_id, [answer(q1, a1)])
+    assert (running["answered"], running["score"]) == (2, None)
+    assert db_session.query(quiz_entities.Attempt).count() == 0
+
+    finished = sessions.finish(db_session, session_id)
+
+    assert (finished["status"], finished["answered"], finished["score"]) == ("finished", 2, 2)
+    # Times read back from the row are as UTC-aware as those of the running session
+    assert (finished["started_at"], finished["expires_at"]) == (started["started_at"], started["expires_at"])
+    assert finished["finished_at"].tzinfo is not None
+    attempts = db_session.query(quiz_entities.Attempt.question_id, quiz_entities.Attempt.selected_option_id).all()
+    assert sorted(attempts) == [(q1, a1), (q2, a2)]
+    assert db_session.query(quiz_entities.Result.score).filter_by(quiz_id=quiz_id, user_id=1).scalar() == 2
+    assert db_session.query(quiz_entities.ExamSessionAnswer).count() == 0
+    with pytest.raises(HTTPException) as error:
+        sessions.finish(db_session, session_id)
+    assert error.value.status_code == 409
+
+def test_answers_are_validated_against_the_quiz(db_session):
+    quiz_id, options = add_quiz(db_session)
+    sessions = make_sessions(db_session)
+    session_id = sessions.start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=1))["session_id"]
+    (q1, a1, _), (_, a2, _), _ = options
+
+    for bad in (answer(q1 + 1000, a1), answer(q1, a2)):
+        with pytest.raises(HTTPException) as error:
+            sessions.answer(db_session, session_id, [bad])
+        assert error.value.status_code == 400
+    with pytest.raises(HTTPException) as error:
+        sessions.answer(db_session, session_id + 1, [answer(q1, a1)])
+    assert error.value.status_code == 404
+
+def test_sweep_finalizes_expired_sessions_in_batches(db_session):
+    quiz_id, options = add_quiz(db_session)
+    sessions = make_sessions(db_session, batch_size=2)
+    (q1, a1, _), (q2, _, b2), _ = options
+    session_ids = []
+    for user_id in range(1, 6):
+        session_id = sessions.start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=user_id))["session_id"]
+        sessions.answer(db_session, session_id, [answer(q1, a1), answer(q2, b2)])
+        session_ids.append(session_id)
+    kept = sessions.start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=6))["session_id"]
+    sessions.answer(db_session, kept, [answer(q1, a1)])
+    expire(db_session, session_ids)
+
+    assert sessions.sweep() == 5
+
+    db_session.expire_all()
+    rows = db_session.query(quiz_entities.ExamSession).order_by(quiz_entities.ExamSession.id).all()
+    assert [(row.status, row.answered, row.score) for row in rows] == [("expired", 2, 1)] * 5 + [("running", None, None)]
+    assert db_session.query(quiz_entities.Attempt).count() == 10
+    assert sessions.get(db_session, kept)["answered"] == 1
+
+def test_failed_sweep_keeps_sessions_for_the_next_one(db_session, monkeypatch):
+    quiz_id, options = add_quiz(db_session)
+    sessions = make_sessions(db_session)
+    (q1, a1, _), _, _ = options
+    session_id = sessions.start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=1))["session_id"]
+    sessions.answer(db_session, session_id, [answer(q1, a1)])
+    expire(db_session, [session_id])
+
+    def fail_once(db, records):
+        monkeypatch.setattr("src.quiz.exam_sessions.write_attempts", write_attempts)
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr("src.quiz.exam_sessions.write_attempts", fail_once)
+
+    with pytest.raises(RuntimeError):
+        sessions.sweep()
+    db_session.expire_all()
+    assert db_session.get(quiz_entities.ExamSession, session_id).status == "running"
+
+    assert sessions.sweep() == 1
+
+    db_session.expire_all()
+    row = db_session.get(quiz_entities.ExamSession, session_id)
+    assert (row.status, row.answered, row.score) == ("expired", 1, 1)
+
+def test_sessions_are_served_by_any_worker(db_session):
+    quiz_id, options = add_quiz(db_session)
+    (q1, a1, _), (q2, _, b2), _ = options
+    session_id = make_sessions(db_session).start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=1))["session_id"]
+    make_sessions(db_session).answer(db_session, session_id, [answer(q1, a1)])
+    # Answers survive the process that took them
+    assert make_sessions(db_session).answer(db_session, session_id, [answer(q2, b2)])["answered"] == 2
+
+    finished = make_sessions(db_session).finish(db_session, session_id)
+
+    assert (finished["status"], finished["answered"], finished["score"]) == ("finished", 2, 1)
+
+def test_write_behind_queues_session_attempts_with_the_others(db_session, tmp_path, monkeypatch):
+    quiz_id, options = add_quiz(db_session)
+    (q1, a1, _), (q2, a2, _), _ = options
+    log = AttemptLog(
+        str(tmp_path / "attempts.spool"), batch_size=100, flush_interval=1, session_factory=sessionmaker(bind=db_session.get_bind())
+    )
+    monkeypatch.setattr("src.quiz.exam_sessions.attempt_log", log)
+    sessions = make_sessions(db_session)
+    session_id = sessions.start(db_session, quiz_id, quiz_models.ExamSessionStart(user_id=1))["session_id"]
+    sessions.answer(db_session, session_id, [answer(q1, a1), answer(q2, a2)])
+    # Answered outside the session, and still queued when the session finishes
+    log.append(db_session, quiz_id, 1, [(q1, "B", None, False)])
+
+    finished = sessions.finish(db_session, session_id)
+
+    assert (finished["status"], finished["score"]) == ("finished", 2)
+    assert db_session.query(quiz_entities.Attempt).count() == 0
+    assert log.flush() == 2
+    attempts = db_session.query(quiz_entities.Attempt.question_id, quiz_entities.Attempt.selected_option).all()
+    assert sorted(attempts) == [(q1, "B"), (q2, "A")]
+    assert db_session.query(quiz_entities.Result.score).filter_by(quiz_id=quiz_id, user_id=1).scalar() == 1
@@ -0,0 +1,29 @@
+import json
+from src.entities import quiz as quiz_entities
+from src.quiz import exports as quiz_exports
+
+def add_results(db_session, user_ids):
+    quiz = quiz_entities.Quiz(title="Quiz", description="Test")
+    db_session.add(quiz)
+    db_session.flush()
+    db_session.add_all(quiz_entities.Result(quiz_id=quiz.id, user_id=user_id, score=user_id % 3) for user_id in user_ids)
+    db_session.commit()
+    return quiz.id
+
+def test_iter_export_sends_header_before_querying(db_session):
+    chunks = quiz_exports.iter_export(db_session.get_bind(), quiz_exports.quiz_results(1), "csv")
+    assert next(chunks) == b"id,quiz_id,user_id,score\n"
+
+def test_iter_export_streams_in_batches(db_session, monkeypatch):
+    monkeypatch.setattr(quiz_exports, "EXPORT_BATCH_SIZE", 2)
+    quiz_id = add_results(db_session, [5, 3, 1, 4, 2])
+
+    chunks = list(quiz_exports.iter_export(db_session.get_bind(), quiz_exports.quiz_results(quiz_id), "ndjson"))
+
+    assert chunks[0] == b""
+    assert [chunk.count(b"\n") for chunk in chunks[1:]] == [2, 2, 1]
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [(row["user_id"], row["score"]) for row in rows] == [(1, 1), (2, 2), (3, 0), (4, 1), (5, 2)]
+
+def test_encode_rows_quotes_csv_fields():
+    assert quiz_exports.encode_rows("csv", ["id", "selected_option"], [(1, 'say "hi", twice')]) == b'1,"say ""hi"", twice"\n'
@@ -0,0 +1,86 @@
+import random
+from src.entities import quiz as quiz_entities
+from src.entities import user as user_entities  # noqa: F401 - registers the users table
+from src.quiz import leaderboard as leaderboard_module
+from src.quiz.leaderboard import Leaderboard, QuizRanking, SortedKeys
+
+
+def test_top_orders_by_score_then_user():
+    ranking = QuizRanking([(1, 3), (2, 5), (3, 3), (4, 1)])
+
+    assert ranking.top(3) == [(2, 5), (1, 3), (3, 3)]
+    assert len(ranking) == 4
+
+def test_rank_uses_competition_ranking_for_ties():
+    ranking = QuizRanking([(1, 3), (2, 5), (3, 3), (4, 1)])
+
+    assert ranking.rank(2) == (1, 5)
+    assert ranking.rank(1) == (2, 3)
+    assert ranking.rank(3) == (2, 3)
+    assert ranking.rank(4) == (4, 1)
+    assert ranking.rank(99) is None
+
+def test_update_moves_user():
+    ranking = QuizRanking([(1, 3), (2, 5)])
+    ranking.update(1, 6)
+    ranking.update(3, 0)
+
+    assert ranking.top(3) == [(1, 6), (2, 5), (3, 0)]
+    assert ranking.rank(2) == (2, 5)
+
+def test_sorted_keys_match_a_sorted_list():
+    rng = random.Random(7)
+    keys = SortedKeys([rng.randrange(100) for _ in range(20)], bucket_size=4)
+    expected = sorted(keys.head(20))
+    for _ in range(500):
+        key = rng.randrange(100)
+        if expected and rng.random() < 0.4:
+            key = rng.choice(expected)
+            keys.remove(key)
+            expected.remove(key)
+        else:
+            keys.add(key)
+            expected.append(key)
+            expected.sort()
+        probe = rng.randrange(101)
+        assert keys.count_below(probe) == sum(1 for other in expected if other < probe)
+    assert len(keys) == len(expected)
+    assert keys.head(len(expected) + 1) == expected
+
+class LoadingSession:
+    """Runs ``during_load`` when the leaderboard queries results, as a concurrent request would."""
+
+    def __init__(self, db, during_load):
+        self.db = db
+        self.during_load = during_load
+        self.loads = 0
+
+    def query(self, *args):
+        self.loads += 1
+        self.during_load()
+        return self.db.query(*args)
+
+def test_concurrent_misses_load_the_index_once(db_session, monkeypatch):
+    db_session.add_all([quiz_entities.Result(quiz_id=1, user_id=1, score=2), quiz_entities.Result(quiz_id=1, user_id=2, score=1)])
+    db_session.commit()
+    # Indexes expire as soon as they are loaded
+    monkeypatch.setattr(leaderboard_module, "LEADERBOARD_REFRESH_SECONDS", -1)
+    board = Leaderboard()
+    served = []
+
+    def concurrent_request():
+        served.append(board.ranking(db_session, 1))
+        board.record(1, 2, 2 + len(served))
+
+    session = LoadingSession(db_session, concurrent_request)
+
+    ranking = board.ranking(session, 1)
+    # With no index yet, a request during the load reads the table; its score change still reaches the index
+    assert (session.loads, served) == (1, [None])
+    assert ranking.top(1) == [(2, 3)]
+
+    reloaded = board.ranking(session, 1)
+    # Once it expires, a request during the reload gets the old index, which keeps receiving changes
+    assert session.loads == 2
+    assert served[1] is ranking
+    assert ranking.top(1) == reloaded.top(1) == [(2, 4)]
@@ -0,0 +1,43 @@
+from src.metrics import MetricsRegistry, RequestStats, _warn_repeated_statements, statement_fingerprint
+
+
+def test_render_reports_route_totals_and_slowest_statement(caplog):
+    registry = MetricsRegistry()
+    stats = RequestStats()
+    stats.record_query("SELECT 1", 0.002)
+    stats.record_query('SELECT "quizzes".id\nFROM quizzes', 0.003)
+    with caplog.at_level("INFO", logger="src.metrics"):
+        registry.observe("GET", "/quiz/{quiz_id}", 200, 0.02, stats)
+    registry.observe("GET", "/quiz/{quiz_id}", 404, 0.2, RequestStats())
+
+    text = registry.render(counters={"quizapp_quiz_cache_hits_total": 3})
+
+    assert 'quizapp_http_requests_total{method="GET",route="/quiz/{quiz_id}",status="404"} 1' in text
+    assert 'quizapp_http_request_duration_seconds_bucket{method="GET",route="/quiz/{quiz_id}",le="0.025"} 1' in text
+    assert 'quizapp_http_request_duration_seconds_bucket{method="GET",route="/quiz/{quiz_id}",le="+Inf"} 2' in text
+    assert 'quizapp_db_queries_total{method="GET",route="/quiz/{quiz_id}"} 2' in text
+    fingerprint = statement_fingerprint('SELECT "quizzes".id FROM quizzes')
+    assert f'quizapp_db_slowest_query_seconds{{method="GET",route="/quiz/{{quiz_id}}",fingerprint="{fingerprint}"}} 0.003000' in text
+    assert "FROM quizzes" not in text
+    assert f'fingerprint {fingerprint}: SELECT "quizzes".id FROM quizzes' in caplog.text
+    assert "# TYPE quizapp_quiz_cache_hits_total counter\nquizapp_quiz_cache_hits_total 3" in text
+
+def test_fingerprint_ignores_literals_and_in_list_lengths():
+    assert statement_fingerprint("SELECT * FROM quizzes WHERE id IN (?, ?)") == statement_fingerprint(
+        "SELECT *\nFROM quizzes WHERE id IN (?, ?, ?, ?)"
+    )
+    assert statement_fingerprint("SELECT * FROM users WHERE name = 'a' LIMIT 10") == statement_fingerprint(
+        "SELECT * FROM users WHERE name = 'b''s' LIMIT 20"
+    )
+    assert statement_fingerprint("SELECT * FROM quizzes") != statement_fingerprint("SELECT * FROM users")
+
+def test_repeated_statement_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr("src.metrics.METRICS_N_PLUS_ONE_THRESHOLD", 3)
+    stats = RequestStats()
+    for _ in range(3):
+        stats.record_query("SELECT * FROM question_options WHERE question_id = ?", 0.001)
+
+    with caplog.at_level("WARNING", logger="src.metrics"):
+        _warn_repeated_statements("GET", "/quiz/{quiz_id}/questions", stats)
+
+    assert "ran the same SQL statement 3 times" in caplog.text
@@ -0,0 +1,45 @@
+from src.entities import quiz as quiz_entities
+from src.quiz import queries
+
+def add_quiz(db_session):
+    quiz = quiz_entities.Quiz(title="Quiz", description="Test")
+    db_session.add(quiz)
+    db_session.flush()
+    question = quiz_entities.Question(quiz_id=quiz.id, question_text="Question?")
+    db_session.add(question)
+    db_session.flush()
+    db_session.add_all([
+        quiz_entities.QuestionOptions(question_id=question.id, option_text="A", correct_answer=False),
+        quiz_entities.QuestionOptions(question_id=question.id, option_text="B", correct_answer=True),
+    ])
+    db_session.commit()
+    return quiz.id, question.id
+
+def test_quiz_row(db_session):
+    quiz_id, _ = add_quiz(db_session)
+
+    row = queries.quiz_row(db_session, quiz_id)
+
+    assert (row.id, row.title, row.description) == (quiz_id, "Quiz", "Test")
+    assert queries.quiz_row(db_session, quiz_id + 1) is None
+
+def test_answer_key_options(db_session):
+    quiz_id, question_id = add_quiz(db_session)
+
+    rows = queries.answer_key_options(db_session, quiz_id, question_id)
+
+    assert [(row[1], row[3], row[4]) for row in rows] == [(question_id, "A", False), (question_id, "B", True)]
+    # The question is not in the quiz: one row with a null question id
+    assert [row[1] for row in queries.answer_key_options(db_session, quiz_id, question_id + 1)] == [None]
+    assert queries.answer_key_options(db_session, quiz_id + 1, question_id) == []
+
+def test_attempts_and_results(db_session):
+    quiz_id, question_id = add_quiz(db_session)
+    db_session.add(quiz_entities.Attempt(quiz_id=quiz_id, user_id=1, question_id=question_id, selected_option="B"))
+    db_session.add(quiz_entities.Result(quiz_id=quiz_id, user_id=1, score=1))
+    db_session.commit()
+
+    assert queries.attempted_question_ids(db_session, quiz_id, 1, [question_id, question_id + 1]) == {question_id}
+    assert queries.attempted_question_ids(db_session, quiz_id, 2, [question_id]) == set()
+    assert queries.result_score(db_session, quiz_id, 1) == 1
+    assert queries.result_score(db_session, quiz_id, 2) is None
@@ -0,0 +1,45 @@
+from src.quiz.cache import LRUCache
+
+
+def test_get_set_counts_hits_and_misses():
+    cache = LRUCache(max_entries=2, ttl_seconds=0)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.quiz.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(max_entries=2, ttl_seconds=10)
+    cache.set("a", 1)
+
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 10
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_invalidate_removes_entries():
+    cache = LRUCache(max_entries=4, ttl_seconds=0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a", "missing")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import pytest
+from starlette.requests import Request
+from src import rate_limiter
+from src.rate_limiter import Budget, MemoryStore, RateLimiter, SharedStore, parse_budgets
+
+
+def test_parse_budgets():
+    budgets = parse_budgets("POST /quiz/{quiz_id}/answer=10/s:20; GET *=6/m; *=1/h")
+
+    assert budgets["POST /quiz/{quiz_id}/answer"] == Budget(10, 20)
+    assert budgets["GET *"] == Budget(0.1, 6)
+    assert budgets["*"] == Budget(1 / 3600, 1)
+    with pytest.raises(ValueError):
+        parse_budgets("GET *=10/day")
+
+def test_most_specific_budget_applies():
+    limiter = RateLimiter(parse_budgets("POST /a=1/s;GET *=2/s;*=3/s"), MemoryStore(10))
+
+    assert limiter.budget_for("POST", "/a") == Budget(1, 1)
+    assert limiter.budget_for("GET", "/a") == Budget(2, 2)
+    assert limiter.budget_for("DELETE", "/a") == Budget(3, 3)
+
+def test_requests_count_against_user_and_ip():
+    limiter = RateLimiter(parse_budgets("POST /a=1/h:2"), MemoryStore(10), ip_factor=1.5)
+
+    assert [limiter.hit("POST", "/a", "user:1", "ip:x") for _ in range(2)] == [0, 0]
+    assert limiter.hit("POST", "/a", "user:1", "ip:x") > 0
+    # The IP's bucket holds 3 tokens, whichever users spend them
+    assert limiter.hit("POST", "/a", "user:2", "ip:x") == 0
+    assert limiter.hit("POST", "/a", "user:3", "ip:x") > 0
+    assert limiter.hit("POST", "/a", "user:3", "ip:y") == 0
+    assert limiter.hit("POST", "/a", None, "ip:y") == 0
+
+@pytest.mark.parametrize("backend", ["memory", "shared"])
+def test_rejected_request_spends_no_token(backend, tmp_path):
+    store = MemoryStore(10) if backend == "memory" else SharedStore(str(tmp_path / "buckets.db"))
+    limiter = RateLimiter(parse_budgets("POST /a=1/h:2"), store, ip_factor=1)
+
+    assert [limiter.hit("POST", "/a", f"user:{i}", "ip:x") for i in (1, 2)] == [0, 0]
+    # Rejected by the exhausted IP bucket, so user 3 keeps both tokens for another address
+    assert limiter.hit("POST", "/a", "user:3", "ip:x") > 0
+    assert [limiter.hit("POST", "/a", "user:3", "ip:y") for _ in range(2)] == [0, 0]
+    # Rejected by the user's bucket, so the IP's is untouched
+    assert limiter.hit("POST", "/a", "user:3", "ip:z") > 0
+    assert limiter.hit("POST", "/a", "user:4", "ip:z") == 0
+    assert limiter.hit("POST", "/a", "user:5", "ip:z") == 0
+
+@pytest.mark.parametrize("backend", ["memory", "shared"])
+def test_bucket_allows_burst_then_refills(backend, tmp_path):
+    store = MemoryStore(10) if backend == "memory" else SharedStore(str(tmp_path / "buckets.db"))
+    budget = Budget(rate=2, burst=3)
+    key = ("POST /a", "user:1")
+
+    assert [store.hit([(key, budget)], 100.0) for _ in range(3)] == [0, 0, 0]
+    assert store.hit([(key, budget)], 100.0) == pytest.approx(0.5)
+    assert store.hit([(("POST /a", "user:2"), budget)], 100.0) == 0
+    assert store.hit([(key, budget)], 100.5) == 0
+    assert store.hit([(key, budget)], 100.5) > 0
+
+    store.reset()
+    assert store.hit([(key, budget)], 100.5) == 0
+
+def test_memory_store_evicts_full_buckets():
+    store = MemoryStore(max_keys=2)
+    budget = Budget(rate=1, burst=1)
+    store.hit([(("GET /", "a"), budget)], 0.0)
+    store.hit([(("GET /", "b"), budget)], 10.0)
+
+    assert store.hit([(("GET /", "c"), budget)], 10.5) == 0
+    assert store.hit([(("GET /", "b"), budget)], 10.5) > 0
+    assert len(store._arrivals) == 2
+
+def test_shared_store_hits_run_off_the_event_loop(monkeypatch, tmp_path):
+    store = SharedStore(str(tmp_path / "buckets.db"))
+    threads = []
+    hit = store.hit
+    def recording_hit(buckets, now):
+        threads.append(threading.get_ident())
+        return hit(buckets, now)
+    monkeypatch.setattr(store, "hit", recording_hit)
+    monkeypatch.setattr(rate_limiter, "limiter", RateLimiter(parse_budgets("*=1/s"), store))
+    request = Request({
+        "type": "http", "method": "GET", "path": "/a", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 50000), "path_params": {}
+    })
+
+    async def limit():
+        await rate_limiter.rate_limit(request)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(limit())
+    assert threads and threads[0] != loop_thread
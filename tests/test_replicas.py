@@ -0,0 +1,31 @@
+import time
+from src.database.replicas import Replica, ReplicaRouter
+
+def make_router(*urls):
+    return ReplicaRouter([Replica(url, async_mode=False) for url in urls], 5, 5, 100)
+
+def test_pick_round_robins_over_healthy_replicas(tmp_path):
+    router = make_router(f"sqlite:///{tmp_path}/a.db", f"sqlite:///{tmp_path}/b.db")
+    a, b = router.replicas
+
+    assert [router.pick() for _ in range(4)] == [a, b, a, b]
+    a.healthy = False
+    assert [router.pick() for _ in range(3)] == [b, b, b]
+    b.healthy = False
+    assert router.pick() is None
+
+async def test_check_marks_unreachable_replicas(tmp_path):
+    router = make_router(f"sqlite:///{tmp_path}/a.db", f"sqlite:///{tmp_path}/missing/b.db")
+
+    await router.check()
+
+    assert [replica.healthy for replica in router.replicas] == [True, False]
+
+def test_sticky_keys_expire(tmp_path):
+    router = make_router(f"sqlite:///{tmp_path}/a.db")
+    now = time.time()
+    router.mark("user:7", now + 5)
+    router.mark("user:8", now - 1)
+
+    assert router.is_sticky(["ip:1.2.3.4", "user:7"], now)
+    assert not router.is_sticky(["user:8"], now)
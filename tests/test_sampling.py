@@ -0,0 +1,37 @@
+import random
+from array import array
+from src.quiz.sampling import QuestionBank, allocate, sample_ids
+
+def make_bank(tags):
+    ids = array("q", range(1, len(tags) + 1))
+    strata = {"tag": {}, "difficulty": {None: ids}}
+    for question_id, tag in zip(ids, tags):
+        strata["tag"].setdefault(tag, array("q")).append(question_id)
+    return QuestionBank(ids, strata)
+
+def test_allocate_is_proportional_and_exact():
+    assert allocate({"a": 50, "b": 30, "c": 20}, 10) == {"a": 5, "b": 3, "c": 2}
+    # 7 * (5, 3, 2) / 10 = (3.5, 2.1, 1.4): the spare draw goes to the largest remainder
+    assert allocate({"a": 5, "b": 3, "c": 2}, 7) == {"a": 4, "b": 2, "c": 1}
+    assert allocate({"a": 1, "b": 1}, 2) == {"a": 1, "b": 1}
+    assert allocate({}, 0) == {}
+
+def test_sample_ids_draws_distinct_ids():
+    bank = make_bank(["x"] * 100)
+
+    sampled = sample_ids(bank, 30, rng=random.Random(1))
+
+    assert len(set(sampled)) == 30
+    assert set(sampled) <= set(bank.ids)
+    assert sample_ids(bank, 30, rng=random.Random(1)) == sampled
+    assert sorted(sample_ids(bank, 500)) == list(bank.ids)
+
+def test_sample_ids_stratified_by_tag():
+    bank = make_bank(["x"] * 60 + ["y"] * 30 + [None] * 10)
+    tag_of = {question_id: tag for tag, ids in bank.strata["tag"].items() for question_id in ids}
+
+    sampled = sample_ids(bank, 20, "tag", random.Random(2))
+
+    tags = [tag_of[question_id] for question_id in sampled]
+    assert (tags.count("x"), tags.count("y"), tags.count(None)) == (12, 6, 2)
+    assert len(set(sampled)) == 20
@@ -0,0 +1,51 @@
+from src.quiz.shuffle import get_shuffle, option_at, permutation, shuffle_cache, shuffled_payload
+
+def make_questions(n_questions=20, n_options=4):
+    return [
+        {
+            "id": 100 + i,
+            "question_text": f"Q{i}?",
+            "options": [{"id": 1000 + i * 10 + j, "text": f"Option {j}"} for j in range(n_options)]
+        }
+        for i in range(n_questions)
+    ]
+
+def test_permutation_is_deterministic():
+    order = permutation(50, 1, 7, 0)
+
+    assert sorted(order) == list(range(50))
+    assert permutation(50, 1, 7, 0) == order
+    assert permutation(50, 1, 8, 0) != order
+    assert permutation(50, 1, 7, 1) != order
+
+def test_shuffled_payload_reuses_canonical_options():
+    shuffle_cache.clear()
+    questions = make_questions()
+
+    shuffle = get_shuffle(1, 7, 0, questions)
+    payload = shuffled_payload(1, shuffle)
+
+    assert get_shuffle(1, 7, 0, questions) is shuffle
+    assert [question["id"] for question in payload["questions"]] != [question["id"] for question in questions]
+    canonical = {question["id"]: question for question in questions}
+    for question in payload["questions"]:
+        options = canonical[question["id"]]["options"]
+        assert sorted(option["id"] for option in question["options"]) == [option["id"] for option in options]
+        assert all(any(option is original for original in options) for option in question["options"])
+    # A reloaded canonical list gets a fresh shuffle with the same order
+    rebuilt = get_shuffle(1, 7, 0, make_questions())
+    assert rebuilt is not shuffle and rebuilt.question_order == shuffle.question_order
+
+def test_option_at_resolves_shown_positions():
+    shuffle_cache.clear()
+    questions = make_questions()
+    payload = shuffled_payload(1, get_shuffle(1, 7, 3, questions))
+    question = payload["questions"][0]
+    option_ids = sorted(option["id"] for option in question["options"])
+
+    for position, option in enumerate(question["options"]):
+        assert option_at(1, 7, 3, question["id"], option_ids, position) == option["id"]
+    assert option_at(1, 7, 3, question["id"], option_ids, len(option_ids)) is None
+    # Without the cached shuffle the same order is recomputed
+    shuffle_cache.clear()
+    assert [option_at(1, 7, 3, question["id"], option_ids, i) for i in range(4)] == [option["id"] for option in question["options"]]
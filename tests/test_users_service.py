@@ -1,62 +1,49 @@
-import pytest
-from uuid import uuid4
+from src.entities import quiz as quiz_entities
 from src.users import service as users_service
-from src.users.models import PasswordChange
-from src.exceptions import UserNotFoundError, InvalidPasswordError, PasswordMismatchError
-from src.auth import service as auth_service
-from src.entities.user import User
 
-def test_get_user_by_id(db_session, test_user):
-    db_session.add(test_user)
-    db_session.commit()
-    
-    user = users_service.get_user_by_id(db_session, test_user.id)
-    assert user.id == test_user.id
-    assert user.email == test_user.email
-    
-    with pytest.raises(UserNotFoundError):
-        users_service.get_user_by_id(db_session, uuid4())
-
-def test_change_password(db_session, test_user):
-    # Add the user to the database
-    db_session.add(test_user)
-    db_session.commit()
-    
-    # Test successful password change
-    password_change = PasswordChange(
-        current_password="password123",  # This matches the password set in test_user fixture
-        new_password="newpassword123",
-        new_password_confirm="newpassword123"
-    )
-    
-    users_service.change_password(db_session, test_user.id, password_change)
-    
-    # Verify new password works
-    updated_user = db_session.query(User).filter_by(id=test_user.id).first()
-    assert auth_service.verify_password("newpassword123", updated_user.password_hash)
-
-def test_change_password_invalid_current(db_session, test_user):
-    db_session.add(test_user)
+def add_result(db_session, title, question_count, user_id, score):
+    quiz = quiz_entities.Quiz(title=title, description="Test", question_count=question_count)
+    db_session.add(quiz)
+    db_session.flush()
+    db_session.add(quiz_entities.Result(quiz_id=quiz.id, user_id=user_id, score=score))
     db_session.commit()
+    return quiz.id
 
-    # Test invalid current password
-    with pytest.raises(InvalidPasswordError):
-        password_change = PasswordChange(
-            current_password="wrongpassword",
-            new_password="newpassword123",
-            new_password_confirm="newpassword123"
-        )
-        users_service.change_password(db_session, test_user.id, password_change)
-
-def test_change_password_mismatch(db_session, test_user):
-    db_session.add(test_user)
-    db_session.commit()
+def test_get_user_results(db_session):
+    quiz_id = add_result(db_session, "Quiz", 4, user_id=1, score=3)
+    add_result(db_session, "Other user's quiz", 4, user_id=2, score=4)
+
+    results = users_service.get_user_results(db_session, 1)
+
+    assert results == {
+        "user_id": 1,
+        "results": [{
+            "quiz_id": quiz_id,
+            "quiz_title": "Quiz",
+            "score": 3,
+            "total_questions": 4,
+            "percentage": 75.0
+        }],
+        "next_after_quiz_id": None
+    }
+
+def test_get_user_results_without_questions(db_session):
+    add_result(db_session, "Empty quiz", 0, user_id=1, score=0)
+
+    result = users_service.get_user_results(db_session, 1)["results"][0]
+    assert result["total_questions"] == 0
+    assert result["percentage"] == 0
+
+def test_get_user_results_pages(db_session):
+    quiz_ids = [add_result(db_session, f"Quiz {i}", 1, user_id=1, score=1) for i in range(3)]
+
+    first_page = users_service.get_user_results(db_session, 1, limit=2)
+    assert [r["quiz_id"] for r in first_page["results"]] == quiz_ids[:2]
+    assert first_page["next_after_quiz_id"] == quiz_ids[1]
+
+    second_page = users_service.get_user_results(db_session, 1, limit=2, after_quiz_id=quiz_ids[1])
+    assert [r["quiz_id"] for r in second_page["results"]] == quiz_ids[2:]
+    assert second_page["next_after_quiz_id"] is None
 
-    # Test password mismatch
-    with pytest.raises(PasswordMismatchError):
-        password_change = PasswordChange(
-            current_password="password123",
-            new_password="newpassword123",
-            new_password_confirm="differentpassword"
-        )
-        users_service.change_password(db_session, test_user.id, password_change) 
\ No newline at end of file
+def test_get_user_results_unknown_user(db_session):
+    assert users_service.get_user_results(db_session, 99)["results"] == []